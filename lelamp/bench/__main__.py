@@ -0,0 +1,83 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+
+from .playback import bench_playback
+
+SUITES = ["load", "playback", "send_action", "connect", "dispatch", "rgb", "burst", "profile", "transition", "layers"]
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LeLamp hot paths against a simulated bus and LED strip")
+    parser.add_argument('--id', type=str, default='lelamp', help='ID of the lamp whose recordings to use (default: lelamp)')
+    parser.add_argument('--recordings', type=str, help='Directory of the recordings to use (default: lelamp/recordings)')
+    parser.add_argument('--recording', type=str, default='nod', help='Recording to play (default: nod)')
+    parser.add_argument('--frames', type=int, default=3000, help='Frames to time (default: 3000)')
+    parser.add_argument('--fps', type=int, default=30, help='Frames per second (default: 30)')
+    parser.add_argument('--bursts', type=int, default=20, help='Play bursts for the first-motion latency (default: 20)')
+    parser.add_argument('--port', type=str, default='sim://', help='Simulated bus for the burst latency (default: sim://)')
+    parser.add_argument('--only', type=str, nargs='+', choices=SUITES, help='Run only these suites')
+    parser.add_argument('--output', type=str, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    suites = args.only or SUITES
+    results = {
+        "meta": {
+            "revision": _git_revision(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        }
+    }
+
+    # Imported per suite so one that cannot run here does not block the others
+    if "load" in suites:
+        from .recordings import bench_recording_load
+        results["load"] = bench_recording_load(args.id, fps=args.fps, recordings_dir=args.recordings)
+    if "playback" in suites:
+        results["playback"] = bench_playback(args.id, args.recording, args.frames, args.fps, recordings_dir=args.recordings)
+    if "send_action" in suites:
+        from .bus import bench_send_action
+        results["send_action"] = bench_send_action(args.frames)
+    if "connect" in suites:
+        from .bus import bench_connect
+        results["connect"] = bench_connect()
+    if "dispatch" in suites:
+        from .dispatch import bench_dispatch
+        results["dispatch"] = bench_dispatch(min(args.frames, 1000))
+    if "rgb" in suites:
+        from .rgb import bench_rgb
+        results["rgb"] = bench_rgb(args.frames)
+    if "burst" in suites:
+        from .dispatch import bench_burst_latency
+        results["burst"] = bench_burst_latency(args.id, args.bursts, port=args.port, fps=args.fps,
+                                               recordings_dir=args.recordings)
+    if "profile" in suites:
+        from .profile import bench_motion_profile
+        results["profile"] = bench_motion_profile(args.id, fps=args.fps, port=args.port, recordings_dir=args.recordings)
+    if "transition" in suites:
+        from .playback import bench_transitions
+        results["transition"] = bench_transitions(args.id, fps=args.fps, recordings_dir=args.recordings)
+    if "layers" in suites:
+        from .playback import bench_layers
+        results["layers"] = bench_layers(args.id, args.frames, fps=args.fps, recordings_dir=args.recordings)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
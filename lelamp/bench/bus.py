@@ -0,0 +1,84 @@
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from lelamp.follower import LeLampFollower, LeLampFollowerConfig
+from .stats import summarize
+
+# Zero latency and a very fast link leave only the Python cost of a goal write
+OVERHEAD_PORT = "sim://?latency_ms=0&baudrate=1000000000"
+
+
+def bench_send_action(frames: int, port: str = OVERHEAD_PORT) -> Dict[str, Any]:
+    """Time LeLampFollower.send_action and send_positions against the simulated bus"""
+    robot = LeLampFollower(LeLampFollowerConfig(port=port, id="bench"))
+    robot.connect(calibrate=False)
+    try:
+        rng = np.random.default_rng(0)
+        rows = rng.uniform(-50, 50, size=(frames, len(robot.bus.motors))).astype(np.float32)
+        keys = [f"{motor}.pos" for motor in robot.bus.motors]
+        actions = [dict(zip(keys, row)) for row in rows.tolist()]
+
+        action_samples = []
+        for action in actions:
+            t0 = time.perf_counter()
+            robot.send_action(action)
+            action_samples.append(time.perf_counter() - t0)
+
+        positions_samples = []
+        for row in rows:
+            t0 = time.perf_counter()
+            robot.send_positions(row)
+            positions_samples.append(time.perf_counter() - t0)
+
+        read_samples = []
+        for _ in range(min(frames, 500)):
+            t0 = time.perf_counter()
+            robot.get_observation()
+            read_samples.append(time.perf_counter() - t0)
+
+        # The per-frame max_relative_target clamp against rows validated when their plan was compiled
+        robot.config.max_relative_target = 100.0
+        clamped_samples, validated_samples = [], []
+        for row in rows:
+            t0 = time.perf_counter()
+            robot.send_positions(row)
+            clamped_samples.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            robot.send_positions(row, validated=True)
+            validated_samples.append(time.perf_counter() - t0)
+
+        return {
+            "port": port,
+            "send_action_us": summarize(action_samples),
+            "send_positions_us": summarize(positions_samples),
+            "send_positions_clamped_us": summarize(clamped_samples),
+            "send_positions_validated_us": summarize(validated_samples),
+            "get_observation_us": summarize(read_samples),
+            "bus": robot.bus.bus_stats(),
+        }
+    finally:
+        robot.disconnect()
+
+
+def bench_connect(reconnects: int = 5, port: str = "sim://") -> Dict[str, Any]:
+    """Time a cold connect and warm reconnects, with and without fast_connect, on a bus with realistic latency"""
+    results = {"port": port}
+    for fast in (False, True):
+        robot = LeLampFollower(LeLampFollowerConfig(port=port, id="bench", fast_connect=fast))
+        samples, transactions = [], []
+        for _ in range(1 + reconnects):
+            before = robot.bus.transactions
+            t0 = time.perf_counter()
+            robot.connect(calibrate=False)
+            samples.append(time.perf_counter() - t0)
+            transactions.append(robot.bus.transactions - before)
+            robot.disconnect()
+        results["fast" if fast else "full"] = {
+            "cold_ms": samples[0] * 1e3,
+            "cold_transactions": transactions[0],
+            "warm_ms": summarize(samples[1:], scale=1e3),
+            "warm_transactions": transactions[-1],
+        }
+    return results
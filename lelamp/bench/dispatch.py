@@ -0,0 +1,107 @@
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from lelamp.service.base import ServiceBase
+from lelamp.service.motors.animation_service import AnimationService
+from .stats import summarize
+
+
+class _EchoService(ServiceBase):
+    """Service whose handler only records when each event reached it"""
+
+    def __init__(self):
+        super().__init__("bench")
+        self.handled = threading.Event()
+        self.handled_at = 0.0
+
+    def handle_event(self, event_type: str, payload: Any):
+        self.handled_at = time.perf_counter()
+        self.handled.set()
+
+
+def bench_dispatch(events: int, gap: float = 0.002) -> Dict[str, Any]:
+    """Time ServiceBase.dispatch itself and the delay until the worker thread runs the handler"""
+    service = _EchoService()
+    service.start()
+    try:
+        dispatch_samples, latency_samples = [], []
+        for i in range(events):
+            service.handled.clear()
+            t0 = time.perf_counter()
+            service.dispatch("ping", i)
+            t1 = time.perf_counter()
+            if not service.handled.wait(timeout=1.0):
+                continue
+            dispatch_samples.append(t1 - t0)
+            latency_samples.append(service.handled_at - t0)
+            time.sleep(gap)
+        return {
+            "events": events,
+            "dispatch_us": summarize(dispatch_samples),
+            "handler_latency_us": summarize(latency_samples),
+            "queue": service.stats(),
+        }
+    finally:
+        service.stop()
+
+
+def bench_burst_latency(lamp_id: str, bursts: int, burst_size: int = 5, port: str = "sim://",
+                        fps: int = 30, settle: float = 0.3, seed: int = 0,
+                        recordings_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Tool-call-to-first-motion latency when several plays are dispatched back to back.
+
+    Each burst dispatches `burst_size` plays as fast as possible; the latency is measured from
+    the last dispatch to the first goal written from that last gesture's plan.
+    """
+    service = AnimationService(port=port, lamp_id=lamp_id, fps=fps, duration=0.5, recordings_dir=recordings_dir)
+    service.start()
+    try:
+        gestures = [name for name in service.bank.names() if name != service.idle_recording]
+        if not gestures:
+            return {"error": f"no gestures for lamp id {lamp_id}"}
+
+        target: Optional[str] = None
+        first_motion = threading.Event()
+        first_motion_at = 0.0
+        send_positions = service.robot.send_positions
+
+        def timed_send_positions(positions, validated=False):
+            nonlocal first_motion_at
+            send_positions(positions, validated)
+            if target is not None and not first_motion.is_set() and service._current_recording == target:
+                first_motion_at = time.perf_counter()
+                first_motion.set()
+
+        service.robot.send_positions = timed_send_positions
+        time.sleep(settle)
+
+        rng = random.Random(seed)
+        samples, missed = [], 0
+        for _ in range(bursts):
+            names = [rng.choice(gestures) for _ in range(burst_size - 1)]
+            # The last play must be distinguishable from the rest of the burst and whatever is playing
+            candidates = [name for name in gestures if name not in names and name != service._current_recording]
+            names.append(rng.choice(candidates or gestures))
+            first_motion.clear()
+            target = names[-1]
+            for name in names:
+                t_last = time.perf_counter()
+                service.dispatch("play", name)
+            if first_motion.wait(timeout=2.0):
+                samples.append(first_motion_at - t_last)
+            else:
+                missed += 1
+            time.sleep(settle + rng.random() / fps)
+
+        return {
+            "bursts": bursts,
+            "burst_size": burst_size,
+            "port": port,
+            "first_motion_ms": summarize(samples, scale=1e3),
+            "missed": missed,
+            "queue": service.stats(),
+        }
+    finally:
+        service.stop()
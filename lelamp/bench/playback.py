@@ -0,0 +1,182 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lelamp.follower import LeLampFollowerConfig
+from lelamp.service.motors.animation_service import AnimationService
+from lelamp.service.motors.layer_mixer import LayerMixer
+from .stats import summarize
+
+MOTORS = ["base_yaw", "base_pitch", "elbow_pitch", "wrist_roll", "wrist_pitch"]
+
+
+class _NullBus:
+    motors = {motor: None for motor in MOTORS}
+
+    def sync_read(self, data_name: str) -> Dict[str, float]:
+        # The lamp is at rest in the middle of every range
+        return {motor: 0.0 for motor in self.motors}
+
+
+class NullFollower:
+    """Stands in for LeLampFollower: builds the same goal dict but drops it instead of writing the bus"""
+
+    def __init__(self):
+        self.bus = _NullBus()
+        self.config = LeLampFollowerConfig(port="", id="bench")
+        self.bus_lock = threading.Lock()
+        self.telemetry = None
+        self.sent = 0
+
+    def send_action(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        goal_pos = {key.removesuffix(".pos"): val for key, val in action.items() if key.endswith(".pos")}
+        self.sent += 1
+        return {f"{motor}.pos": val for motor, val in goal_pos.items()}
+
+    def send_positions(self, positions: np.ndarray, validated: bool = False) -> None:
+        goal_pos = dict(zip(self.bus.motors, positions.tolist()))
+        self.sent += 1
+
+    def position_limits(self) -> Tuple[np.ndarray, np.ndarray]:
+        return np.full(len(self.bus.motors), -100.0, dtype=np.float32), np.full(len(self.bus.motors), 100.0, dtype=np.float32)
+
+
+def _dict_baseline(robot: NullFollower, actions: List[Dict[str, float]], transition_frames: int, frames: int) -> List[float]:
+    """Per-frame work of the original dict-based playback loop, for comparison"""
+    samples = []
+    current_state = dict(actions[-1])
+    target = actions[0]
+    remaining = transition_frames
+    index = 0
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        if remaining > 0:
+            progress = max(0.0, min(1.0, 1.0 - remaining / transition_frames))
+            action = {}
+            for joint in target.keys():
+                current_val = current_state.get(joint, 0)
+                action[joint] = current_val + (target[joint] - current_val) * progress
+            robot.send_action(action)
+            current_state = action.copy()
+            remaining -= 1
+        else:
+            action = actions[index % len(actions)]
+            robot.send_action(action)
+            current_state = action.copy()
+            index += 1
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def bench_playback(lamp_id: str, recording: str, frames: int, fps: int = 30, duration: float = 3.0,
+                   recordings_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Time AnimationService._continue_playback through a transition, a gesture and the blend back to idle"""
+    service = AnimationService(port="", lamp_id=lamp_id, fps=fps, duration=duration, recordings_dir=recordings_dir)
+    service.bank.load()
+    service.robot = NullFollower()
+    service._bind_joints()
+
+    # Settle into idle so the gesture starts with a real lead-in transition
+    service.handle_event("play", service.idle_recording)
+    service._continue_playback()
+
+    t0 = time.perf_counter()
+    service.handle_event("play", recording)
+    compile_time = time.perf_counter() - t0
+
+    samples = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        service._continue_playback()
+        samples.append(time.perf_counter() - t0)
+
+    joints = service.bank.joints
+    actions = [dict(zip(joints, row)) for row in service.bank.get(recording).tolist()]
+    baseline = _dict_baseline(service.robot, actions, int(duration * fps), frames)
+
+    return {
+        "recording": recording,
+        "frames": frames,
+        "compile_us": compile_time * 1e6,
+        "frame_us": summarize(samples),
+        "dict_baseline_frame_us": summarize(baseline),
+    }
+
+
+def bench_transitions(lamp_id: str, fps: int = 30, duration: float = 3.0, tolerance: float = 0.5,
+                      max_velocity: float = 80.0, recordings_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Seconds from a play to the gesture's own first movement, and to being back at idle, starting from idle.
+
+    Compares fixed `duration` transitions over untrimmed recordings with transitions timed
+    by distance at `max_velocity` (units/s) over recordings trimmed to `tolerance`. Movement
+    is the first frame more than `tolerance` away from the gesture's opening pose.
+    """
+    modes = {
+        "fixed": AnimationService(port="", lamp_id=lamp_id, fps=fps, duration=duration, watch_recordings=False,
+                                  recordings_dir=recordings_dir),
+        "by_distance": AnimationService(port="", lamp_id=lamp_id, fps=fps, duration=duration, max_velocity=max_velocity,
+                                        trim_tolerance=tolerance, watch_recordings=False, recordings_dir=recordings_dir),
+    }
+    for service in modes.values():
+        service.bank.load()
+        service.robot = NullFollower()
+        service._bind_joints()
+
+    results: Dict[str, Any] = {"recordings": {}}
+    totals = {mode: [0.0, 0.0] for mode in modes}
+    for name in modes["fixed"].bank.names():
+        if name == modes["fixed"].idle_recording:
+            continue
+        row = {}
+        for mode, service in modes.items():
+            rest = service._load_recording(service.idle_recording)[0]
+            service._current_state = rest
+            service.handle_event("play", name)
+            plan = service._plan
+            actions = service._load_recording(name)
+            lead_in = plan.length - len(actions) - service._transition_frames(actions[-1], rest, int(duration * fps))
+            moved = np.flatnonzero((np.abs(actions - actions[0]) > tolerance).any(axis=1))
+            first_motion = (lead_in + (int(moved[0]) if len(moved) else 0)) / fps
+            row[f"{mode}_first_motion_s"] = first_motion
+            row[f"{mode}_total_s"] = plan.length / fps
+            totals[mode][0] += first_motion
+            totals[mode][1] += plan.length / fps
+        results["recordings"][name] = row
+    count = max(len(results["recordings"]), 1)
+    for mode, (first_motion, total) in totals.items():
+        results[f"{mode}_mean_first_motion_s"] = first_motion / count
+        results[f"{mode}_mean_total_s"] = total / count
+    return results
+
+
+def bench_layers(lamp_id: str, frames: int, fps: int = 30, counts: Tuple[int, ...] = (0, 1, 2, 4, 8),
+                 recordings_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Time one LayerMixer.mix per frame with a growing number of active layers.
+
+    Half the layers are gestures and half additive, all looping over the lamp's
+    recordings so none expire during the run.
+    """
+    service = AnimationService(port="", lamp_id=lamp_id, fps=fps, max_layers=max(counts), watch_recordings=False,
+                               recordings_dir=recordings_dir)
+    service.bank.load()
+    service.robot = NullFollower()
+    service._bind_joints()
+    names = [name for name in service.bank.names() if name != service.idle_recording]
+    base = service._load_recording(service.idle_recording)
+
+    results: Dict[str, Any] = {"frames": frames}
+    for count in counts:
+        mixer = LayerMixer(base.shape[1], max(counts))
+        for index in range(count):
+            name = names[index % len(names)]
+            mixer.add(f"{name}-{index}", service._load_recording(name), weight=0.5,
+                      additive=index % 2 == 1, loop=True, fade_in=fps // 2)
+        samples = []
+        for frame in range(frames):
+            t0 = time.perf_counter()
+            mixer.mix(base[frame % len(base)])
+            samples.append(time.perf_counter() - t0)
+        results[f"{count}_layers_frame_us"] = summarize(samples)
+    return results
@@ -0,0 +1,104 @@
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from lelamp.follower import LeLampFollower, LeLampFollowerConfig
+from lelamp.service.clock import FrameClock
+from lelamp.service.motors.animation_service import AnimationService
+from lelamp.service.motors.motion_profile import build_motion_profile
+from .stats import summarize
+
+
+def _track(robot: LeLampFollower, actions: np.ndarray, fps: int, send) -> Dict[str, Any]:
+    """Play `actions` in real time with `send(index)`, reading back where the servos are after every frame.
+
+    The read-backs are the measurement, so their transactions and bytes are left out of the counts.
+    """
+    bus = robot.bus
+    # Start from rest on the first frame, at full speed
+    robot.send_positions(actions[0])
+    time.sleep(0.5)
+
+    present = np.empty_like(actions)
+    send_times: List[float] = []
+    transactions = bytes_on_wire = 0
+    clock = FrameClock(fps)
+    clock.start()
+    for index in range(len(actions)):
+        before = (bus.transactions, bus.bytes_on_wire)
+        t0 = time.thread_time()
+        send(index)
+        send_times.append(time.thread_time() - t0)
+        transactions += bus.transactions - before[0]
+        bytes_on_wire += bus.bytes_on_wire - before[1]
+
+        positions = bus.sync_read("Present_Position")
+        present[index] = [positions[motor] for motor in bus.motors]
+        clock.tick()
+
+    seconds = len(actions) / fps
+    return {
+        "present": present,
+        "writes_per_s": transactions / seconds,
+        "bytes_per_s": bytes_on_wire / seconds,
+        "cpu_us_per_s": sum(send_times) / seconds * 1e6,
+        "send_cpu_us": summarize(send_times),
+    }
+
+
+def bench_motion_profile(lamp_id: str, recordings: int = 3, fps: int = 30, tolerance: float = 1.0,
+                         interval: float = 0.5, port: str = "sim://", recordings_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Play gestures on the simulated servos streamed densely and as motion profiles, and compare.
+
+    Fidelity is the RMS distance (action units) of where the servos actually were from
+    the dense recording, and between the two modes. The profile's own stats give the
+    keyframe polyline error it was built to, and the error of the ramps it expects the
+    servos to run.
+    """
+    service = AnimationService(port="", lamp_id=lamp_id, fps=fps, watch_recordings=False, recordings_dir=recordings_dir)
+    service.bank.load()
+    robot = LeLampFollower(LeLampFollowerConfig(port=port, id="bench"))
+    robot.connect(calibrate=False)
+    service.robot = robot
+    service._bind_joints()
+    steps_per_unit = robot.steps_per_unit()
+
+    results: Dict[str, Any] = {"port": port, "tolerance": tolerance, "interval_s": interval, "recordings": {}}
+    try:
+        gestures = [name for name in service.bank.names() if name != service.idle_recording][:recordings]
+        for name in gestures:
+            actions = service._load_recording(name)
+            t0 = time.perf_counter()
+            profile = build_motion_profile(actions, fps, steps_per_unit, tolerance, interval)
+            build_us = (time.perf_counter() - t0) * 1e6
+
+            dense = _track(robot, actions, fps, lambda index: robot.send_positions(actions[index]))
+
+            def send_profile(index: int):
+                command = profile.command_at[index]
+                if command >= 0:
+                    robot.send_profile(
+                        profile.positions[command], profile.velocities[command], profile.accelerations[command]
+                    )
+            profiled = _track(robot, actions, fps, send_profile)
+
+            rms = lambda a, b: float(np.sqrt(((a - b) ** 2).mean()))
+            results["recordings"][name] = {
+                "frames": len(actions),
+                "build_us": build_us,
+                "profile": profile.stats(fps),
+                "dense_writes_per_s": dense["writes_per_s"],
+                "profile_writes_per_s": profiled["writes_per_s"],
+                "dense_bytes_per_s": dense["bytes_per_s"],
+                "profile_bytes_per_s": profiled["bytes_per_s"],
+                "dense_cpu_us_per_s": dense["cpu_us_per_s"],
+                "profile_cpu_us_per_s": profiled["cpu_us_per_s"],
+                "dense_tracking_rms": rms(dense["present"], actions),
+                "profile_tracking_rms": rms(profiled["present"], actions),
+                "profile_vs_dense_rms": rms(profiled["present"], dense["present"]),
+            }
+        robot.send_positions(actions[-1])
+    finally:
+        robot.disconnect()
+    return results
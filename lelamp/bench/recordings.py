@@ -0,0 +1,108 @@
+import os
+import glob
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from lelamp.service.motors.animation_service import AnimationService
+from lelamp.service.motors.recording_bank import RecordingBank
+from lelamp.service.motors.recording_format import RecFileWriter, read_recording_csv, read_recording_rec
+from lelamp.service.motors.keyframes import compress_recording
+from lelamp.service.motors.trajectory_check import validate_trajectory
+from .playback import NullFollower
+from .stats import summarize
+
+
+def bench_recording_load(lamp_id: str, repeats: int = 20, fps: int = 30,
+                         recordings_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Time every stage of getting a recording ready to play: CSV or .rec parse, bank build and map, re-timing"""
+    service = AnimationService(port="", lamp_id=lamp_id, fps=fps, recordings_dir=recordings_dir)
+    sources = sorted(glob.glob(os.path.join(service.recordings_dir, f"*_{lamp_id}.csv")))
+    if not sources:
+        return {"error": f"no recordings for lamp id {lamp_id}"}
+
+    parse = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for path in sources:
+            read_recording_csv(path)
+        parse.append(time.perf_counter() - t0)
+
+    # Keyframe compression at the service's tolerance
+    parsed_sources = [read_recording_csv(path) for path in sources]
+    compress, keyframe_rows = [], 0
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        compressed = [compress_recording(timestamps, positions, service.bank.keyframe_tolerance or 0.5)
+                      for _, timestamps, positions in parsed_sources]
+        compress.append(time.perf_counter() - t0)
+    keyframe_rows = sum(len(key_times) for key_times, _ in compressed)
+
+    # Build and map a private bank so the real one is left alone
+    build, mapping, rec_parse = [], [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in sources:
+            shutil.copy2(path, tmp)
+
+        # The same recordings in the compact format the recorder writes
+        rec_paths = []
+        for path in sources:
+            joints, timestamps, positions = read_recording_csv(path)
+            writer = RecFileWriter(os.path.join(tmp, os.path.basename(path)[:-len(".csv")] + ".rec.bench"), joints)
+            writer.append(timestamps, positions)
+            writer.close()
+            rec_paths.append(writer.path)
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            for path in rec_paths:
+                read_recording_rec(path)
+            rec_parse.append(time.perf_counter() - t0)
+        for _ in range(repeats):
+            bank = RecordingBank(tmp, lamp_id)
+            t0 = time.perf_counter()
+            bank.build()
+            build.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            RecordingBank(tmp, lamp_id).load()
+            mapping.append(time.perf_counter() - t0)
+
+    # Re-timing into the service's cache: cold, then warm
+    service.bank.load()
+    service.robot = NullFollower()
+    service._bind_joints()
+    cold, warm = [], []
+    for _ in range(repeats):
+        service._recording_cache.clear()
+        for name in service.bank.names():
+            t0 = time.perf_counter()
+            service._load_recording(name)
+            cold.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            service._load_recording(name)
+            warm.append(time.perf_counter() - t0)
+
+    # Load-time check of every recording against the motion limits
+    retimed = [service._load_recording(name) for name in service.bank.names()]
+    validate = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for actions in retimed:
+            validate_trajectory(actions, fps, service.limits)
+        validate.append(time.perf_counter() - t0)
+
+    return {
+        "recordings": len(sources),
+        "csv_parse_all_us": summarize(parse),
+        "rec_parse_all_us": summarize(rec_parse),
+        "bank_build_us": summarize(build),
+        "bank_load_us": summarize(mapping),
+        "load_recording_cold_us": summarize(cold),
+        "load_recording_cached_us": summarize(warm),
+        "validate_all_us": summarize(validate),
+        "compress_all_us": summarize(compress),
+        "source_rows": sum(len(timestamps) for _, timestamps, _ in parsed_sources),
+        "keyframe_rows": keyframe_rows,
+        "bank_bytes": service.bank.nbytes,
+    }
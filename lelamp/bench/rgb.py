@@ -0,0 +1,68 @@
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from lelamp.service.rgb.effects import EFFECTS
+from lelamp.service.rgb.rgb_service import RGBService
+from lelamp.sim import MemoryPixelStrip
+from .stats import summarize
+
+
+def bench_rgb(frames: int, led_count: int = 40) -> Dict[str, Any]:
+    """Time solid fills and full paints on an in-memory strip that blocks for the real wire time"""
+    strip = MemoryPixelStrip(led_count, realtime=True)
+    service = RGBService(led_count=led_count, strip=strip)
+
+    rng = np.random.default_rng(0)
+    patterns = [
+        [tuple(pixel) for pixel in frame]
+        for frame in rng.integers(0, 256, size=(64, led_count, 3)).tolist()
+    ]
+
+    solid = []
+    for i in range(frames):
+        t0 = time.perf_counter()
+        service.handle_event("solid", (i % 256, 64, 255 - i % 256))
+        solid.append(time.perf_counter() - t0)
+
+    paint = []
+    t_start = time.perf_counter()
+    for i in range(frames):
+        t0 = time.perf_counter()
+        service.handle_event("paint", patterns[i % len(patterns)])
+        paint.append(time.perf_counter() - t0)
+    paint_elapsed = time.perf_counter() - t_start
+
+    # The same frame over and over, as a steady color animation would send
+    repeat = []
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        service.handle_event("paint", patterns[0])
+        repeat.append(time.perf_counter() - t0)
+
+    # Render cost of each effect, excluding the strip transfer
+    effects = {}
+    for name in EFFECTS:
+        effect = EFFECTS[name](service.matrix)
+        effect.begin(service.framebuffer.copy())
+        samples = []
+        for i in range(frames):
+            t0 = time.perf_counter()
+            frame = effect.render(i / 30.0, 1 / 30.0)
+            np.clip(frame, 0, 255, out=frame)
+            np.copyto(service.framebuffer, frame, casting="unsafe")
+            samples.append(time.perf_counter() - t0)
+        effects[name] = summarize(samples)
+
+    return {
+        "led_count": led_count,
+        "show_us": strip.show_time * 1e6,
+        "solid_us": summarize(solid),
+        "paint_us": summarize(paint),
+        "paint_repeat_us": summarize(repeat),
+        "paint_fps": frames / paint_elapsed,
+        "shows": strip.show_count,
+        "skipped_shows": service.skipped_shows,
+        "effect_render_us": effects,
+    }
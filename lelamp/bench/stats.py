@@ -0,0 +1,20 @@
+from typing import Dict, Sequence
+
+import numpy as np
+
+
+def summarize(samples: Sequence[float], scale: float = 1e6) -> Dict[str, float]:
+    """Summarize timing samples (seconds) as percentiles, by default in microseconds"""
+    values = np.asarray(samples, dtype=np.float64) * scale
+    if values.size == 0:
+        return {"count": 0}
+
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "count": int(values.size),
+        "mean": float(values.mean()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(values.max()),
+    }
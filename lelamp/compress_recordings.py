@@ -0,0 +1,55 @@
+import argparse
+import os
+
+import numpy as np
+
+from .service.motors.keyframes import compress_recording
+from .service.motors.recording_format import RecFileWriter, find_recordings, read_recording
+
+
+def compress_recordings(lamp_id, tolerance, replace=False):
+    """Rewrite every recording of a lamp as compact keyframes within `tolerance` of the original."""
+    recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
+    sources = find_recordings(recordings_dir, lamp_id)
+    if not sources:
+        print(f"No recordings found for lamp ID: {lamp_id}")
+        return
+
+    total_before = total_after = 0
+    for name, path in sorted(sources.items()):
+        before = os.path.getsize(path)
+        joints, timestamps, positions = read_recording(path)
+        key_times, key_positions = compress_recording(timestamps, positions, tolerance)
+
+        # The error that matters: the original samples against the interpolated keyframes
+        rebuilt = np.stack([np.interp(timestamps, key_times, key_positions[:, joint])
+                            for joint in range(len(joints))], axis=1)
+        error = float(np.abs(rebuilt - positions).max()) if len(positions) else 0.0
+
+        output = os.path.join(recordings_dir, f"{name}_{lamp_id}.rec")
+        writer = RecFileWriter(output, joints, {"lamp_id": lamp_id, "keyframes": True, "tolerance": tolerance})
+        writer.append(key_times, key_positions)
+        writer.close()
+        if replace and path != output:
+            os.remove(path)
+
+        after = os.path.getsize(output)
+        total_before += before
+        total_after += after
+        print(f"{name}: {len(positions)} -> {len(key_positions)} rows, {before} -> {after} bytes, max error {error:.2f}")
+
+    print(f"{len(sources)} recordings, {total_before} -> {total_after} bytes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress the recordings of a lamp to keyframes")
+    parser.add_argument('--id', type=str, required=True, help='ID of the lamp')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Largest error allowed on any joint (default: 0.5)')
+    parser.add_argument('--replace', action='store_true', help='Delete the CSV recordings once compressed')
+    args = parser.parse_args()
+
+    compress_recordings(args.id, args.tolerance, args.replace)
+
+
+if __name__ == "__main__":
+    main()
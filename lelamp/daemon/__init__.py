@@ -0,0 +1,12 @@
+from .client import LampClient, LampError
+from .protocol import default_socket_path
+
+__all__ = ['LampClient', 'LampError', 'LampDaemon', 'default_socket_path']
+
+
+def __getattr__(name):
+    # Imported on first use so thin clients don't pull in lerobot
+    if name == 'LampDaemon':
+        from .server import LampDaemon
+        return LampDaemon
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
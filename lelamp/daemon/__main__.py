@@ -0,0 +1,49 @@
+import argparse
+import signal
+import threading
+
+from .protocol import default_socket_path
+from .server import LampDaemon
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the LeLamp daemon that owns the motors and LEDs")
+    parser.add_argument('--id', type=str, required=True, help='ID of the lamp')
+    parser.add_argument('--port', type=str, required=True, help='Serial port for the lamp')
+    parser.add_argument('--socket', type=str, help='Unix socket to listen on (default: /tmp/lelamp-<id>.sock)')
+    parser.add_argument('--fps', type=int, default=30, help='Animation frames per second (default: 30)')
+    parser.add_argument('--duration', type=float, default=3.0, help='Transition length in seconds (default: 3.0)')
+    parser.add_argument('--max-velocity', type=float, help='Joint velocity limit in units/s; transitions then take as long as the farthest joint needs at it')
+    parser.add_argument('--no-rgb', action='store_true', help='Do not drive the LED strip (e.g. off the Pi)')
+    parser.add_argument('--motion-profiles', action='store_true', help='Send sparse keyframes the servos ramp between instead of every frame')
+    parser.add_argument('--keyframe-tolerance', type=float, help='Keep recordings as keyframes that rebuild them within this tolerance (default: play every sample)')
+    parser.add_argument('--fast-connect', action='store_true', help='Trust the calibration verified on an earlier connect and only write changed settings')
+    args = parser.parse_args()
+
+    daemon = LampDaemon(
+        port=args.port,
+        lamp_id=args.id,
+        socket_path=args.socket or default_socket_path(args.id),
+        fps=args.fps,
+        duration=args.duration,
+        rgb=not args.no_rgb,
+        motion_profiles=args.motion_profiles,
+        fast_connect=args.fast_connect,
+        keyframe_tolerance=args.keyframe_tolerance,
+        max_velocity=args.max_velocity,
+    )
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+
+    daemon.start()
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Shutting down lamp daemon...")
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
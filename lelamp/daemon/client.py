@@ -0,0 +1,222 @@
+import json
+import socket
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..service import EventDiscarded, Priority
+from ..service.aio import PlayFutures, threadsafe_future
+from . import protocol
+from .protocol import Op, Status, ProtocolError
+
+# Called on the client's reader thread with each reply to a request
+ReplyCallback = Callable[[Status, bytes], None]
+
+
+class LampError(Exception):
+    """The daemon refused or failed a request, or the connection to it was lost"""
+
+
+def reply_error(status: Status, reply: bytes) -> Optional[Exception]:
+    """The exception a reply stands for: EventDiscarded as in-process, LampError for failures, else None"""
+    if status == Status.DISCARDED:
+        return EventDiscarded(reply.decode(errors="replace"))
+    if status == Status.ERROR:
+        return LampError(reply.decode(errors="replace"))
+    return None
+
+
+class LampClient:
+    """Connection to a running lamp daemon.
+
+    A reader thread matches replies to requests by id, so blocking calls from
+    several threads and awaitable calls from an asyncio loop share one socket.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, ReplyCallback] = {}
+        self._pending_lock = threading.Lock()
+        self._next_id = 0
+        self._reader: Optional[threading.Thread] = None
+
+    @staticmethod
+    def available(socket_path: str) -> bool:
+        """True if a daemon accepts connections on `socket_path`"""
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    def connect(self) -> "LampClient":
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.connect(self.socket_path)
+        self._reader = threading.Thread(target=self._read_loop, name="lamp-client", daemon=True)
+        self._reader.start()
+        return self
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._sock.close()
+            self._sock = None
+        if self._reader is not None:
+            self._reader.join(timeout=1.0)
+            self._reader = None
+
+    def __enter__(self) -> "LampClient":
+        return self.connect()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_loop(self):
+        try:
+            while True:
+                op, status, request_id, payload = protocol.read_frame(self._sock)
+                with self._pending_lock:
+                    if status == Status.PENDING:
+                        on_reply = self._pending.get(request_id)
+                    else:
+                        on_reply = self._pending.pop(request_id, None)
+                if on_reply is not None:
+                    on_reply(Status(status), payload)
+        except (ProtocolError, OSError):
+            pass
+        finally:
+            # Fail everything still waiting so no caller hangs on a dead daemon
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            for on_reply in pending.values():
+                on_reply(Status.ERROR, b"Connection to the lamp daemon was lost")
+
+    def request(self, op: Op, payload: bytes, on_reply: ReplyCallback):
+        """Send a request; `on_reply(status, payload)` is called on the reader thread for every reply"""
+        if self._sock is None:
+            raise LampError("Not connected to the lamp daemon")
+        with self._pending_lock:
+            request_id = self._next_id
+            self._next_id = (self._next_id + 1) & 0xFFFF
+            self._pending[request_id] = on_reply
+        with self._send_lock:
+            self._sock.sendall(protocol.encode_frame(op, Status.OK, request_id, payload))
+
+    def call(self, op: Op, payload: bytes = b"", timeout: Optional[float] = None) -> bytes:
+        """Send a request and block until its final reply"""
+        return self._call(op, payload, self.timeout if timeout is None else timeout)[-1]
+
+    def _call(self, op: Op, payload: bytes, timeout: Optional[float]) -> List[bytes]:
+        """Every non-error reply to one request, waiting forever when `timeout` is None"""
+        replies: List[bytes] = []
+        errors: List[Exception] = []
+        finished = threading.Event()
+
+        def on_reply(status: Status, reply: bytes):
+            error = reply_error(status, reply)
+            if error is not None:
+                errors.append(error)
+            else:
+                replies.append(reply)
+            if status != Status.PENDING:
+                finished.set()
+
+        self.request(op, payload, on_reply)
+        if not finished.wait(timeout):
+            raise LampError(f"Lamp daemon did not answer {op.name} in time")
+        if errors:
+            raise errors[0]
+        return replies
+
+    def call_async(self, op: Op, payload: bytes = b""):
+        """Awaitable request, settled on the calling loop with the final reply's payload"""
+        future, done = threadsafe_future()
+
+        def on_reply(status: Status, reply: bytes):
+            error = reply_error(status, reply)
+            if error is not None:
+                done(None, error)
+            elif status == Status.OK:
+                done(reply, None)
+
+        self.request(op, payload, on_reply)
+        return future
+
+    def ping(self):
+        self.call(Op.PING)
+
+    def stats(self) -> Dict[str, Any]:
+        return json.loads(self.call(Op.STATS))
+
+    def recordings(self) -> List[str]:
+        names = self.call(Op.RECORDINGS).decode()
+        return names.split("\n") if names else []
+
+    def play(self, name: str, speed: float = 1.0, priority: Priority = Priority.NORMAL,
+             wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """Start a recording. Returns whether it started, or with `wait` whether it also played out.
+        Waiting for the end has no timeout unless one is given."""
+        payload = protocol.encode_play(name, speed, priority, wait)
+        replies = self._call(Op.PLAY, payload, timeout if wait else self.timeout)
+        return all(reply == b"\x01" for reply in replies)
+
+    def play_async(self, name: str, speed: float = 1.0, priority: Priority = Priority.NORMAL) -> PlayFutures:
+        """Same contract as AnimationService.play_async, over the socket"""
+        started, started_done = threadsafe_future()
+        finished, finished_done = threadsafe_future()
+        replies = []
+
+        def on_reply(status: Status, reply: bytes):
+            error = reply_error(status, reply)
+            if error is not None:
+                if not replies:
+                    started_done(None, error)
+                finished_done(False, None)
+                return
+            replies.append(reply)
+            if len(replies) == 1:
+                started_done(reply == b"\x01", None)
+                if status == Status.OK:
+                    finished_done(False, None)
+            else:
+                finished_done(reply == b"\x01", None)
+
+        self.request(Op.PLAY, protocol.encode_play(name, speed, priority, True), on_reply)
+        return PlayFutures(started, finished)
+
+    def pose(self, positions: Sequence[float], duration: float = 1.0):
+        """Move to a pose, in the motor order reported by `telemetry()`, and hold it"""
+        self.call(Op.POSE, protocol.encode_pose(positions, duration))
+
+    def layer(self, name: str, weight: float = 1.0, additive: bool = False, loop: bool = False,
+              fade_in: float = 0.3, fade_out: float = 0.3, curve: str = "ease", speed: float = 1.0):
+        """Mix a recording over whatever plays; see AnimationService._handle_layer"""
+        payload = {"name": name, "weight": weight, "additive": additive, "loop": loop,
+                   "fade_in": fade_in, "fade_out": fade_out, "curve": curve, "speed": speed}
+        self.call(Op.LAYER, json.dumps(payload).encode())
+
+    def unlayer(self, name: str, fade_out: Optional[float] = None):
+        """Fade a layer out, over its own fade-out unless `fade_out` seconds are given"""
+        self.call(Op.UNLAYER, json.dumps({"name": name, "fade_out": fade_out}).encode())
+
+    def telemetry(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """Present and commanded position of every motor"""
+        names, present, goal = protocol.decode_telemetry(self.call(Op.TELEMETRY))
+        return dict(zip(names, present.tolist())), dict(zip(names, goal.tolist()))
+
+    def solid(self, color: Tuple[int, int, int]):
+        self.call(Op.LED_SOLID, protocol.encode_colors([color]))
+
+    def paint(self, colors: Sequence[Tuple[int, int, int]]):
+        self.call(Op.LED_PAINT, protocol.encode_colors(colors))
+
+    def effect(self, spec: Optional[Dict[str, Any]]):
+        self.call(Op.LED_EFFECT, json.dumps(spec).encode() if spec else b"")
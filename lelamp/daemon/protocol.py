@@ -0,0 +1,116 @@
+import os
+import struct
+from enum import IntEnum
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# opcode, status, request id, payload length
+HEADER = struct.Struct("<BBHI")
+MAX_PAYLOAD = 1 << 20
+
+PLAY = struct.Struct("<fBB")    # speed, priority, flags + utf-8 name
+POSE = struct.Struct("<fB")     # duration, joint count + float32 positions in motor order
+TELEMETRY = struct.Struct("<B") # joint count + float32 present, float32 goal, "\n"-joined motor names
+PLAY_WAIT = 0x01
+
+
+def default_socket_path(lamp_id: str) -> str:
+    return os.path.join("/tmp", f"lelamp-{lamp_id}.sock")
+
+
+class Op(IntEnum):
+    PING = 0x01
+    STATS = 0x02
+    RECORDINGS = 0x03
+    PLAY = 0x10
+    POSE = 0x11
+    TELEMETRY = 0x12
+    LAYER = 0x13      # json layer payload, as for the "layer" event
+    UNLAYER = 0x14    # json {"name": ..., "fade_out": ...}
+    LED_SOLID = 0x20
+    LED_PAINT = 0x21
+    LED_EFFECT = 0x22
+
+
+class Status(IntEnum):
+    OK = 0
+    ERROR = 1
+    # More replies follow for the same request id (a waited play reports started, then finished)
+    PENDING = 2
+    # The event was replaced, dropped or never handled (EventDiscarded in the service)
+    DISCARDED = 3
+
+
+class ProtocolError(Exception):
+    """Malformed frame, or the other end went away mid-frame"""
+
+
+def encode_frame(op: int, status: int, request_id: int, payload: bytes = b"") -> bytes:
+    return HEADER.pack(op, status, request_id, len(payload)) + payload
+
+
+def _recv_exactly(sock, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ProtocolError("Connection closed")
+        received += count
+    return bytes(buffer)
+
+
+def read_frame(sock) -> Tuple[int, int, int, bytes]:
+    """Block until one whole frame arrived: (op, status, request id, payload)"""
+    op, status, request_id, length = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"Frame payload of {length} bytes exceeds {MAX_PAYLOAD}")
+    payload = _recv_exactly(sock, length) if length else b""
+    return op, status, request_id, payload
+
+
+def encode_play(name: str, speed: float, priority: int, wait: bool) -> bytes:
+    return PLAY.pack(speed, priority, PLAY_WAIT if wait else 0) + name.encode()
+
+
+def decode_play(payload: bytes) -> Tuple[str, float, int, bool]:
+    speed, priority, flags = PLAY.unpack_from(payload)
+    return payload[PLAY.size:].decode(), speed, priority, bool(flags & PLAY_WAIT)
+
+
+def encode_pose(positions: Sequence[float], duration: float) -> bytes:
+    positions = np.asarray(positions, dtype="<f4")
+    return POSE.pack(duration, len(positions)) + positions.tobytes()
+
+
+def decode_pose(payload: bytes) -> Tuple[np.ndarray, float]:
+    duration, count = POSE.unpack_from(payload)
+    return np.frombuffer(payload, dtype="<f4", count=count, offset=POSE.size), duration
+
+
+def encode_telemetry(names: List[str], present: Sequence[float], goal: Sequence[float]) -> bytes:
+    return (
+        TELEMETRY.pack(len(names))
+        + np.asarray(present, dtype="<f4").tobytes()
+        + np.asarray(goal, dtype="<f4").tobytes()
+        + "\n".join(names).encode()
+    )
+
+
+def decode_telemetry(payload: bytes) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    (count,) = TELEMETRY.unpack_from(payload)
+    offset = TELEMETRY.size
+    present = np.frombuffer(payload, dtype="<f4", count=count, offset=offset)
+    goal = np.frombuffer(payload, dtype="<f4", count=count, offset=offset + 4 * count)
+    names = payload[offset + 8 * count:].decode().split("\n") if count else []
+    return names, present, goal
+
+
+def encode_colors(colors: Sequence[Sequence[int]]) -> bytes:
+    return np.asarray(colors, dtype=np.uint8).reshape(-1, 3).tobytes()
+
+
+def decode_colors(payload: bytes) -> List[Tuple[int, int, int]]:
+    return [tuple(color) for color in np.frombuffer(payload, dtype=np.uint8).reshape(-1, 3).tolist()]
@@ -0,0 +1,78 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+from ..service import Priority
+from ..service.aio import DoneCallback, PlayFutures, threadsafe_future
+from . import protocol
+from .client import LampClient, reply_error
+from .protocol import Op, Status
+
+
+def _encode_event(event_type: str, payload: Any, priority: Priority) -> Tuple[Op, bytes]:
+    """Map a service event onto a daemon request"""
+    if event_type == "play":
+        if isinstance(payload, dict):
+            name, speed = payload["name"], float(payload.get("speed", 1.0))
+        else:
+            name, speed = payload, 1.0
+        return Op.PLAY, protocol.encode_play(name, speed, priority, False)
+    if event_type == "pose":
+        return Op.POSE, protocol.encode_pose(payload["positions"], float(payload.get("duration", 1.0)))
+    if event_type in ("layer", "unlayer"):
+        payload = payload if isinstance(payload, dict) else {"name": payload}
+        return Op.LAYER if event_type == "layer" else Op.UNLAYER, json.dumps(payload).encode()
+    if event_type == "solid":
+        return Op.LED_SOLID, protocol.encode_colors([payload])
+    if event_type == "paint":
+        return Op.LED_PAINT, protocol.encode_colors(payload)
+    if event_type == "effect":
+        return Op.LED_EFFECT, json.dumps(payload).encode() if payload else b""
+    raise ValueError(f"Unknown event type: {event_type}")
+
+
+class _RemoteService:
+    """Forwards `dispatch` / `dispatch_async` to a lamp daemon, so callers written against
+    the in-process services work unchanged when the daemon owns the hardware"""
+
+    def __init__(self, client: LampClient):
+        self.client = client
+
+    def start(self):
+        pass
+
+    def stop(self, timeout: float = 5.0):
+        pass
+
+    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL,
+                 on_done: Optional[DoneCallback] = None):
+        op, data = _encode_event(event_type, payload, priority)
+
+        def on_reply(status: Status, reply: bytes):
+            if on_done is None:
+                return
+            error = reply_error(status, reply)
+            if error is not None:
+                on_done(None, error)
+            elif op == Op.PLAY:
+                on_done(reply == b"\x01", None)
+            else:
+                on_done(None, None)
+
+        self.client.request(op, data, on_reply)
+
+    def dispatch_async(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL):
+        future, done = threadsafe_future()
+        self.dispatch(event_type, payload, priority, on_done=done)
+        return future
+
+
+class RemoteAnimationService(_RemoteService):
+    def play_async(self, recording_name: str, speed: float = 1.0, priority: Priority = Priority.NORMAL) -> PlayFutures:
+        return self.client.play_async(recording_name, speed, priority)
+
+    def get_available_recordings(self) -> List[str]:
+        return self.client.recordings()
+
+
+class RemoteRGBService(_RemoteService):
+    pass
@@ -0,0 +1,203 @@
+import os
+import json
+import socket
+import socketserver
+import threading
+import logging
+from typing import Any, Optional
+
+import numpy as np
+
+from ..service import EventDiscarded, Priority
+from ..service.motors.animation_service import AnimationService
+from . import protocol
+from .protocol import Op, Status, ProtocolError
+
+logger = logging.getLogger(__name__)
+
+
+class _Connection(socketserver.BaseRequestHandler):
+    """One client. Requests are read in order; replies may arrive out of order, keyed by request id,
+    because services answer from their own threads once the command was actually applied."""
+
+    def setup(self):
+        self.lamp: "LampDaemon" = self.server.lamp
+        self._send_lock = threading.Lock()
+
+    def reply(self, op: int, request_id: int, payload: bytes = b"", status: Status = Status.OK):
+        frame = protocol.encode_frame(op, status, request_id, payload)
+        try:
+            with self._send_lock:
+                self.request.sendall(frame)
+        except OSError:
+            # The client went away; whatever it asked for still runs
+            pass
+
+    def reply_error(self, op: int, request_id: int, error: Any):
+        status = Status.DISCARDED if isinstance(error, EventDiscarded) else Status.ERROR
+        self.reply(op, request_id, str(error).encode(), status)
+
+    def reply_when_done(self, op: int, request_id: int):
+        """DoneCallback that answers the request once the service handled the event"""
+        def done(result: Any, error: Optional[BaseException]):
+            if error is not None:
+                self.reply_error(op, request_id, error)
+            else:
+                self.reply(op, request_id)
+        return done
+
+    def handle(self):
+        while True:
+            try:
+                op, _, request_id, payload = protocol.read_frame(self.request)
+            except (ProtocolError, OSError):
+                return
+            try:
+                self.lamp.handle_request(self, op, request_id, payload)
+            except Exception as e:
+                logger.error(f"Error handling request {op:#04x}: {e}")
+                self.reply_error(op, request_id, e)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class LampDaemon:
+    """Owns the serial bus, the animation loop and the LEDs, and serves them on a Unix socket.
+
+    Connecting, calibrating and configuring the servos is paid once when the daemon starts;
+    clients (the CLIs and the agent, see `LampClient`) only exchange a few bytes per command.
+    """
+
+    def __init__(self, port: str, lamp_id: str, socket_path: Optional[str] = None, fps: int = 30,
+                 duration: float = 3.0, rgb: bool = True, socket_mode: int = 0o660, motion_profiles: bool = False,
+                 fast_connect: bool = False, keyframe_tolerance: Optional[float] = None,
+                 max_velocity: Optional[float] = None, recordings_dir: Optional[str] = None):
+        self.lamp_id = lamp_id
+        self.socket_path = socket_path or protocol.default_socket_path(lamp_id)
+        self.socket_mode = socket_mode
+        self.animation_service = AnimationService(
+            port=port, lamp_id=lamp_id, fps=fps, duration=duration, motion_profiles=motion_profiles,
+            fast_connect=fast_connect, keyframe_tolerance=keyframe_tolerance, max_velocity=max_velocity,
+            recordings_dir=recordings_dir,
+        )
+        self.rgb_service = None
+        if rgb:
+            from ..service.rgb import RGBService
+            self.rgb_service = RGBService()
+
+        self._server: Optional[_Server] = None
+
+    def start(self):
+        self._claim_socket()
+        self.animation_service.start()
+        if self.rgb_service:
+            self.rgb_service.start()
+
+        self._server = _Server(self.socket_path, _Connection)
+        self._server.lamp = self
+        os.chmod(self.socket_path, self.socket_mode)
+        threading.Thread(target=self._server.serve_forever, name="lamp-daemon", daemon=True).start()
+        print(f"Lamp daemon for {self.lamp_id} listening on {self.socket_path}")
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+        if self.rgb_service:
+            self.rgb_service.stop()
+        self.animation_service.stop()
+
+    def _claim_socket(self):
+        """Remove a socket file left by a daemon that died, refuse to start next to a live one"""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise RuntimeError(f"A lamp daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def handle_request(self, conn: _Connection, op: int, request_id: int, payload: bytes):
+        if op == Op.PING:
+            conn.reply(op, request_id)
+        elif op == Op.STATS:
+            conn.reply(op, request_id, json.dumps(self.stats()).encode())
+        elif op == Op.RECORDINGS:
+            names = self.animation_service.get_available_recordings()
+            conn.reply(op, request_id, "\n".join(names).encode())
+        elif op == Op.PLAY:
+            self._play(conn, request_id, payload)
+        elif op == Op.POSE:
+            positions, duration = protocol.decode_pose(payload)
+            self.animation_service.dispatch(
+                "pose", {"positions": positions, "duration": duration},
+                on_done=conn.reply_when_done(op, request_id),
+            )
+        elif op == Op.TELEMETRY:
+            conn.reply(op, request_id, self._telemetry())
+        elif op in (Op.LAYER, Op.UNLAYER):
+            self.animation_service.dispatch(
+                "layer" if op == Op.LAYER else "unlayer", json.loads(payload),
+                on_done=conn.reply_when_done(op, request_id),
+            )
+        elif op in (Op.LED_SOLID, Op.LED_PAINT, Op.LED_EFFECT):
+            self._led(conn, op, request_id, payload)
+        else:
+            conn.reply_error(op, request_id, f"Unknown opcode {op:#04x}")
+
+    def _play(self, conn: _Connection, request_id: int, payload: bytes):
+        name, speed, priority, wait = protocol.decode_play(payload)
+
+        def on_started(started: Any, error: Optional[BaseException]):
+            if error is not None:
+                conn.reply_error(Op.PLAY, request_id, error)
+            else:
+                status = Status.PENDING if wait and started else Status.OK
+                conn.reply(Op.PLAY, request_id, bytes([bool(started)]), status)
+
+        def on_finished(completed: Any, error: Optional[BaseException]):
+            conn.reply(Op.PLAY, request_id, bytes([bool(completed)]))
+
+        play = {"name": name, "speed": speed}
+        if wait:
+            play["on_finished"] = on_finished
+        self.animation_service.dispatch("play", play, Priority(priority), on_done=on_started)
+
+    def _telemetry(self) -> bytes:
+        service = self.animation_service
+        robot = service.robot
+        names = service.motor_names
+        if robot is None:
+            return protocol.encode_telemetry([], [], [])
+        present = service.present_positions()
+        goal = service._current_state if service._current_state is not None else np.full(len(names), np.nan)
+        return protocol.encode_telemetry(names, present, goal)
+
+    def _led(self, conn: _Connection, op: int, request_id: int, payload: bytes):
+        if self.rgb_service is None:
+            conn.reply_error(op, request_id, "This lamp daemon does not drive the LEDs")
+            return
+        if op == Op.LED_SOLID:
+            event_type, data = "solid", protocol.decode_colors(payload)[0]
+        elif op == Op.LED_PAINT:
+            event_type, data = "paint", protocol.decode_colors(payload)
+        else:
+            event_type, data = "effect", json.loads(payload) if payload else None
+        self.rgb_service.dispatch(event_type, data, on_done=conn.reply_when_done(op, request_id))
+
+    def stats(self) -> dict:
+        stats = {"animation": self.animation_service.stats()}
+        if self.rgb_service:
+            stats["rgb"] = self.rgb_service.stats()
+        return stats
@@ -34,6 +34,25 @@ class LeLampFollowerConfig(RobotConfig):
     # the number of motors in your follower arms.
     max_relative_target: int | None = None
 
+    # `goal_deadband` skips Goal_Position writes for joints whose target moved less than this since the last
+    # value written to them, and skips the whole sync write when no joint moved. Set this to a positive scalar
+    # to use the same deadband for all motors, or a dict keyed by motor name. `None` writes every frame.
+    goal_deadband: float | dict[str, float] | None = None
+
+    # `telemetry_hz` reads Present_Position on a background thread at this rate, between goal writes, and the
+    # `max_relative_target` clamp uses that cached snapshot instead of a blocking read every frame. Snapshots older
+    # than `telemetry_max_age` seconds fall back to a blocking read. `None` disables the telemetry thread.
+    telemetry_hz: float | None = None
+    telemetry_max_age: float = 0.5
+
+    # `fast_connect` reads the configuration registers of all motors with one sync read per register and only
+    # writes the values that differ. It also saves a fingerprint of the port and calibration file to `{id}.verified`
+    # in the calibration directory once the calibration on the motors matched the file, and while they still match,
+    # a reconnect only checks that the motors are present instead of the full handshake and the re-verification.
+    # A motor swapped or recalibrated from another host goes unnoticed until the calibration file changes, so
+    # only opt in for a lamp whose motors are set up from this host.
+    fast_connect: bool = False
+
     # cameras
     cameras: dict[str, CameraConfig] = field(default_factory=dict)
 
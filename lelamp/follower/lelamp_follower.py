@@ -14,11 +14,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 import logging
+import threading
 import time
 from functools import cached_property
 from typing import Any
 
+import numpy as np
+
 from lerobot.cameras.utils import make_cameras_from_configs
 from lerobot.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
 from lerobot.motors import Motor, MotorCalibration, MotorNormMode
@@ -29,10 +34,48 @@ from lerobot.motors.feetech import (
 
 from lerobot.robots import Robot
 from lerobot.robots.utils import ensure_safe_goal_position
+from lelamp.sim import SimFeetechMotorsBus, is_sim_port
 from .config_lelamp_follower import LeLampFollowerConfig
+from .telemetry import PresentPositionTelemetry
 
 logger = logging.getLogger(__name__)
 
+# Acceleration (41), Goal_Position (42), Goal_Time (44) and Goal_Velocity (46) are adjacent on the STS3215,
+# so a motion profile command sets all of them with one sync write
+_PROFILE_ADDR = 41
+_PROFILE_LENGTH = 7
+
+
+class LeLampMotorsBus(FeetechMotorsBus):
+    """FeetechMotorsBus that can also write motion profile commands"""
+
+    def sync_write_profile(self, goals: dict[str, float], velocities: list[int], accelerations: list[int]) -> None:
+        """Set Goal_Position (normalized, like `sync_write`), Goal_Velocity (steps/s) and Acceleration
+        (100 steps/s²) of the motors in `goals` with a single sync write.
+
+        The registers are adjacent on the STS3215, so every motor gets one 7-byte block:
+        Acceleration, Goal_Position, Goal_Time (0) and Goal_Velocity. `velocities` and
+        `accelerations` are raw register values in the order of `goals`.
+        """
+        raw = self._unnormalize({self.motors[motor].id: val for motor, val in goals.items()})
+        blocks = {
+            id_: int(acceleration) | raw[id_] << 8 | int(velocity) << 40
+            for id_, velocity, acceleration in zip(raw, velocities, accelerations)
+        }
+        self._sync_write(_PROFILE_ADDR, _PROFILE_LENGTH, blocks, err_msg="Failed to sync write motion profile.")
+
+    def _serialize_data(self, value: int, length: int) -> list[int]:
+        # The profile block is the only write longer than a register
+        if length in (1, 2, 4):
+            return super()._serialize_data(value, length)
+        return list(value.to_bytes(length, "little"))
+
+
+class SimLeLampMotorsBus(SimFeetechMotorsBus):
+    """The simulated bus with the same motion profile writes; its servos store each block as is"""
+
+    sync_write_profile = LeLampMotorsBus.sync_write_profile
+
 
 class LeLampFollower(Robot):
     """
@@ -46,7 +89,9 @@ class LeLampFollower(Robot):
         super().__init__(config)
         self.config = config
         norm_mode_body = MotorNormMode.DEGREES if config.use_degrees else MotorNormMode.RANGE_M100_100
-        self.bus = FeetechMotorsBus(
+        # A `sim://` port selects the simulated bus for hardware-free runs
+        bus_class = SimLeLampMotorsBus if is_sim_port(self.config.port) else LeLampMotorsBus
+        self.bus = bus_class(
             port=self.config.port,
             motors={
                 "base_yaw": Motor(1, "sts3215", norm_mode_body),
@@ -60,6 +105,24 @@ class LeLampFollower(Robot):
 
         self.cameras = make_cameras_from_configs(self.config.cameras)
 
+        # Serializes bus transactions between the control loop and the telemetry thread
+        self.bus_lock = threading.Lock()
+        self.telemetry = (
+            PresentPositionTelemetry(self.bus, self.bus_lock, config.telemetry_hz) if config.telemetry_hz else None
+        )
+
+        # Last Goal_Position written per motor, used by the deadband
+        self._last_goal_pos: dict[str, float] = {}
+        self.goal_writes = 0
+        self.goal_writes_skipped = 0
+        self.joint_writes_skipped = 0
+        # Configuration registers written by the last configure(), 0 when the motors were already set up
+        self.config_writes = 0
+        self._verified_fingerprint: str | None = None
+        # A motion profile left Goal_Velocity and Acceleration set for servo-side ramps
+        self._profile_active = False
+        self.profile_writes = 0
+
     @property
     def _motors_ft(self) -> dict[str, type]:
         return {f"{motor}.pos": float for motor in self.bus.motors}
@@ -93,17 +156,38 @@ class LeLampFollower(Robot):
         if self.is_connected:
             raise DeviceAlreadyConnectedError(f"{self} already connected")
 
-        self.bus.connect()
-        if not self.is_calibrated and calibrate:
-            logger.info(
-                "Mismatch between calibration values in the motor and the calibration file or no calibration file found"
-            )
-            self.calibrate()
+        if not self.config.fast_connect:
+            self.bus.connect()
+            self._last_goal_pos.clear()
+            if calibrate and not self.is_calibrated:
+                logger.info(
+                    "Mismatch between calibration values in the motor and the calibration file or no calibration file found"
+                )
+                self.calibrate()
+        else:
+            # Once the calibration was verified on these motors, a presence check replaces the full handshake
+            verified = self._calibration_fingerprint() == self._load_verified_fingerprint()
+            self.bus.connect(handshake=not verified)
+            self._last_goal_pos.clear()
+            if verified:
+                self._check_motors()
+            elif self._motors_match_calibration():
+                self._save_verified_fingerprint()
+            elif calibrate:
+                logger.info(
+                    "Mismatch between calibration values in the motor and the calibration file or no calibration file found"
+                )
+                self.calibrate()
+                self._save_verified_fingerprint()
+            else:
+                logger.warning(f"Calibration on the motors of {self} does not match its calibration file")
 
         for cam in self.cameras.values():
             cam.connect()
 
         self.configure()
+        if self.telemetry is not None:
+            self.telemetry.start()
         logger.info(f"{self} connected.")
 
     @property
@@ -149,7 +233,76 @@ class LeLampFollower(Robot):
         self._save_calibration()
         print("Calibration saved to", self.calibration_fpath)
 
+    def _calibration_fingerprint(self) -> str:
+        calibration = {motor: vars(cal) for motor, cal in sorted(self.bus.calibration.items())}
+        blob = json.dumps({"port": self.config.port, "calibration": calibration}, sort_keys=True)
+        return hashlib.sha1(blob.encode()).hexdigest()
+
+    @property
+    def _verified_fpath(self):
+        return self.calibration_dir / f"{self.id}.verified"
+
+    def _load_verified_fingerprint(self) -> str | None:
+        if self._verified_fingerprint is None and not is_sim_port(self.config.port):
+            try:
+                self._verified_fingerprint = self._verified_fpath.read_text().strip()
+            except OSError:
+                pass
+        return self._verified_fingerprint
+
+    def _save_verified_fingerprint(self) -> None:
+        self._verified_fingerprint = self._calibration_fingerprint()
+        # Simulated servos start over in every process, so only real lamps are remembered on disk
+        if is_sim_port(self.config.port):
+            return
+        try:
+            self._verified_fpath.parent.mkdir(parents=True, exist_ok=True)
+            self._verified_fpath.write_text(self._verified_fingerprint)
+        except OSError as e:
+            logger.warning(f"Could not save verified calibration fingerprint for {self}: {e}")
+
+    def _check_motors(self) -> None:
+        """Presence and model check of every motor in a single sync read"""
+        expected = {motor: self.bus.model_number_table[m.model] for motor, m in self.bus.motors.items()}
+        found = self.bus.sync_read("Model_Number", normalize=False)
+        if found != expected:
+            raise ConnectionError(f"Motor check failed on port '{self.config.port}': expected {expected}, found {found}")
+
+    def _motors_match_calibration(self) -> bool:
+        """Same comparison as `bus.is_calibrated`, with one sync read per register instead of a read per motor"""
+        if not self.bus.calibration:
+            return False
+        mins = self.bus.sync_read("Min_Position_Limit", normalize=False)
+        maxes = self.bus.sync_read("Max_Position_Limit", normalize=False)
+        offsets = self.bus.sync_read("Homing_Offset", normalize=False) if self.bus.protocol_version == 0 else None
+        for motor, cal in self.bus.calibration.items():
+            if (cal.range_min, cal.range_max) != (mins[motor], maxes[motor]):
+                return False
+            if offsets is not None and cal.homing_offset != offsets[motor]:
+                return False
+        return True
+
+    def _config_registers(self) -> dict[str, int]:
+        """Values configure() brings every motor to, in write order"""
+        registers = {"Return_Delay_Time": 0}
+        if self.bus.protocol_version == 0:
+            registers["Maximum_Acceleration"] = 254
+        registers["Acceleration"] = 254
+        # RAM register, but a process that stopped mid motion profile leaves it slowed down until power off
+        registers["Goal_Velocity"] = 0
+        registers["Operating_Mode"] = OperatingMode.POSITION.value
+        # Set P_Coefficient to lower value to avoid shakiness (Default is 32)
+        registers["P_Coefficient"] = 16
+        # Set I_Coefficient and D_Coefficient to default value 0 and 32
+        registers["I_Coefficient"] = 0
+        registers["D_Coefficient"] = 32
+        return registers
+
     def configure(self) -> None:
+        if self.config.fast_connect:
+            self._configure_changed()
+            return
+
         with self.bus.torque_disabled():
             self.bus.configure_motors()
             for motor in self.bus.motors:
@@ -160,6 +313,33 @@ class LeLampFollower(Robot):
                 self.bus.write("I_Coefficient", motor, 0)
                 self.bus.write("D_Coefficient", motor, 32)
 
+    def _configure_changed(self) -> None:
+        """Read every configuration register once per register and only write the motors that differ.
+
+        The EEPROM registers keep their values across power cycles, so after the first
+        connect this is a handful of sync reads and no writes at all.
+        """
+        targets = self._config_registers()
+        current = {name: self.bus.sync_read(name, normalize=False) for name in [*targets, "Torque_Enable", "Lock"]}
+        stale = {
+            name: [motor for motor, present in current[name].items() if present != value]
+            for name, value in targets.items()
+        }
+        stale = {name: motors for name, motors in stale.items() if motors}
+        self.config_writes = sum(len(motors) for motors in stale.values())
+
+        if stale:
+            with self.bus.torque_disabled():
+                for name, motors in stale.items():
+                    for motor in motors:
+                        self.bus.write(name, motor, targets[name])
+        else:
+            limp = [motor for motor in self.bus.motors if current["Torque_Enable"][motor] != 1 or current["Lock"][motor] != 1]
+            if limp:
+                # Broadcast both registers instead of two acknowledged writes per motor
+                self.bus.sync_write("Torque_Enable", {motor: 1 for motor in limp}, normalize=False)
+                self.bus.sync_write("Lock", {motor: 1 for motor in limp}, normalize=False)
+
     def setup_motors(self) -> None:
         for motor in reversed(self.bus.motors):
             input(f"Connect the controller board to the '{motor}' motor only and press enter.")
@@ -172,7 +352,8 @@ class LeLampFollower(Robot):
 
         # Read arm position
         start = time.perf_counter()
-        obs_dict = self.bus.sync_read("Present_Position")
+        with self.bus_lock:
+            obs_dict = self.bus.sync_read("Present_Position")
         obs_dict = {f"{motor}.pos": val for motor, val in obs_dict.items()}
         dt_ms = (time.perf_counter() - start) * 1e3
         logger.debug(f"{self} read state: {dt_ms:.1f}ms")
@@ -207,23 +388,147 @@ class LeLampFollower(Robot):
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
         goal_pos = {key.removesuffix(".pos"): val for key, val in action.items() if key.endswith(".pos")}
+        goal_pos = self._send_goal_position(goal_pos)
+        return {f"{motor}.pos": val for motor, val in goal_pos.items()}
+
+    def send_positions(self, positions: np.ndarray, validated: bool = False) -> None:
+        """Command arm with a row of goal positions ordered like `self.bus.motors`.
+
+        This is the allocation-light path used by compiled playback: the row is handed
+        straight to the bus without building and parsing an action dict. Rows from a plan
+        that was `validated` against the motion limits when it was compiled skip the
+        per-frame `max_relative_target` clamp and the position read it needs.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
+        if self._profile_active:
+            self._end_profile()
+        self._send_goal_position(dict(zip(self.bus.motors, positions.tolist())), clamp=not validated)
 
+    def send_profile(self, positions: np.ndarray, velocities: np.ndarray, accelerations: np.ndarray) -> None:
+        """Command a row of goal positions with the Goal_Velocity (steps/s) and Acceleration (100 steps/s²)
+        each motor should ramp there with, all in one sync write.
+
+        Used by motion profile playback, where the servos interpolate between sparse keyframes.
+        The next `send_positions` restores full speed and acceleration first.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+
+        goal_pos = dict(zip(self.bus.motors, positions.tolist()))
+        with self.bus_lock:
+            self.bus.sync_write_profile(goal_pos, velocities.tolist(), accelerations.tolist())
+        self._profile_active = True
+        self._last_goal_pos.update(goal_pos)
+        self.goal_writes += 1
+        self.profile_writes += 1
+        if self.telemetry is not None:
+            self.telemetry.notify_write()
+
+    def _end_profile(self) -> None:
+        """Back to moving at full speed towards each goal, as configure() left the motors"""
+        with self.bus_lock:
+            self.bus.sync_write("Goal_Velocity", 0, normalize=False)
+            self.bus.sync_write("Acceleration", self._config_registers()["Acceleration"], normalize=False)
+        self._profile_active = False
+
+    def steps_per_unit(self) -> np.ndarray:
+        """Servo steps per action unit of each motor, in `self.bus.motors` order"""
+        scale = []
+        for motor, m in self.bus.motors.items():
+            if m.norm_mode is MotorNormMode.DEGREES:
+                scale.append((self.bus.model_resolution_table[m.model] - 1) / 360)
+            else:
+                calibration = self.bus.calibration[motor]
+                scale.append((calibration.range_max - calibration.range_min) / 200)
+        return np.array(scale, dtype=np.float32)
+
+    def position_limits(self) -> tuple[np.ndarray, np.ndarray]:
+        """Lowest and highest goal position of each motor, in `self.bus.motors` order and action units"""
+        lower, upper = [], []
+        for motor, m in self.bus.motors.items():
+            if m.norm_mode is MotorNormMode.DEGREES:
+                calibration = self.bus.calibration[motor]
+                mid = (calibration.range_min + calibration.range_max) / 2
+                max_res = self.bus.model_resolution_table[m.model] - 1
+                lower.append((calibration.range_min - mid) * 360 / max_res)
+                upper.append((calibration.range_max - mid) * 360 / max_res)
+            else:
+                # Normalized goals outside the calibrated range are saturated by the bus
+                lower.append(-100.0)
+                upper.append(100.0)
+        return np.array(lower, dtype=np.float32), np.array(upper, dtype=np.float32)
+
+    def _send_goal_position(self, goal_pos: dict[str, float], clamp: bool = True) -> dict[str, float]:
         # Cap goal position when too far away from present position.
-        # /!\ Slower fps expected due to reading from the follower.
-        if self.config.max_relative_target is not None:
-            present_pos = self.bus.sync_read("Present_Position")
+        # /!\ Slower fps expected due to reading from the follower, unless telemetry is enabled.
+        if clamp and self.config.max_relative_target is not None:
+            present_pos = self._present_position()
             goal_present_pos = {key: (g_pos, present_pos[key]) for key, g_pos in goal_pos.items()}
             goal_pos = ensure_safe_goal_position(goal_present_pos, self.config.max_relative_target)
 
+        if self.config.goal_deadband is not None:
+            return self._send_changed_goal_position(goal_pos)
 
         # Send goal position to the arm
-        self.bus.sync_write("Goal_Position", goal_pos)
-        return {f"{motor}.pos": val for motor, val in goal_pos.items()}
+        self._write_goal_position(goal_pos)
+        return goal_pos
+
+    def _write_goal_position(self, goal_pos: dict[str, float]) -> None:
+        with self.bus_lock:
+            self.bus.sync_write("Goal_Position", goal_pos)
+        self.goal_writes += 1
+        if self.telemetry is not None:
+            self.telemetry.notify_write()
+
+    def _present_position(self) -> dict[str, float]:
+        """Present position for the safety clamp, from the telemetry snapshot when it is fresh enough."""
+        if self.telemetry is None:
+            with self.bus_lock:
+                return self.bus.sync_read("Present_Position")
+
+        snapshot = self.telemetry.snapshot()
+        if snapshot is None or snapshot.age > self.config.telemetry_max_age:
+            snapshot = self.telemetry.read_now()
+        return snapshot.positions
+
+    def _send_changed_goal_position(self, goal_pos: dict[str, float]) -> dict[str, float]:
+        """Write only joints whose goal left the deadband around the last value written to them."""
+        deadband = self.config.goal_deadband
+        last = self._last_goal_pos
+        changed = {}
+        for motor, val in goal_pos.items():
+            band = deadband[motor] if isinstance(deadband, dict) else deadband
+            if motor not in last or abs(val - last[motor]) > band:
+                changed[motor] = val
+
+        self.joint_writes_skipped += len(goal_pos) - len(changed)
+        if not changed:
+            self.goal_writes_skipped += 1
+        else:
+            self._write_goal_position(changed)
+            last.update(changed)
+
+        # The motors hold the last written goal for every skipped joint
+        return {motor: last[motor] for motor in goal_pos}
+
+    def write_stats(self) -> dict[str, int]:
+        return {
+            "goal_writes": self.goal_writes,
+            "profile_writes": self.profile_writes,
+            "goal_writes_skipped": self.goal_writes_skipped,
+            "joint_writes_skipped": self.joint_writes_skipped,
+        }
 
     def disconnect(self):
         if not self.is_connected:
             raise DeviceNotConnectedError(f"{self} is not connected.")
 
+        if self.telemetry is not None:
+            self.telemetry.stop()
+        if self._profile_active:
+            self._end_profile()
         self.bus.disconnect(self.config.disable_torque_on_disconnect)
         for cam in self.cameras.values():
             cam.disconnect()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from lerobot.motors.feetech import FeetechMotorsBus
+
+logger = logging.getLogger(__name__)
+
+# A writer that wrote within this window is considered streaming, so reads wait for its next write
+WRITER_ACTIVE_WINDOW = 0.1
+
+
+@dataclass(frozen=True)
+class TelemetrySnapshot:
+    # time.perf_counter() at which the read completed
+    timestamp: float
+    positions: dict[str, float]
+
+    @property
+    def age(self) -> float:
+        return time.perf_counter() - self.timestamp
+
+
+class PresentPositionTelemetry:
+    """
+    Reads Present_Position on a background thread at a fixed, lower rate than the control loop and
+    publishes the latest timestamped snapshot.
+
+    Reads are slotted right after a goal write (see `notify_write`) so they use the idle gap on the
+    half-duplex bus before the next frame instead of delaying it. `bus_lock` serializes every bus
+    transaction between this thread and the writer.
+    """
+
+    def __init__(self, bus: FeetechMotorsBus, bus_lock: threading.Lock, rate_hz: float):
+        self.bus = bus
+        self.bus_lock = bus_lock
+        self.period = 1.0 / rate_hz
+
+        self._snapshot: TelemetrySnapshot | None = None
+        self._last_write = 0.0
+        self._write_done = threading.Event()
+        self._running = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.reads = 0
+        self.read_errors = 0
+
+    def start(self) -> None:
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._loop, name="present-position-telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._running.clear()
+        self._write_done.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def notify_write(self) -> None:
+        """Called by the writer after each goal write: the bus is free until the next frame."""
+        self._last_write = time.perf_counter()
+        self._write_done.set()
+
+    def snapshot(self) -> TelemetrySnapshot | None:
+        return self._snapshot
+
+    def read_now(self) -> TelemetrySnapshot:
+        """Blocking read that also refreshes the published snapshot."""
+        with self.bus_lock:
+            positions = self.bus.sync_read("Present_Position")
+        self._snapshot = TelemetrySnapshot(time.perf_counter(), positions)
+        self.reads += 1
+        return self._snapshot
+
+    def _loop(self) -> None:
+        next_read = time.perf_counter()
+        while self._running.is_set():
+            now = time.perf_counter()
+            if now < next_read:
+                self._write_done.wait(timeout=next_read - now)
+                self._write_done.clear()
+                continue
+
+            # While goals are streaming, land the read in the gap right after the next write
+            if now - self._last_write < WRITER_ACTIVE_WINDOW:
+                self._write_done.clear()
+                self._write_done.wait(timeout=WRITER_ACTIVE_WINDOW)
+                if not self._running.is_set():
+                    break
+
+            try:
+                self.read_now()
+            except Exception as e:
+                self.read_errors += 1
+                logger.debug(f"Telemetry read failed: {e}")
+            # Don't try to catch up on reads missed while the bus was busy
+            next_read = max(next_read + self.period, time.perf_counter())
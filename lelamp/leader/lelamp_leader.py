@@ -25,6 +25,7 @@ from lerobot.motors.feetech import (
 )
 
 from lerobot.teleoperators import Teleoperator
+from lelamp.sim import SimFeetechMotorsBus, is_sim_port
 from .config_lelamp_leader import LeLampLeaderConfig
 
 logger = logging.getLogger(__name__)
@@ -42,7 +43,9 @@ class LeLampLeader(Teleoperator):
         super().__init__(config)
         self.config = config
         norm_mode_body = MotorNormMode.DEGREES if config.use_degrees else MotorNormMode.RANGE_M100_100
-        self.bus = FeetechMotorsBus(
+        # A `sim://` port selects the simulated bus for hardware-free runs
+        bus_class = SimFeetechMotorsBus if is_sim_port(self.config.port) else FeetechMotorsBus
+        self.bus = bus_class(
             port=self.config.port,
             motors={
                 "base_yaw": Motor(1, "sts3215", norm_mode_body),
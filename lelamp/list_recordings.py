@@ -1,9 +1,9 @@
 import argparse
 import os
-import glob
-import csv
 from datetime import datetime
 
+from .service.motors.recording_catalog import RecordingCatalog
+
 
 def list_recordings(lamp_id):
     """List all recordings for a given lamp ID."""
@@ -14,37 +14,29 @@ def list_recordings(lamp_id):
         print(f"No recordings directory found at {recordings_dir}")
         return
     
-    # Pattern to match recordings for the specific lamp ID
-    pattern = os.path.join(recordings_dir, f"*_{lamp_id}.csv")
-    recording_files = glob.glob(pattern)
+    # Only recordings added or changed since the last listing are parsed
+    catalog = RecordingCatalog(recordings_dir, lamp_id)
+    catalog.refresh()
+    entries = catalog.entries()
     
-    if not recording_files:
+    if not entries:
         print(f"No recordings found for lamp ID: {lamp_id}")
         return
     
     print(f"Recordings for lamp ID '{lamp_id}':")
     print()
     
-    for file_path in sorted(recording_files):
-        filename = os.path.basename(file_path)
-        # Extract recording name by removing the lamp_id suffix
-        recording_name = filename.replace(f"_{lamp_id}.csv", "")
-        
-        # Count rows in CSV file
-        try:
-            with open(file_path, 'r') as csvfile:
-                reader = csv.reader(csvfile)
-                row_count = sum(1 for row in reader) - 1  # Subtract header row
-        except Exception as e:
-            row_count = "Error reading file"
-        
-        # Get modified time
-        stat = os.stat(file_path)
-        modified_time = datetime.fromtimestamp(stat.st_mtime)
+    joints = [joint.removesuffix(".pos") for joint in catalog.joints]
+    for recording_name, entry in sorted(entries.items()):
+        modified_time = datetime.fromtimestamp(entry["mtime_ns"] / 1e9)
         
         print(f"{recording_name}")
-        print(f"  File: {filename}")
-        print(f"  Rows: {row_count}")
+        print(f"  File: {entry['file']}")
+        print(f"  Rows: {entry['frames']}")
+        print(f"  Duration: {entry['duration']:.2f}s")
+        print(f"  Modified: {modified_time:%Y-%m-%d %H:%M:%S}")
+        for joint, low, high, peak in zip(joints, entry["min"], entry["max"], entry["peak_velocity"]):
+            print(f"  {joint}: {low:.1f} .. {high:.1f}, peak {peak:.1f}/s")
         print()
 
 
@@ -1,18 +1,25 @@
 import argparse
 import time
-import csv
 import os
+from .daemon import LampClient, default_socket_path
 from .leader import LeLampLeader, LeLampLeaderConfig
-from lerobot.utils.robot_utils import busy_wait
+from .service.motors.recorder import RingRecorder
+from .service.motors.recording_format import RECORDING_WRITERS
   
 def main():
     parser = argparse.ArgumentParser(description="Check motors status and position")
     parser.add_argument('--id', type=str, required=True, help='ID of the lamp')
     parser.add_argument('--port', type=str, required=True, help='Serial port for the lamp')
     parser.add_argument('--name', type=str, help='Name of recording')
-    parser.add_argument('--fps', type=int, default=30, help='Frames per second for recording (default: 30)')
+    parser.add_argument('--fps', type=int, default=30, help='Samples per second, 0 to sample as fast as the bus allows (default: 30)')
+    parser.add_argument('--format', type=str, choices=sorted(RECORDING_WRITERS), default='csv', help='CSV (default) or compact binary (rec)')
     args = parser.parse_args()
 
+    # Recording moves the lamp by hand with torque off, which the daemon's animation loop would fight
+    socket_path = default_socket_path(args.id)
+    if LampClient.available(socket_path):
+        parser.error(f"A lamp daemon owns this lamp ({socket_path}), stop it before recording")
+
     leader_config = LeLampLeaderConfig(
         port=args.port,
         id=args.id,
@@ -28,38 +35,36 @@ def main():
     recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
     os.makedirs(recordings_dir, exist_ok=True)
 
-    # Set up CSV file for recording
-    csv_filename = os.path.join(recordings_dir, f"{args.name or 'recording'}_{args.id}.csv")
-    with open(csv_filename, 'w', newline='') as csvfile:
-        csv_writer = None
-        
+    # Samples are taken on their own thread and written in batches by another one,
+    # so nothing here can delay a sample
+    filename = os.path.join(recordings_dir, f"{args.name or 'recording'}_{args.id}.{args.format}")
+    joints = [f"{motor}.pos" for motor in leader.bus.motors]
+    writer = RECORDING_WRITERS[args.format](filename, joints, {"lamp_id": args.id, "rate_hz": args.fps or None})
+    recorder = RingRecorder(
+        lambda: list(leader.bus.sync_read("Present_Position").values()),
+        joints,
+        writer,
+        rate_hz=args.fps or None,
+    )
+    recorder.start()
+    
+    try:
         while True:
-            try:
-                t0 = time.perf_counter()
-                obs = leader.get_action()
-                
-                # Initialize CSV writer with headers based on first observation
-                if csv_writer is None:
-                    fieldnames = ['timestamp'] + list(obs.keys()) if isinstance(obs, dict) else ['timestamp', 'observation']
-                    csv_writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    csv_writer.writeheader()
-                
-                # Write observation to CSV
-                if isinstance(obs, dict):
-                    row = {'timestamp': t0, **obs}
-                else:
-                    row = {'timestamp': t0, 'observation': obs}
-                csv_writer.writerow(row)
-                csvfile.flush()
-                
-                print(obs)
-                
-                # Enforce FPS with busy wait
-                busy_wait(1.0 / args.fps - (time.perf_counter() - t0))
-                
-            except KeyboardInterrupt:
-                print("Shutting down teleop...")
-                break
+            time.sleep(1.0)
+            stats = recorder.stats()
+            print(f"\r{stats['samples']} samples at {stats['rate_hz']:.0f} Hz, "
+                  f"{stats['dropped']} dropped, {stats.get('late', 0)} late", end="", flush=True)
+    except KeyboardInterrupt:
+        print("\nShutting down recording...")
+    finally:
+        recorder.stop()
+        leader.disconnect()
+    
+    stats = recorder.stats()
+    print(f"Saved {stats['written']} samples to {filename}")
+    if stats["dropped"] or stats.get("late") or stats["read_errors"]:
+        print(f"{stats['dropped']} samples dropped, {stats.get('late', 0)} late "
+              f"(max {stats.get('max_lateness_ms', 0.0):.1f}ms), {stats['read_errors']} read errors")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
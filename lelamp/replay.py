@@ -1,43 +1,62 @@
 import argparse
-import csv
-import time
 import os
 
-from .follower import LeLampFollowerConfig, LeLampFollower
-from lerobot.utils.robot_utils import busy_wait
+from .daemon import LampClient, default_socket_path
+from .service.clock import FrameClock
+from .service.motors.recording_format import find_recordings, read_recording
+from .service.motors.resample import resample
 
 def main():
     parser = argparse.ArgumentParser(description="Replay recorded actions from CSV file")
     parser.add_argument('--name', type=str, required=True, help='Name of the recording to replay')
-    parser.add_argument('--port', type=str, required=True, help='Serial port for the robot')
+    parser.add_argument('--port', type=str, help='Serial port for the robot, when no lamp daemon is running')
     parser.add_argument('--id', type=str, required=True, help='ID of the robot')
     parser.add_argument('--fps', type=int, default=30, help='Frames per second for replay (default: 30)')
+    parser.add_argument('--speed', type=float, default=1.0, help='Tempo multiplier, e.g. 0.5 or 1.5 (default: 1.0)')
+    parser.add_argument('--socket', type=str, help='Lamp daemon socket (default: /tmp/lelamp-<id>.sock)')
     args = parser.parse_args()
 
+    # A running daemon already owns the port: hand it the recording instead
+    socket_path = args.socket or default_socket_path(args.id)
+    if LampClient.available(socket_path):
+        with LampClient(socket_path) as lamp:
+            print(f"Replaying {args.name} at {args.speed}x through the lamp daemon on {socket_path}")
+            if not lamp.play(args.name, args.speed, wait=True):
+                print(f"Recording {args.name} did not play to the end")
+        return
+    if args.port is None:
+        parser.error("--port is required when no lamp daemon is running")
+
+    # Imported here so replaying through the daemon does not pay for lerobot
+    from .follower import LeLampFollowerConfig, LeLampFollower
+
     robot_config = LeLampFollowerConfig(port=args.port, id=args.id)
     robot = LeLampFollower(robot_config)
     robot.connect(calibrate=False)
 
-    # Build CSV filename from name and lamp ID
+    # Find the recording file (compact .rec or CSV) from name and lamp ID
     recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
-    csv_filename = f"{args.name}_{args.id}.csv"
-    csv_path = os.path.join(recordings_dir, csv_filename)
+    recording_path = find_recordings(recordings_dir, args.id).get(args.name)
+    if recording_path is None:
+        robot.disconnect()
+        parser.error(f"No recording named {args.name} for lamp {args.id} in {recordings_dir}")
 
-    # Read CSV file and replay actions
-    with open(csv_path, 'r') as csvfile:
-        csv_reader = csv.DictReader(csvfile)
-        actions = list(csv_reader)
+    # Read the recording and re-time it to the replay rate using its timestamps
+    joints, timestamps, positions = read_recording(recording_path)
+    actions = resample(timestamps, positions, args.fps, args.speed)
     
-    print(f"Replaying {len(actions)} actions from {csv_path}")
+    print(f"Replaying {len(actions)} actions from {recording_path} at {args.speed}x")
     
-    for row in actions:
-        t0 = time.perf_counter()
-        
-        # Extract action data (exclude timestamp column)
-        action = {key: float(value) for key, value in row.items() if key != 'timestamp'}
+    clock = FrameClock(args.fps)
+    clock.start()
+    for frame in actions:
+        action = dict(zip(joints, frame.tolist()))
         robot.send_action(action)
         
-        busy_wait(1.0 / args.fps - (time.perf_counter() - t0))
+        clock.tick()
+    
+    if clock.overruns:
+        print(f"{clock.overruns} frames overran their deadline (max {clock.max_lateness * 1e3:.1f}ms late)")
     
     robot.disconnect()
 
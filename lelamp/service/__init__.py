@@ -1,3 +1,4 @@
-from .base import ServiceBase, Priority
+from .base import ServiceBase, Priority, EventDiscarded
+from .clock import FrameClock
 
-__all__ = ['ServiceBase', 'Priority']
\ No newline at end of file
+__all__ = ['ServiceBase', 'Priority', 'EventDiscarded', 'FrameClock']
@@ -0,0 +1,40 @@
+import asyncio
+from typing import Any, Callable, NamedTuple, Optional, Tuple
+
+# Called from a service thread with (result, error) once the outcome is known
+DoneCallback = Callable[[Any, Optional[BaseException]], None]
+
+
+class PlayFutures(NamedTuple):
+    # True once the gesture started, False if it could not be loaded
+    started: asyncio.Future
+    # True once the gesture and its blend back to idle played out, False if another play cut it short
+    finished: asyncio.Future
+
+
+def _settle(future: asyncio.Future, result: Any, error: Optional[BaseException]):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def threadsafe_future(loop: Optional[asyncio.AbstractEventLoop] = None) -> Tuple[asyncio.Future, DoneCallback]:
+    """Create a future on `loop` (the running loop by default) and a callback that settles it from any thread.
+
+    The callback hands the result to the loop with `call_soon_threadsafe`, so service threads never
+    touch the future directly and the awaiting coroutine is woken without a polling thread.
+    """
+    loop = loop or asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def done(result: Any = None, error: Optional[BaseException] = None):
+        try:
+            loop.call_soon_threadsafe(_settle, future, result, error)
+        except RuntimeError:
+            # The loop is already closed; nobody is left to await the result
+            pass
+
+    return future, done
@@ -1,9 +1,12 @@
 import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from collections import deque
+from typing import Any, Deque, Dict, Optional
 from enum import IntEnum
+import asyncio
 import logging
+from .aio import DoneCallback, threadsafe_future
 
 
 class Priority(IntEnum):
@@ -13,111 +16,213 @@ class Priority(IntEnum):
     CRITICAL = 0
 
 
+class EventDiscarded(Exception):
+    """The event was never handled: replaced by a newer one, dropped from a full queue, or the service was stopped"""
+
+
 class ServiceEvent:
-    def __init__(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL):
+    def __init__(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL,
+                 on_done: Optional[DoneCallback] = None):
         self.event_type = event_type
         self.payload = payload
         self.priority = priority
-    
+        self.timestamp = time.perf_counter()
+        self.on_done = on_done
+
+    def complete(self, result: Any = None, error: Optional[BaseException] = None):
+        """Report the outcome to whoever dispatched the event, at most once"""
+        on_done, self.on_done = self.on_done, None
+        if on_done is not None:
+            on_done(result, error)
+
     def __lt__(self, other):
         return self.priority < other.priority
 
 
 class ServiceBase(ABC):
-    def __init__(self, name: str):
+    """Event-driven service with a worker thread fed by a bounded priority queue.
+
+    Events are handled in priority order, FIFO within a priority. A pending event is
+    replaced by a newer one of the same type, so a burst of e.g. "solid" events only
+    applies the latest; the newer event keeps the higher of the two priorities. When
+    the queue is full the lowest-priority event is dropped. A CRITICAL event goes to
+    the front of the queue and raises `preempt_requested` while a handler runs; a
+    handler that blocks for long (e.g. MotorsService playing a recording) checks it
+    to bail out early, and work a service does outside its handlers (e.g. the effect
+    thread of RGBService) pauses while it is set.
+    """
+
+    def __init__(self, name: str, max_queue: int = 32):
         self.name = name
+        self.max_queue = max_queue
+        self._queue: Deque[ServiceEvent] = deque()
         self._current_event: Optional[ServiceEvent] = None
         self._event_lock = threading.Lock()
-        self._event_available = threading.Event()
+        # Signalled whenever an event is queued, an event finishes or the service stops
+        self._condition = threading.Condition(self._event_lock)
+        self._preempt = threading.Event()
         self._worker_thread: Optional[threading.Thread] = None
         self._running = threading.Event()
         self._stop_event = threading.Event()
         self.logger = logging.getLogger(f"service.{name}")
-    
-    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL):
+
+        # Queue counters
+        self.dispatched_count = 0
+        self.queued_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.max_queue_depth = 0
+
+    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL,
+                 on_done: Optional[DoneCallback] = None):
+        """Queue an event for the worker thread.
+
+        `on_done(result, error)` is called once with the handler's return value or exception,
+        or with EventDiscarded if the event is never handled.
+        """
+        event = ServiceEvent(event_type, payload, priority, on_done)
         if not self._running.is_set():
             self.logger.warning(f"Service {self.name} is not running, ignoring event {event_type}")
+            event.complete(error=EventDiscarded(f"Service {self.name} is not running"))
             return
-        
-        event = ServiceEvent(event_type, payload, priority)
-        
-        with self._event_lock:
-            if self._current_event is None or event.priority <= self._current_event.priority:
-                self._current_event = event
-                self._event_available.set()
-        
-        self.logger.debug(f"Dispatched event {event_type} with priority {priority.name}")
-    
+
+        with self._condition:
+            self.dispatched_count += 1
+
+            # Coalesce with a pending event of the same type: only the newest is handled,
+            # and never at a lower priority than the one it replaces
+            for index, pending in enumerate(self._queue):
+                if pending.event_type == event_type:
+                    event.priority = min(pending.priority, event.priority)
+                    del self._queue[index]
+                    self.coalesced_count += 1
+                    pending.complete(error=EventDiscarded(f"Replaced by a newer {event_type} event"))
+                    break
+
+            if len(self._queue) >= self.max_queue:
+                # Full: make room by dropping the lowest-priority event, unless that is this one
+                if event.priority >= self._queue[-1].priority:
+                    self.dropped_count += 1
+                    self.logger.warning(f"Queue full, dropped event {event_type}")
+                    event.complete(error=EventDiscarded(f"Service {self.name} queue is full"))
+                    return
+                dropped = self._queue.pop()
+                self.dropped_count += 1
+                self.logger.warning(f"Queue full, dropped event {dropped.event_type}")
+                dropped.complete(error=EventDiscarded(f"Service {self.name} queue is full"))
+
+            # Keep the queue ordered by priority, FIFO within a priority
+            index = len(self._queue)
+            while index > 0 and event.priority < self._queue[index - 1].priority:
+                index -= 1
+            self._queue.insert(index, event)
+            self.queued_count += 1
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+
+            if event.priority == Priority.CRITICAL and self._current_event is not None:
+                self._preempt.set()
+            self._condition.notify_all()
+
+        self.logger.debug(f"Dispatched event {event_type} with priority {event.priority.name}")
+
+    def dispatch_async(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL) -> asyncio.Future:
+        """Dispatch from a coroutine. The returned future, bound to the running loop, resolves to the
+        handler's return value once the event is handled, or raises EventDiscarded / the handler's error."""
+        future, done = threadsafe_future()
+        self.dispatch(event_type, payload, priority, on_done=done)
+        return future
+
     def start(self):
         if self._running.is_set():
             self.logger.warning(f"Service {self.name} is already running")
             return
-        
+
         self._running.set()
         self._stop_event.clear()
         self._worker_thread = threading.Thread(target=self._event_loop, daemon=True)
         self._worker_thread.start()
         self.logger.info(f"Service {self.name} started")
-    
+
     def stop(self, timeout: float = 5.0):
         if not self._running.is_set():
             self.logger.warning(f"Service {self.name} is not running")
             return
-        
+
         self.logger.info(f"Stopping service {self.name}")
         self._stop_event.set()
         self._running.clear()
-        
+        self._preempt.set()
+        with self._condition:
+            self._condition.notify_all()
+
         if self._worker_thread and self._worker_thread.is_alive():
             self._worker_thread.join(timeout=timeout)
             if self._worker_thread.is_alive():
                 self.logger.warning(f"Service {self.name} did not stop within timeout")
             else:
                 self.logger.info(f"Service {self.name} stopped")
-    
+
     def _event_loop(self):
-        while self._running.is_set():
-            if self._event_available.wait(timeout=0.1):
-                with self._event_lock:
-                    if self._current_event:
-                        event = self._current_event
-                    else:
-                        continue
-                
-                try:
-                    self.handle_event(event.event_type, event.payload)
-                except Exception as e:
-                    self.logger.error(f"Error handling event {event.event_type}: {e}")
-                finally:
-                    with self._event_lock:
-                        self._current_event = None
-                        self._event_available.clear()
-            
-            if self._stop_event.is_set():
-                break
-    
+        while True:
+            with self._condition:
+                while self._running.is_set() and not self._queue:
+                    self._condition.wait()
+                if not self._running.is_set() or self._stop_event.is_set():
+                    for pending in self._queue:
+                        pending.complete(error=EventDiscarded(f"Service {self.name} stopped"))
+                    self._queue.clear()
+                    break
+                event = self._current_event = self._queue.popleft()
+                self._preempt.clear()
+
+            try:
+                result = self.handle_event(event.event_type, event.payload)
+                event.complete(result)
+            except Exception as e:
+                self.logger.error(f"Error handling event {event.event_type}: {e}")
+                event.complete(error=e)
+            finally:
+                with self._condition:
+                    self._current_event = None
+                    self._condition.notify_all()
+
     @abstractmethod
     def handle_event(self, event_type: str, payload: Any):
         pass
-    
+
     @property
     def is_running(self) -> bool:
         return self._running.is_set()
-    
+
+    @property
+    def preempt_requested(self) -> bool:
+        """True once a CRITICAL event is waiting or the service is stopping"""
+        return self._preempt.is_set()
+
     @property
     def has_pending_event(self) -> bool:
         with self._event_lock:
-            return self._current_event is not None
-    
+            return self._current_event is not None or bool(self._queue)
+
+    @property
+    def queue_depth(self) -> int:
+        with self._event_lock:
+            return len(self._queue)
+
+    def stats(self) -> Dict[str, int]:
+        with self._event_lock:
+            return {
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self.max_queue_depth,
+                "dispatched": self.dispatched_count,
+                "queued": self.queued_count,
+                "coalesced": self.coalesced_count,
+                "dropped": self.dropped_count,
+            }
+
     def wait_until_idle(self, timeout: Optional[float] = None) -> bool:
         """Wait until no pending events. Returns True if idle, False if timeout."""
-        start_time = None
-        if timeout is not None:
-            start_time = time.time()
-        
-        while self.has_pending_event:
-            if timeout is not None and time.time() - start_time > timeout:
-                return False
-            time.sleep(0.01)
-        
-        return True
\ No newline at end of file
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._current_event is None and not self._queue, timeout=timeout
+            )
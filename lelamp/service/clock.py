@@ -0,0 +1,72 @@
+import time
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FrameClock:
+    """Fixed-rate loop timing against absolute deadlines.
+
+    Each `tick()` waits for the next deadline on a fixed grid (start + n * period),
+    so time spent handling events or writing the bus is absorbed instead of added
+    to the frame. The wait sleeps until `spin_threshold` before the deadline and
+    busy-spins only for that last stretch, which keeps CPU use low while still
+    hitting the deadline precisely. Frames that finish after their deadline count
+    as overruns; if the loop falls more than a whole period behind, the missed
+    slots are dropped instead of bursting through them to catch up.
+    """
+
+    def __init__(self, fps: float, spin_threshold: float = 0.001):
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.spin_threshold = spin_threshold
+        self._deadline: Optional[float] = None
+
+        self.frames = 0
+        self.overruns = 0
+        self.skipped_frames = 0
+        self.max_lateness = 0.0
+
+    def start(self):
+        """Anchor the deadline grid at now; the first tick returns one period later"""
+        self._deadline = time.perf_counter() + self.period
+
+    def tick(self) -> float:
+        """Wait for the next frame deadline. Returns how late this frame was, in seconds."""
+        now = time.perf_counter()
+        if self._deadline is None:
+            self._deadline = now + self.period
+
+        deadline = self._deadline
+        remaining = deadline - now
+        lateness = 0.0
+
+        if remaining > 0:
+            if remaining > self.spin_threshold:
+                time.sleep(remaining - self.spin_threshold)
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            lateness = -remaining
+            self.overruns += 1
+            self.max_lateness = max(self.max_lateness, lateness)
+            if lateness > self.period:
+                # Too far behind: drop the missed slots rather than running them back to back
+                missed = int(lateness / self.period)
+                self.skipped_frames += missed
+                deadline += missed * self.period
+                logger.debug(f"Frame overrun by {lateness * 1e3:.1f}ms, skipped {missed} frames")
+
+        self._deadline = deadline + self.period
+        self.frames += 1
+        return lateness
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fps": self.fps,
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "skipped_frames": self.skipped_frames,
+            "max_lateness_ms": self.max_lateness * 1e3,
+        }
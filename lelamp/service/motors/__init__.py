@@ -1,3 +1,9 @@
-from .motors_service import MotorsService
+__all__ = ['MotorsService']
 
-__all__ = ['MotorsService']
\ No newline at end of file
+
+def __getattr__(name):
+    # Imported on first use so the recording tools don't pull in lerobot
+    if name == 'MotorsService':
+        from .motors_service import MotorsService
+        return MotorsService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,220 +1,698 @@
 import os
-import csv
 import time
+import asyncio
 import threading
-from typing import Any, List, Dict, Optional, Tuple
+from collections import deque
+from typing import Any, Deque, List, Dict, Optional, Set, Tuple, Union
+import numpy as np
 from lelamp.follower import LeLampFollowerConfig, LeLampFollower
+from ..aio import DoneCallback, PlayFutures, threadsafe_future
+from ..base import EventDiscarded, Priority, ServiceEvent
+from ..clock import FrameClock
+from .recording_bank import RecordingBank
+from .recording_cache import RecordingCache
+from .recording_catalog import RecordingCatalog
+from .recording_watcher import RecordingWatcher
+from .layer_mixer import LayerMixer
+from .motion_profile import build_motion_profile
+from .playback_plan import PlaybackPlan, compile_plan, still_ends
+from .resample import resample
+from .trajectory_check import (
+    MotionLimits, TrajectoryReport, clamp_trajectory, clip_pose, transition_frames_for, validate_trajectory,
+)
 
 
 class AnimationService:
-    def __init__(self, port: str, lamp_id: str, fps: int = 30, duration: float = 5.0, idle_recording: str = "idle"):
+    def __init__(self, port: str, lamp_id: str, fps: int = 30, duration: float = 5.0, idle_recording: str = "idle",
+                 goal_deadband: Optional[float] = None, telemetry_hz: Optional[float] = None, fast_connect: bool = False,
+                 watch_recordings: bool = True, cache_bytes: int = 32 * 1024 * 1024,
+                 validate: str = "report", max_velocity: Optional[float] = None,
+                 max_acceleration: Optional[float] = None, motion_profiles: bool = False,
+                 profile_tolerance: float = 1.0, profile_interval: float = 0.5,
+                 keyframe_tolerance: Optional[float] = None, min_transition: float = 0.2,
+                 trim_tolerance: Optional[float] = None, max_layers: int = 8,
+                 recordings_dir: Optional[str] = None):
+        if validate not in ("clamp", "report", "off"):
+            raise ValueError(f"validate must be 'clamp', 'report' or 'off', not {validate!r}")
         self.port = port
         self.lamp_id = lamp_id
         self.fps = fps
+        # Transitions take `duration` seconds; with a velocity limit (`max_velocity` or the follower's
+        # `max_relative_target`) they take as long as the farthest joint needs at it, at least `min_transition`
         self.duration = duration
+        self.min_transition = min_transition
+        # With a `trim_tolerance`, motionless frames within it at either end of a gesture are cut when it is loaded
+        self.trim_tolerance = trim_tolerance
         self.idle_recording = idle_recording
-        self.robot_config = LeLampFollowerConfig(port=port, id=lamp_id)
+        # Recordings are checked against the calibrated joint ranges and, when given, these limits
+        # (units/s, units/s²) once when they are loaded. "report" prints the violations and leaves
+        # the recording as recorded; "clamp" also rewrites it to fit, so it is only used when asked for
+        self.validate = validate
+        self.max_velocity = max_velocity
+        self.max_acceleration = max_acceleration
+        self.limits: Optional[MotionLimits] = None
+        # Play validated plans as sparse keyframe commands the servos ramp between on their own,
+        # within `profile_tolerance` of the recording and at least every `profile_interval` seconds
+        self.motion_profiles = motion_profiles
+        self.profile_tolerance = profile_tolerance
+        self.profile_interval = profile_interval
+        self._steps_per_unit: Optional[np.ndarray] = None
+        self._clamp_off = True
+        self.robot_config = LeLampFollowerConfig(
+            port=port, id=lamp_id, goal_deadband=goal_deadband, telemetry_hz=telemetry_hz, fast_connect=fast_connect
+        )
         self.robot: LeLampFollower = None
-        self.recordings_dir = os.path.join(os.path.dirname(__file__), "..", "..", "recordings")
+        self.recordings_dir = recordings_dir or os.path.join(os.path.dirname(__file__), "..", "..", "recordings")
+        # Recordings play as recorded; with a `keyframe_tolerance` they are kept as keyframes within
+        # that tolerance instead and re-timed to dense frames on first play
+        self.bank = RecordingBank(self.recordings_dir, lamp_id, keyframe_tolerance)
+        self.catalog = RecordingCatalog(self.recordings_dir, lamp_id)
+        # Re-recorded or new recordings are picked up while the agent runs
+        self.watcher: Optional[RecordingWatcher] = None
+        if watch_recordings:
+            self.watcher = RecordingWatcher(self.recordings_dir, self.bank.suffixes, self._on_recordings_changed)
         
         # State management
-        self._recording_cache: Dict[str, List[Dict[str, float]]] = {}
-        self._current_state: Optional[Dict[str, float]] = None
+        # Recordings re-timed to the loop rate, keyed by (recording, fps, speed). Evicted
+        # recordings are re-timed again from the memory-mapped bank on their next play.
+        self._recording_cache = RecordingCache(cache_bytes, pinned=[idle_recording])
+        self._joint_order: Optional[List[int]] = None
+        # Whether `_joint_order` matches the bank; a lamp with no recordings yet binds on the first one
+        self._joints_bound = False
+        self._current_state: Optional[np.ndarray] = None
         self._current_recording: Optional[str] = None
-        self._current_frame_index: int = 0
-        self._current_actions: List[Dict[str, float]] = []
-        self._interpolation_frames: int = 0
-        self._interpolation_target: Optional[Dict[str, float]] = None
+        self._plan: Optional[PlaybackPlan] = None
+        self._plan_index: int = 0
+        self._idle_plan: Optional[PlaybackPlan] = None
+        # Reports how the current plan ended to whoever asked for it
+        self._plan_done: Optional[DoneCallback] = None
+        # Recordings mixed over the plan every frame; bound to the motor count on connect
+        self.max_layers = max_layers
+        self.layers: Optional[LayerMixer] = None
+        self._mixed = False
+        # Reloaded recordings waiting to be swapped in between frames: (names, re-timed cache entries and reports)
+        self._pending_reload: Optional[Tuple[
+            Set[str], Dict[Tuple[str, int, float], Tuple[Optional[np.ndarray], Optional[TrajectoryReport]]]
+        ]] = None
+        self._reload_lock = threading.Lock()
+        # The idle recording changed; the looping idle plan is recompiled at its next wrap
+        self._idle_stale = False
+        self.reload_count = 0
+        # Frames not written because they repeat the goal the servos already hold
+        self.still_frames_skipped = 0
         
         # Custom event handling
         self._running = threading.Event()
-        self._event_queue = []
+        self._event_queue: Deque[ServiceEvent] = deque()
         self._event_lock = threading.Lock()
         self._event_thread: Optional[threading.Thread] = None
+        self.clock = FrameClock(fps)
+        
+        # Queue counters
+        self.dispatched_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self.max_queue_depth = 0
+        self._start_latencies: Deque[float] = deque(maxlen=256)
     
     def start(self):
+        # Compile (if needed) and map all recordings once, before the control loop runs
+        self.bank.load()
+        
         self.robot = LeLampFollower(self.robot_config)
         self.robot.connect(calibrate=False)
+        self._bind_joints()
+        # The first transition starts where the lamp actually is instead of jumping to the first frame
+        self._current_state = self.present_positions()
         print(f"Animation service connected to {self.port}")
         
         # Start event processing thread
         self._running.set()
         self._event_thread = threading.Thread(target=self._event_loop, daemon=True)
         self._event_thread.start()
+        if self.watcher:
+            self.watcher.start()
         
         # Initialize with idle recording via self dispatch
         self.dispatch("play", self.idle_recording)
 
     def stop(self, timeout: float = 5.0):
+        if self.watcher:
+            self.watcher.stop()
+        
         # Stop event processing
         self._running.clear()
         if self._event_thread and self._event_thread.is_alive():
             self._event_thread.join(timeout=timeout)
+        with self._event_lock:
+            for pending in self._event_queue:
+                pending.complete(error=EventDiscarded("Animation service stopped"))
+            self._event_queue.clear()
+        self._finish_plan(False)
         
         if self.robot:
             self.robot.disconnect()
             self.robot = None
     
-    def dispatch(self, event_type: str, payload: Any):
-        """Dispatch an event - same interface as ServiceBase"""
+    def dispatch(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL,
+                 on_done: Optional[DoneCallback] = None):
+        """Dispatch an event - same interface as ServiceBase.
+        
+        A pending "play" is replaced by a newer one of the same or higher priority,
+        so only the latest requested gesture starts. A newer play with lower
+        priority than the pending one is dropped.
+        
+        Handlers here only compile a plan that the loop then plays frame by frame, so
+        every pending event, CRITICAL first, is handled before the next frame and no
+        handler has to check for preemption.
+        """
+        event = ServiceEvent(event_type, payload, priority, on_done)
         if not self._running.is_set():
             print(f"Animation service is not running, ignoring event {event_type}")
+            event.complete(error=EventDiscarded("Animation service is not running"))
             return
         
         with self._event_lock:
-            self._event_queue.append((event_type, payload))
+            self.dispatched_count += 1
+            if event_type == "play":
+                for index, pending in enumerate(self._event_queue):
+                    if pending.event_type != "play":
+                        continue
+                    if event.priority <= pending.priority:
+                        del self._event_queue[index]
+                        self.coalesced_count += 1
+                        pending.complete(error=EventDiscarded("Replaced by a newer play"))
+                        break
+                    self.dropped_count += 1
+                    event.complete(error=EventDiscarded("A higher priority play is pending"))
+                    return
+            
+            # Keep the queue ordered by priority, FIFO within a priority
+            index = len(self._event_queue)
+            while index > 0 and event.priority < self._event_queue[index - 1].priority:
+                index -= 1
+            self._event_queue.insert(index, event)
+            self.max_queue_depth = max(self.max_queue_depth, len(self._event_queue))
+    
+    def dispatch_async(self, event_type: str, payload: Any, priority: Priority = Priority.NORMAL) -> asyncio.Future:
+        """Dispatch from a coroutine; the future resolves to the handler's result once the event is handled"""
+        future, done = threadsafe_future()
+        self.dispatch(event_type, payload, priority, on_done=done)
+        return future
+    
+    def play_async(self, recording_name: str, speed: float = 1.0, priority: Priority = Priority.NORMAL) -> PlayFutures:
+        """Play a recording from a coroutine, with futures for when it starts and when it finishes.
+        
+        Both futures live on the calling loop and are settled from the animation thread with
+        call_soon_threadsafe. If the play is replaced or dropped before it starts, `started`
+        raises EventDiscarded and `finished` resolves to False.
+        """
+        started, started_done = threadsafe_future()
+        finished, finished_done = threadsafe_future()
+        
+        def on_handled(result: Any, error: Optional[BaseException]):
+            started_done(result, error)
+            if error is not None or not result:
+                finished_done(False, None)
+        
+        payload = {"name": recording_name, "speed": speed, "on_finished": finished_done}
+        self.dispatch("play", payload, priority, on_done=on_handled)
+        return PlayFutures(started, finished)
     
     def _event_loop(self):
         """Custom event loop that supports interruption"""
+        self.clock.start()
         while self._running.is_set():
-            # Check for events
+            # Swap in recordings reloaded by the watcher before anything reads the cache
+            if self._pending_reload is not None:
+                self._apply_reload()
+            
+            # Take everything pending so the newest command starts on this frame
             with self._event_lock:
-                if self._event_queue:
-                    event_type, payload = self._event_queue.pop(0)
-                else:
-                    event_type, payload = None, None
+                events = list(self._event_queue)
+                self._event_queue.clear()
             
-            if event_type:
+            for event in events:
                 try:
-                    self.handle_event(event_type, payload)
+                    result = self.handle_event(event.event_type, event.payload)
+                    if event.event_type == "play":
+                        self._start_latencies.append(time.perf_counter() - event.timestamp)
+                    event.complete(result)
                 except Exception as e:
-                    print(f"Error handling event {event_type}: {e}")
+                    print(f"Error handling event {event.event_type}: {e}")
+                    event.complete(error=e)
             
             # Continue current playback
             self._continue_playback()
             
-            time.sleep(1.0 / self.fps)  # Frame rate timing
+            # Frame rate timing against absolute deadlines, absorbing the work done above
+            self.clock.tick()
+    
+    @property
+    def queue_depth(self) -> int:
+        with self._event_lock:
+            return len(self._event_queue)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Queue counters and dispatch-to-start latency of recent play events, in ms"""
+        latencies = sorted(self._start_latencies)
+        reports = self._recording_cache.reports()
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "dispatched": self.dispatched_count,
+            "coalesced": self.coalesced_count,
+            "dropped": self.dropped_count,
+            "start_latency_ms": {
+                "last": self._start_latencies[-1] * 1e3 if latencies else None,
+                "p50": latencies[len(latencies) // 2] * 1e3 if latencies else None,
+                "max": latencies[-1] * 1e3 if latencies else None,
+            },
+            "clock": self.clock.stats(),
+            "cache": self._recording_cache.stats(),
+            "bank_bytes": self.bank.nbytes,
+            "still_frames_skipped": self.still_frames_skipped,
+            "layers": self.layers.stats() if self.layers else None,
+            "validation": {
+                "mode": self.validate,
+                "checked": len(reports),
+                "violations": [report.summary() for report in reports if not report.ok],
+            },
+        }
     
     def handle_event(self, event_type: str, payload: Any):
         if event_type == "play":
-            self._handle_play(payload)
+            return self._handle_play(payload)
+        elif event_type == "pose":
+            return self._handle_pose(payload)
+        elif event_type == "layer":
+            return self._handle_layer(payload)
+        elif event_type == "unlayer":
+            return self._handle_unlayer(payload)
         else:
             print(f"Unknown event type: {event_type}")
     
-    def _handle_play(self, recording_name: str):
-        """Start playing a recording with interpolation from current state"""
+    def _handle_play(self, payload: Union[str, Dict[str, Any]]) -> bool:
+        """Compile a plan that transitions from the current pose into a recording and back to idle.
+        
+        The payload is either a recording name or {"name": ..., "speed": ...} where
+        speed is a tempo multiplier (e.g. 0.5 or 1.5). An "on_finished" callback in the
+        payload is told how the plan ends. Returns whether the recording started.
+        """
         if not self.robot:
             print("Robot not connected")
-            return
+            return False
+        
+        on_finished = None
+        if isinstance(payload, dict):
+            recording_name = payload["name"]
+            speed = float(payload.get("speed", 1.0))
+            on_finished = payload.get("on_finished")
+        else:
+            recording_name = payload
+            speed = 1.0
         
         # Load the recording
-        actions = self._load_recording(recording_name)
+        actions = self._load_recording(recording_name, speed)
         if actions is None:
-            return
+            return False
         
-        print(f"Starting {recording_name} with interpolation")
+        print(f"Starting {recording_name} at {speed}x with interpolation")
+        
+        if self._current_state is None:
+            self._current_state = self.present_positions()
+        transition_frames = int(self.duration * self.fps)
+        validated = self._is_validated(recording_name, speed)
+        if recording_name == self.idle_recording:
+            plan = compile_plan(
+                recording_name, actions, self._current_state,
+                self._transition_frames(self._current_state, actions[0], transition_frames),
+                loop=True, validated=validated,
+            )
+        else:
+            idle_actions = self._load_recording(self.idle_recording)
+            return_pose = idle_actions[0] if idle_actions is not None and len(idle_actions) > 0 else None
+            if return_pose is not None:
+                validated = validated and self._is_validated(self.idle_recording)
+            plan = compile_plan(
+                recording_name, actions, self._current_state,
+                self._transition_frames(self._current_state, actions[0], transition_frames),
+                return_pose=return_pose,
+                return_frames=(self._transition_frames(actions[-1], return_pose, transition_frames)
+                               if return_pose is not None else transition_frames),
+                validated=validated,
+            )
         
-        # Set up new playback
+        # Swap in the new plan
+        self._attach_profile(plan)
+        self._finish_plan(False)
         self._current_recording = recording_name
-        self._current_actions = actions
-        self._current_frame_index = 0
+        self._plan = plan
+        self._plan_index = 0
+        self._plan_done = on_finished
+        return True
+    
+    def _handle_pose(self, payload: Dict[str, Any]) -> bool:
+        """Move to {"positions": ..., "duration": ...} (positions in motor order) and hold it until the next play"""
+        if not self.robot:
+            print("Robot not connected")
+            return False
+        
+        pose = np.asarray(payload["positions"], dtype=np.float32).reshape(1, -1)
+        if pose.shape[1] != len(self.robot.bus.motors):
+            raise ValueError(f"Expected {len(self.robot.bus.motors)} joint positions, got {pose.shape[1]}")
         
-        # If we have a current state, set up interpolation to the first frame
-        if self._current_state is not None:
-            self._interpolation_frames = int(self.duration * self.fps)
-            self._interpolation_target = actions[0]
+        validated = False
+        if self.limits is not None and self.validate != "off":
+            if self.validate == "clamp":
+                pose = clip_pose(pose, self.limits)
+            validated = validate_trajectory(pose, self.fps, self.limits).ok
+        
+        if self._current_state is None:
+            self._current_state = self.present_positions()
+        # An explicit duration is honoured as given; otherwise the distance decides
+        if "duration" in payload:
+            transition_frames = max(1, int(float(payload["duration"]) * self.fps))
+            transition_frames = self._transition_frames(self._current_state, pose[0], transition_frames, by_distance=False)
         else:
-            self._interpolation_frames = 0
-            self._interpolation_target = None
+            transition_frames = self._transition_frames(self._current_state, pose[0], int(self.duration * self.fps))
+        plan = compile_plan("pose", pose, self._current_state, transition_frames, loop=True, validated=validated)
+        self._attach_profile(plan)
+        
+        self._finish_plan(False)
+        self._current_recording = None
+        self._plan = plan
+        self._plan_index = 0
+        return True
+    
+    def _handle_layer(self, payload: Dict[str, Any]) -> bool:
+        """Mix a recording over whatever plays: {"name": ..., "weight": 1.0, "additive": False, "loop": False,
+        "fade_in": 0.3, "fade_out": 0.3, "curve": "ease", "speed": 1.0}, fades in seconds.
+        
+        A gesture layer blends the pose towards the recording by its weight; an additive
+        layer adds the recording's motion away from its first frame. A layer of the same
+        name is replaced. Non-looping layers fade out at their end, looping ones on "unlayer".
+        """
+        if not self.robot:
+            print("Robot not connected")
+            return False
+        
+        name = payload["name"]
+        actions = self._load_recording(name, float(payload.get("speed", 1.0)))
+        if actions is None:
+            return False
+        
+        self.layers.add(
+            name, actions, float(payload.get("weight", 1.0)), bool(payload.get("additive", False)),
+            bool(payload.get("loop", False)), int(float(payload.get("fade_in", 0.3)) * self.fps),
+            int(float(payload.get("fade_out", 0.3)) * self.fps), payload.get("curve", "ease"),
+        )
+        return True
+    
+    def _handle_unlayer(self, payload: Union[str, Dict[str, Any]]) -> bool:
+        """Fade a layer out, by name or {"name": ..., "fade_out": seconds}"""
+        if self.layers is None:
+            return False
+        if isinstance(payload, dict):
+            fade_out = payload.get("fade_out")
+            return self.layers.remove(payload["name"], None if fade_out is None else int(float(fade_out) * self.fps))
+        return self.layers.remove(payload)
+    
+    @property
+    def motor_names(self) -> List[str]:
+        return list(self.robot.bus.motors) if self.robot else []
+    
+    def present_positions(self) -> np.ndarray:
+        """Where the motors are now, in motor order"""
+        if self.robot.telemetry is not None:
+            positions = self.robot.telemetry.read_now().positions
+        else:
+            with self.robot.bus_lock:
+                positions = self.robot.bus.sync_read("Present_Position")
+        return np.array([positions[motor] for motor in self.robot.bus.motors], dtype=np.float32)
+    
+    def _finish_plan(self, completed: bool):
+        """Report the end of the current plan: played out (True) or cut short (False)"""
+        done, self._plan_done = self._plan_done, None
+        if done is not None:
+            done(completed, None)
     
     def _continue_playback(self):
         """Continue current playback - called every frame"""
-        if not self._current_recording or not self._current_actions:
+        plan = self._plan
+        if plan is None:
             return
         
         try:
-            # Handle interpolation to first frame
-            if self._interpolation_frames > 0 and self._interpolation_target is not None:
-                # Calculate interpolation progress
-                progress = 1.0 - (self._interpolation_frames / (self.duration * self.fps))
-                progress = max(0.0, min(1.0, progress))
-                
-                # Interpolate between current state and target
-                interpolated_action = {}
-                for joint in self._interpolation_target.keys():
-                    current_val = self._current_state.get(joint, 0)
-                    target_val = self._interpolation_target[joint]
-                    interpolated_action[joint] = current_val + (target_val - current_val) * progress
-                
-                self.robot.send_action(interpolated_action)
-                self._current_state = interpolated_action.copy()
-                self._interpolation_frames -= 1
-                return
+            wrapped = False
+            if self._plan_index >= plan.length:
+                wrapped = True
+                if plan.loops:
+                    self._plan_index = plan.loop_start
+                    # Pick up a re-recorded idle at the loop seam, blending in from the current pose
+                    if self._idle_stale and plan.recording == self.idle_recording:
+                        self._idle_stale = False
+                        if self._handle_play(self.idle_recording):
+                            plan = self._plan
+                else:
+                    # Gesture finished, the plan already blended back to idle
+                    self._finish_plan(True)
+                    plan = self._plan = self._get_idle_plan()
+                    self._plan_index = 0
+                    if plan is None:
+                        self._current_recording = None
+                        return
+                    self._current_recording = plan.recording
             
-            # Play current frame
-            if self._current_frame_index < len(self._current_actions):
-                action = self._current_actions[self._current_frame_index]
-                self.robot.send_action(action)
-                self._current_state = action.copy()
-                self._current_frame_index += 1
-            else:
-                # Recording finished
-                if self._current_recording != self.idle_recording:
-                    # Interpolate back to idle
-                    idle_actions = self._load_recording(self.idle_recording)
-                    if idle_actions is not None and len(idle_actions) > 0:
-                        self._current_recording = self.idle_recording
-                        self._current_actions = idle_actions
-                        self._current_frame_index = 0
-                        # Set up interpolation back to idle
-                        if self._current_state is not None:
-                            self._interpolation_frames = int(self.duration * self.fps)
-                            self._interpolation_target = idle_actions[0]
+            frame = plan.frames[self._plan_index]
+            profile = plan.profile
+            if self.layers is not None and self.layers.active:
+                # The mix leaves the validated plan, so it goes through the range clip and the safety clamp
+                mixed = self.layers.mix(frame)
+                np.clip(mixed, self.limits.lower, self.limits.upper, out=mixed)
+                self.robot.send_positions(mixed)
+                self._mixed = True
+            elif self._mixed:
+                # The last layer just faded out and the servos still hold its mix
+                self.robot.send_positions(frame)
+                self._mixed = False
+            elif profile is None:
+                # A frame repeating the previous one needs no write; after a wrap the previous frame is another
+                # row, and a goal the safety clamp cut short has to be sent again to be reached
+                if plan.still[self._plan_index] and not wrapped and (plan.validated or self._clamp_off):
+                    self.still_frames_skipped += 1
                 else:
-                    # Loop idle recording
-                    self._current_frame_index = 0
+                    self.robot.send_positions(frame, plan.validated)
+            else:
+                # The servos ramp between keyframes by themselves; only keyframes are written
+                command = profile.command_at[self._plan_index]
+                if command >= 0:
+                    self.robot.send_profile(
+                        profile.positions[command], profile.velocities[command], profile.accelerations[command]
+                    )
+            self._current_state = frame
+            self._plan_index += 1
                     
         except Exception as e:
             print(f"Error in playback: {e}")
             # Reset to safe state
+            self._finish_plan(False)
             self._current_recording = None
-            self._current_actions = []
-            self._current_frame_index = 0
+            self._plan = None
+            self._plan_index = 0
+    
+    def _get_idle_plan(self) -> Optional[PlaybackPlan]:
+        """Looping plan over the bare idle recording, compiled once"""
+        if self._idle_plan is None:
+            idle_actions = self._load_recording(self.idle_recording)
+            if idle_actions is None or len(idle_actions) == 0:
+                return None
+            self._idle_plan = PlaybackPlan(
+                self.idle_recording, idle_actions, loop_start=0, validated=self._is_validated(self.idle_recording)
+            )
+            self._attach_profile(self._idle_plan)
+            self._idle_stale = False
+        return self._idle_plan
+    
+    def pin_recording(self, recording_name: str):
+        """Keep every variant of a recording cached, e.g. a gesture the agent uses constantly"""
+        self._recording_cache.pin(recording_name)
+    
+    def unpin_recording(self, recording_name: str):
+        if recording_name != self.idle_recording:
+            self._recording_cache.unpin(recording_name)
     
     def get_available_recordings(self) -> List[str]:
         """Get list of recording names available for this lamp ID"""
-        if not os.path.exists(self.recordings_dir):
-            return []
+        # The catalog only rescans when the recordings directory changed
+        return self.catalog.names()
+    
+    def _bind_joints(self):
+        """Bind the bank's joint columns, the motion limits and the layers to the robot's motors"""
+        self._joint_order = None
+        self._joints_bound = False
+        if self.bank.joints:
+            self._bind_columns()
+        else:
+            print(f"No recordings for {self.lamp_id} in {self.recordings_dir}; waiting for the first one")
+        self._bind_limits()
+        self.layers = LayerMixer(len(self.robot.bus.motors), self.max_layers)
+        self._mixed = False
+        self._recording_cache.clear()
+        self._idle_plan = None
+    
+    def _bind_columns(self):
+        """Map the bank's joint columns onto the robot's motor order once"""
+        joint_order = [self.bank.joints.index(f"{motor}.pos") for motor in self.robot.bus.motors]
+        self._joint_order = None if joint_order == list(range(len(self.bank.joints))) else joint_order
+        self._joints_bound = True
+    
+    def _bind_limits(self):
+        """Motion limits in motor order, from the calibrated ranges and the configured rates"""
+        max_velocity = self.max_velocity
+        max_relative_target = self.robot.config.max_relative_target
+        if max_relative_target is not None:
+            # A validated plan skips the follower's per-frame clamp, so it must never step further than it allows
+            if isinstance(max_relative_target, dict):
+                max_relative_target = [max_relative_target[motor] for motor in self.robot.bus.motors]
+            step_velocity = np.asarray(max_relative_target, dtype=np.float32) * self.fps
+            max_velocity = step_velocity if max_velocity is None else np.minimum(max_velocity, step_velocity)
+        self._clamp_off = max_relative_target is None
+        lower, upper = self.robot.position_limits()
+        self.limits = MotionLimits(lower, upper, max_velocity, self.max_acceleration)
+        if self.motion_profiles:
+            self._steps_per_unit = self.robot.steps_per_unit()
+    
+    def _attach_profile(self, plan: PlaybackPlan):
+        """Reduce a plan to servo-side motion profile commands, when that mode is on.
+        
+        Keyframes are further apart than the per-frame safety clamp allows, so only
+        plans validated against the motion limits are played this way.
+        """
+        if not self.motion_profiles or not plan.validated or self._steps_per_unit is None:
+            return
+        plan.profile = build_motion_profile(
+            plan.frames, self.fps, self._steps_per_unit, self.profile_tolerance, self.profile_interval,
+            required=[plan.loop_start] if plan.loops else (),
+        )
+    
+    def _is_validated(self, recording_name: str, speed: float = 1.0) -> bool:
+        """Whether the re-timed recording is known to stay within range and velocity limits"""
+        # Reports live on the cache entries, so they are evicted with the recordings they describe
+        report = self._recording_cache.report((recording_name, self.fps, speed))
+        return report is not None and (report.ok or report.clamped)
+    
+    def _transition_frames(self, start: Optional[np.ndarray], target: np.ndarray, frames: int,
+                           by_distance: bool = True) -> int:
+        """Length of a ramp from `start` to `target`: `frames`, stretched if that would break the velocity
+        limit. `by_distance` with a velocity limit, as long as the farthest joint needs at the limit instead."""
+        if start is None or self.limits is None or self.validate == "off":
+            return frames
+        if by_distance and self.limits.max_velocity is not None:
+            frames = max(int(self.min_transition * self.fps), 1)
+        return transition_frames_for(start, target, self.fps, self.limits, minimum=frames)
+    
+    def _prepare_recording(self, recording_name: str,
+                           speed: float) -> Tuple[Optional[np.ndarray], Optional[TrajectoryReport]]:
+        """Re-time a recording from the bank to the loop rate and speed, in motor order, with its validation report"""
+        recording = self.bank.recording(recording_name)
+        if recording is None or len(recording[1]) == 0:
+            return None, None
+        timestamps, actions = recording
+        # The first recording of a lamp that started without any
+        if not self._joints_bound:
+            self._bind_columns()
         
-        recordings = []
-        suffix = f"_{self.lamp_id}.csv"
+        # Play at the recorded tempo whatever the loop rate, scaled by speed
+        actions = resample(timestamps, actions, self.fps, speed)
         
-        for filename in os.listdir(self.recordings_dir):
-            if filename.endswith(suffix):
-                # Remove the lamp_id suffix to get the recording name
-                recording_name = filename[:-len(suffix)]
-                recordings.append(recording_name)
+        # Reorder columns to motor order once so plans can be fed straight to the bus
+        if self._joint_order is not None:
+            actions = np.ascontiguousarray(actions[:, self._joint_order])
         
-        return sorted(recordings)
+        # Gestures start moving on their first frame; the idle loop keeps its timing
+        if self.trim_tolerance is not None and recording_name != self.idle_recording:
+            first, last = still_ends(actions, self.trim_tolerance)
+            actions = actions[first:last + 1]
+        
+        # Check the whole recording once here instead of clamping every frame on the way to the bus
+        report = None
+        if self.limits is not None and self.validate != "off":
+            report = validate_trajectory(actions, self.fps, self.limits, recording_name)
+            if not report.ok:
+                if self.validate == "clamp":
+                    actions = clamp_trajectory(actions, self.fps, self.limits)
+                    report.clamped = True
+                    print(f"Clamped recording {recording_name} to the motion limits: {report.summary()}")
+                else:
+                    print(f"Recording {recording_name} exceeds motion limits: {report.summary()}")
+        return actions, report
     
-    def _load_recording(self, recording_name: str) -> Optional[List[Dict[str, float]]]:
-        """Load a recording from cache or file"""
+    def _load_recording(self, recording_name: str, speed: float = 1.0) -> Optional[np.ndarray]:
+        """Load a recording re-timed to the loop rate and speed, from cache or the memory-mapped bank"""
         # Check cache first
-        if recording_name in self._recording_cache:
-            return self._recording_cache[recording_name]
-        
-        csv_filename = f"{recording_name}_{self.lamp_id}.csv"
-        csv_path = os.path.join(self.recordings_dir, csv_filename)
-        
-        if not os.path.exists(csv_path):
-            print(f"Recording not found: {csv_path}")
-            return None
+        key = (recording_name, self.fps, speed)
+        actions = self._recording_cache.get(key)
+        if actions is not None:
+            return actions
         
         try:
-            with open(csv_path, 'r') as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                actions = []
-                for row in csv_reader:
-                    # Extract action data (exclude timestamp column)
-                    action = {key: float(value) for key, value in row.items() if key != 'timestamp'}
-                    actions.append(action)
+            # Pick up recordings added or changed since the bank was mapped
+            if recording_name not in self.bank:
+                self.bank.refresh()
+            
+            actions, report = self._prepare_recording(recording_name, speed)
+            if actions is None:
+                print(f"Recording not found: {recording_name}_{self.lamp_id} in {self.recordings_dir}")
+                return None
             
             # Cache the recording
-            self._recording_cache[recording_name] = actions
+            self._recording_cache.put(key, actions, report)
             return actions
             
         except Exception as e:
             print(f"Error loading recording {recording_name}: {e}")
             return None
     
-    
\ No newline at end of file
+    def _on_recordings_changed(self, names: Set[str]):
+        """Watcher thread: rebuild the bank and re-time cached variants of the changed recordings.
+        
+        The control loop only swaps the results in between frames, so parsing never
+        delays a frame and a gesture already playing keeps its compiled frames.
+        """
+        self.bank.refresh()
+        self.catalog.refresh()
+        
+        prepared = {}
+        for key in self._recording_cache.keys():
+            if key[0] in names:
+                try:
+                    prepared[key] = self._prepare_recording(key[0], key[2])
+                except Exception as e:
+                    print(f"Error reloading recording {key[0]}: {e}")
+                    prepared[key] = (None, None)
+        
+        with self._reload_lock:
+            if self._pending_reload is not None:
+                # The control loop has not caught up yet: merge with the earlier reload
+                pending_names, pending_prepared = self._pending_reload
+                names = pending_names | names
+                prepared = {**pending_prepared, **prepared}
+            self._pending_reload = (names, prepared)
+        print(f"Reloaded recordings: {', '.join(sorted(names))}")
+    
+    def _apply_reload(self):
+        """Control thread: replace cached recordings with the reloaded ones"""
+        with self._reload_lock:
+            names, prepared = self._pending_reload
+            self._pending_reload = None
+        
+        self._recording_cache.discard(names)
+        for key, (actions, report) in prepared.items():
+            if actions is not None:
+                self._recording_cache.put(key, actions, report)
+        
+        if self.idle_recording in names:
+            self._idle_plan = None
+            self._idle_stale = True
+        self.reload_count += 1
@@ -0,0 +1,120 @@
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def select_keyframes(frames: np.ndarray, tolerance, max_gap: Optional[int] = None,
+                     required: Iterable[int] = (), times: Optional[np.ndarray] = None) -> np.ndarray:
+    """Indices of the frames a linear interpolation needs to stay within `tolerance` of every frame.
+
+    Ramer–Douglas–Peucker over (frames, joints) rows, sampled at a fixed rate or at
+    `times`: a segment between two keyframes is split at its worst frame until no
+    joint of any frame in it is further than `tolerance` (a scalar or one value per
+    joint) from the straight line. Each segment is checked with a single vectorized
+    evaluation. The first and last frames and any `required` frames are always
+    kept, and segments longer than `max_gap` frames are split evenly.
+    """
+    count = len(frames)
+    if count <= 2:
+        return np.arange(count, dtype=np.int64)
+
+    tolerance = np.maximum(np.asarray(tolerance, dtype=np.float32), np.float32(1e-6))
+    anchors = sorted({0, count - 1, *(index for index in required if 0 <= index < count)})
+    keep = np.zeros(count, dtype=bool)
+    keep[anchors] = True
+
+    stack = list(zip(anchors[:-1], anchors[1:]))
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        if times is None:
+            weights = np.arange(1, end - start, dtype=np.float32)[:, None] / np.float32(end - start)
+        else:
+            span = max(float(times[end] - times[start]), 1e-9)
+            weights = ((times[start + 1:end] - times[start]) / span).astype(np.float32)[:, None]
+        line = frames[start] + (frames[end] - frames[start]) * weights
+        error = (np.abs(frames[start + 1:end] - line) / tolerance).max(axis=1)
+        worst = int(error.argmax())
+        if error[worst] > 1.0:
+            split = start + 1 + worst
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    keyframes = np.flatnonzero(keep)
+    if max_gap:
+        keyframes = _limit_gaps(keyframes, max_gap)
+    return keyframes
+
+
+def _limit_gaps(keyframes: np.ndarray, max_gap: int) -> np.ndarray:
+    filled: List[int] = [int(keyframes[0])]
+    for end in keyframes[1:].tolist():
+        start = filled[-1]
+        pieces = -(-(end - start) // max_gap)
+        filled.extend(start + (end - start) * piece // pieces for piece in range(1, pieces))
+        filled.append(end)
+    return np.asarray(filled, dtype=np.int64)
+
+
+def interpolate_keyframes(keyframes: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """Dense (count, joints) rows rebuilt from `values` at frame indices `keyframes`"""
+    positions = np.arange(count, dtype=np.float64)
+    dense = np.empty((count, values.shape[1]), dtype=np.float32)
+    for joint in range(values.shape[1]):
+        dense[:, joint] = np.interp(positions, keyframes, values[:, joint])
+    return dense
+
+
+def _still_runs(positions: np.ndarray, timestamps: np.ndarray, tolerance: np.ndarray,
+                min_duration: float) -> List[Tuple[int, int]]:
+    """(first, last) sample of each stretch of at least `min_duration` seconds in which
+    no joint moves over a band wider than `tolerance`"""
+    runs = []
+    count = len(positions)
+    start = 0
+    while start < count - 1:
+        low = high = positions[start]
+        end = start
+        while end + 1 < count:
+            low_next = np.minimum(low, positions[end + 1])
+            high_next = np.maximum(high, positions[end + 1])
+            if (high_next - low_next > tolerance).any():
+                break
+            low, high, end = low_next, high_next, end + 1
+        if end > start and timestamps[end] - timestamps[start] >= min_duration:
+            runs.append((start, end))
+            start = end
+        else:
+            start += 1
+    return runs
+
+
+def compress_recording(timestamps: np.ndarray, positions: np.ndarray, tolerance=0.5,
+                       min_still: float = 0.25) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a recording to keyframes that linear interpolation rebuilds within `tolerance` of every sample.
+
+    Stretches where the lamp holds still (every joint within a `tolerance` band for
+    at least `min_still` seconds) become two identical keyframes at the middle of
+    the band, so playback rebuilds them as exactly repeated rows that need no bus
+    writes. The remaining motion goes through Ramer–Douglas–Peucker at half the
+    tolerance, which keeps the total error within `tolerance`.
+
+    Returns (timestamps, positions) of the keyframes, a valid recording on its own.
+    """
+    positions = np.asarray(positions, dtype=np.float32)
+    count = len(positions)
+    if count <= 2:
+        return np.array(timestamps, dtype=np.float32), positions.copy()
+
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=np.float32), positions.shape[1:])
+    flattened = positions.copy()
+    anchors: List[int] = []
+    for first, last in _still_runs(positions, timestamps, tolerance, min_still):
+        run = positions[first:last + 1]
+        flattened[first:last + 1] = (run.min(axis=0) + run.max(axis=0)) / 2
+        anchors.extend((first, last))
+
+    keyframes = select_keyframes(flattened, tolerance / 2, required=anchors, times=np.asarray(timestamps, dtype=np.float64))
+    return np.ascontiguousarray(timestamps[keyframes], dtype=np.float32), np.ascontiguousarray(flattened[keyframes])
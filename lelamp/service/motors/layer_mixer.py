@@ -0,0 +1,173 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+CURVES = ("linear", "ease")
+
+
+class LayerMixer:
+    """Blends up to `capacity` recordings on top of a base pose, one vectorized mix per frame.
+
+    A gesture layer pulls the pose towards its own frames by its weight; gesture
+    layers stack in the order they were added, each blending over everything
+    below it. An additive layer adds its frames' offset from its first frame,
+    scaled by its weight, so a small bob can ride on whatever is playing.
+    Weights fade in and out over `fade_in`/`fade_out` frames along a linear or
+    eased ("ease", smoothstep) curve.
+
+    The state of every slot lives in fixed-size arrays and the frames of all layers
+    in one pool, so `mix` does the same handful of array operations whether no
+    layer or all of them are active: gather one row per slot, evaluate the fade
+    envelopes, and take one weighted sum.
+    """
+
+    def __init__(self, joints: int, capacity: int = 8):
+        self.joints = joints
+        self.capacity = capacity
+        self.frame = 0
+        self.names: List[Optional[str]] = [None] * capacity
+        self._sources: List[Optional[np.ndarray]] = [None] * capacity
+        self._pool = np.zeros((1, joints), dtype=np.float32)
+        self._offset = np.zeros(capacity, dtype=np.int64)
+        self._length = np.ones(capacity, dtype=np.int64)
+        self._start = np.zeros(capacity, dtype=np.int64)
+        self._end = np.zeros(capacity, dtype=np.int64)
+        self._fade_in = np.ones(capacity, dtype=np.int64)
+        self._fade_out = np.ones(capacity, dtype=np.int64)
+        self._weight = np.zeros(capacity, dtype=np.float32)
+        self._loop = np.zeros(capacity, dtype=bool)
+        self._ease = np.zeros(capacity, dtype=bool)
+        self._additive = np.zeros(capacity, dtype=bool)
+        self._active = np.zeros(capacity, dtype=bool)
+        # Every slot, gesture layers first from the bottom of the stack to the top
+        self._order = np.arange(capacity, dtype=np.int64)
+        self._sequence = np.zeros(capacity, dtype=np.int64)
+        self._added = 0
+        self._coefficients = np.zeros(capacity, dtype=np.float32)
+        self._out = np.zeros(joints, dtype=np.float32)
+
+    @property
+    def active(self) -> int:
+        return int(self._active.sum())
+
+    def add(self, name: str, frames: np.ndarray, weight: float = 1.0, additive: bool = False,
+            loop: bool = False, fade_in: int = 0, fade_out: int = 0, curve: str = "ease"):
+        """Start a layer over (frames, joints) rows in motor order, replacing any layer of the same name"""
+        if curve not in CURVES:
+            raise ValueError(f"curve must be one of {CURVES}, not {curve!r}")
+        if len(frames) == 0:
+            raise ValueError(f"Layer {name} has no frames")
+        if frames.shape[1] != self.joints:
+            raise ValueError(f"Expected {self.joints} joints, got {frames.shape[1]}")
+        if name in self.names:
+            self._free(self.names.index(name))
+        free = np.flatnonzero(~self._active)
+        if len(free) == 0:
+            raise ValueError(f"All {self.capacity} layers are in use")
+        slot = int(free[0])
+
+        frames = np.asarray(frames, dtype=np.float32)
+        self.names[slot] = name
+        self._sources[slot] = frames - frames[0] if additive else frames
+        self._length[slot] = len(frames)
+        self._start[slot] = self.frame
+        self._end[slot] = np.iinfo(np.int64).max if loop else self.frame + len(frames)
+        self._fade_in[slot] = max(fade_in, 1)
+        self._fade_out[slot] = max(fade_out, 1)
+        self._weight[slot] = weight
+        self._loop[slot] = loop
+        self._ease[slot] = curve == "ease"
+        self._additive[slot] = additive
+        self._active[slot] = True
+        self._sequence[slot] = self._added
+        self._added += 1
+        self._rebuild()
+
+    def remove(self, name: str, fade_out: Optional[int] = None) -> bool:
+        """Fade a layer out from now, over its own fade-out or `fade_out` frames"""
+        if name not in self.names:
+            return False
+        slot = self.names.index(name)
+        if fade_out is not None:
+            self._fade_out[slot] = max(fade_out, 1)
+        self._end[slot] = min(int(self._end[slot]), self.frame + int(self._fade_out[slot]))
+        return True
+
+    def clear(self):
+        for slot in np.flatnonzero(self._active).tolist():
+            self._free(slot)
+        self._rebuild()
+
+    def mix(self, base: np.ndarray) -> np.ndarray:
+        """The pose for this frame: `base` with every layer blended over it. Advances one frame."""
+        frame = self.frame
+        elapsed = frame - self._start
+        local = np.where(self._loop, elapsed % self._length, np.minimum(elapsed, self._length - 1))
+        rows = self._pool[self._offset + local]
+
+        # Fade envelopes: rising over fade_in from the start, falling over fade_out towards the end
+        envelope = np.minimum(
+            np.clip((elapsed + 1) / self._fade_in, 0.0, 1.0), np.clip((self._end - frame) / self._fade_out, 0.0, 1.0)
+        )
+        envelope = np.where(self._ease, envelope * envelope * (3.0 - 2.0 * envelope), envelope)
+        weights = (self._weight * envelope * self._active).astype(np.float32)
+
+        # Each gesture layer lerps over the stack below it, so its row keeps its weight
+        # times whatever the layers above leave over; the base gets what is left at the top
+        gestures = np.where(self._additive, np.float32(0.0), weights)[self._order]
+        remaining = np.cumprod((1.0 - gestures)[::-1])[::-1]
+        coefficients = self._coefficients
+        coefficients[self._order[:-1]] = gestures[:-1] * remaining[1:]
+        coefficients[self._order[-1]] = gestures[-1]
+        coefficients[self._additive] = weights[self._additive]
+        base_weight = float(remaining[0])
+
+        out = self._out
+        np.dot(coefficients, rows, out=out)
+        out += base_weight * base
+        self.frame = frame + 1
+
+        if (self._active & (self._end <= self.frame)).any():
+            self._expire()
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "active": [
+                {"name": self.names[slot], "weight": float(self._weight[slot]), "additive": bool(self._additive[slot])}
+                for slot in np.flatnonzero(self._active).tolist()
+            ],
+        }
+
+    def _expire(self):
+        finished = np.flatnonzero(self._active & (self._end <= self.frame))
+        if len(finished) == 0:
+            return
+        for slot in finished.tolist():
+            self._free(slot)
+        self._rebuild()
+
+    def _free(self, slot: int):
+        self.names[slot] = None
+        self._sources[slot] = None
+        self._active[slot] = False
+        self._weight[slot] = 0.0
+        self._length[slot] = 1
+        self._end[slot] = 0
+
+    def _rebuild(self):
+        """Lay the frames of the active layers out in one pool and re-sort the gesture stack"""
+        blocks = [np.zeros((1, self.joints), dtype=np.float32)]
+        offset = 1
+        self._offset[:] = 0
+        for slot, source in enumerate(self._sources):
+            if source is None:
+                continue
+            blocks.append(source)
+            self._offset[slot] = offset
+            offset += len(source)
+        self._pool = np.concatenate(blocks)
+        # Inactive and additive slots sort last and carry no gesture weight
+        rank = np.where(self._active & ~self._additive, self._sequence, self._added + np.arange(self.capacity))
+        self._order = np.argsort(rank, kind="stable")
@@ -0,0 +1,180 @@
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from .keyframes import interpolate_keyframes, select_keyframes
+
+# STS3215 units: Goal_Velocity in steps/s (0 is "as fast as possible"), Acceleration in 100 steps/s² (0 likewise)
+MAX_GOAL_VELOCITY = 3400
+MAX_ACCELERATION = 254
+ACCELERATION_UNIT = 100.0
+
+
+class MotionProfile:
+    """Sparse servo commands that reproduce a dense plan.
+
+    Each command sets Goal_Position to the next keyframe together with the
+    Goal_Velocity and Acceleration that make the servo's own trapezoidal ramp
+    arrive there when the keyframe is due, so the host only writes at keyframes.
+    `command_at[frame]` is the index of the command to send on that frame, or -1.
+    `max_error`/`rms_error` compare the ramps the servos run with the dense frames;
+    `polyline_error` is the largest distance of the straight lines between the
+    keyframes from them, the tolerance the keyframes were chosen for.
+    """
+
+    __slots__ = ("keyframes", "command_at", "positions", "velocities", "accelerations", "max_error", "rms_error",
+                 "polyline_error")
+
+    def __init__(self, keyframes: np.ndarray, command_at: np.ndarray, positions: np.ndarray,
+                 velocities: np.ndarray, accelerations: np.ndarray, max_error: np.ndarray, rms_error: np.ndarray,
+                 polyline_error: np.ndarray):
+        self.keyframes = keyframes
+        self.command_at = command_at
+        self.positions = positions
+        self.velocities = velocities
+        self.accelerations = accelerations
+        self.max_error = max_error
+        self.rms_error = rms_error
+        self.polyline_error = polyline_error
+
+    @property
+    def commands(self) -> int:
+        return len(self.positions)
+
+    def stats(self, fps: float) -> Dict[str, Any]:
+        seconds = len(self.command_at) / fps
+        return {
+            "frames": len(self.command_at),
+            "commands": self.commands,
+            "commands_per_s": self.commands / seconds if seconds else 0.0,
+            "max_error": self.max_error.tolist(),
+            "rms_error": self.rms_error.tolist(),
+            "polyline_error": self.polyline_error.tolist(),
+        }
+
+
+def servo_ramp(t: np.ndarray, offset: np.ndarray, velocity: np.ndarray, max_velocity: np.ndarray,
+               acceleration: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Position (relative to the start) and velocity of servos `t` seconds after being sent towards goals
+    `offset` away while moving at `velocity`, all in steps.
+
+    This is the ramp a Feetech servo runs for a goal with Goal_Velocity `max_velocity` and
+    Acceleration `acceleration` (steps/s²): brake first if it is moving away from the goal,
+    speed up to at most `max_velocity` (a servo moving faster is taken down to it at once),
+    cruise, and brake to stop on the goal, harder than `acceleration` only when it comes in
+    too fast to stop there otherwise.
+    """
+    direction = np.where(offset != 0, np.sign(offset), 1.0)
+    distance = np.abs(offset)
+    speed = velocity * direction
+
+    # Moving away from the goal: stop first, then start over from rest further away
+    turn = np.maximum(-speed, 0.0) / acceleration
+    turn_distance = -np.maximum(-speed, 0.0) ** 2 / (2.0 * acceleration)
+    entry = np.clip(speed, 0.0, max_velocity)
+    remaining = distance - turn_distance
+
+    coasting = entry ** 2 / (2.0 * acceleration) >= remaining
+    peak = np.where(coasting, entry, np.minimum(max_velocity, np.sqrt(acceleration * remaining + entry ** 2 / 2.0)))
+    brake = np.where(coasting, np.maximum(entry ** 2 / np.maximum(2.0 * remaining, 1e-9), acceleration), acceleration)
+    speed_up = (peak - entry) / acceleration
+    speed_up_distance = (peak ** 2 - entry ** 2) / (2.0 * acceleration)
+    stop = peak / brake
+    stop_distance = peak ** 2 / (2.0 * brake)
+    cruise = np.maximum(remaining - speed_up_distance - stop_distance, 0.0) / np.maximum(peak, 1e-9)
+
+    # Piecewise in time: turning, speeding up, cruising, braking, holding the goal
+    u = np.maximum(t - turn, 0.0)
+    c = np.maximum(u - speed_up, 0.0)
+    b = np.clip(c - cruise, 0.0, stop)
+    position = np.where(
+        t < turn, speed * t + 0.5 * acceleration * t ** 2,
+        turn_distance + np.where(
+            u < speed_up, entry * u + 0.5 * acceleration * u ** 2,
+            speed_up_distance + np.where(c < cruise, peak * c, peak * cruise + peak * b - 0.5 * brake * b ** 2),
+        ),
+    )
+    position = np.where(t >= turn + speed_up + cruise + stop, distance, position)
+    speed_at = np.where(
+        t < turn, speed + acceleration * t,
+        np.where(u < speed_up, entry + acceleration * u, np.where(c < cruise, peak, peak - brake * b)),
+    )
+    return position * direction, speed_at * direction
+
+
+def build_motion_profile(frames: np.ndarray, fps: float, steps_per_unit: np.ndarray, tolerance=1.0,
+                         max_interval: float = 0.5, ramp_fraction: float = 0.25,
+                         required=()) -> MotionProfile:
+    """Reduce (frames, joints) rows to keyframe commands for servo-side interpolation.
+
+    Keyframes are chosen so that straight lines between them stay within
+    `tolerance` (action units) of every frame, at least one every `max_interval`
+    seconds. For each segment the servo accelerates for `ramp_fraction` of its
+    duration, cruises, and decelerates into the keyframe; velocity and acceleration
+    are converted to servo steps with `steps_per_unit` and rounded up to what the
+    registers hold. Segments are planned in order from where the servo is expected
+    to be when their command is sent (see `servo_ramp`): one it cannot make in time
+    (velocity or acceleration at the register maximum) leaves it short of its
+    keyframe and still moving, and the next one starts from there. The errors
+    compare those ramps with the dense frames, per joint.
+    """
+    count = len(frames)
+    keyframes = select_keyframes(frames, tolerance, max_gap=max(1, int(max_interval * fps)), required=required)
+    # The last keyframe only ever is a target; every other one sends the command towards the next
+    targets = keyframes[1:] if len(keyframes) > 1 else keyframes
+    sent_at = keyframes[:-1] if len(keyframes) > 1 else keyframes
+
+    command_at = np.full(count, -1, dtype=np.int32)
+    command_at[sent_at] = np.arange(len(sent_at), dtype=np.int32)
+
+    steps = frames.astype(np.float64) * steps_per_unit
+    goals = steps[targets]
+    durations = (np.maximum(targets - sent_at, 1) / fps)[:, None]
+    # Every segment planned from rest on its keyframe, which is where a servo that made the segment before is
+    starts = steps[sent_at]
+    entry = np.zeros_like(starts)
+    velocities, accelerations = _registers(goals - starts, durations, ramp_fraction)
+    moved, speed = servo_ramp(durations, goals - starts, entry, velocities, accelerations * ACCELERATION_UNIT)
+    late = (np.abs(moved - (goals - starts)) > 1e-6).any(axis=1) | (speed != 0).any(axis=1)
+
+    # A segment the servo cannot make in time (velocity or acceleration at the register maximum) leaves it
+    # short of its keyframe and still moving; the segments after it are planned from there until it catches up
+    position = velocity = None
+    for index in range(len(targets)):
+        if position is None:
+            if not late[index]:
+                continue
+            position, velocity = starts[index], entry[index]
+        starts[index], entry[index] = position, velocity
+        velocities[index], accelerations[index] = _registers(goals[index] - position, durations[index], ramp_fraction)
+        moved, velocity = servo_ramp(durations[index], goals[index] - position, velocity, velocities[index],
+                                     accelerations[index] * ACCELERATION_UNIT)
+        position = position + moved
+        if np.allclose(position, goals[index]) and not velocity.any():
+            position = velocity = None
+
+    # Where the servos are on every frame: each frame belongs to the segment whose command came last
+    played = steps.copy()
+    moving = np.arange(sent_at[0] + 1, targets[-1] + 1)
+    segment = np.searchsorted(targets, moving)
+    moved, _ = servo_ramp(((moving - sent_at[segment]) / fps)[:, None], goals[segment] - starts[segment],
+                          entry[segment], velocities[segment], accelerations[segment] * ACCELERATION_UNIT)
+    played[moving] = starts[segment] + moved
+    played[targets[-1] + 1:] = played[targets[-1]]
+
+    error = np.abs(played / steps_per_unit - frames)
+    polyline = np.abs(interpolate_keyframes(keyframes, frames[keyframes], count) - frames)
+    return MotionProfile(
+        keyframes, command_at, np.ascontiguousarray(frames[targets], dtype=np.float32), velocities, accelerations,
+        error.max(axis=0), np.sqrt((error ** 2).mean(axis=0)), polyline.max(axis=0),
+    )
+
+
+def _registers(offset: np.ndarray, duration, ramp_fraction: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Goal_Velocity and Acceleration register values for a ramp over `offset` steps from rest: speed up for
+    `ramp_fraction` of `duration` seconds, cruise, and brake as long, rounded up to what the registers hold"""
+    cruise = np.abs(offset) / (duration * (1.0 - ramp_fraction))
+    velocities = np.clip(np.ceil(cruise), 1, MAX_GOAL_VELOCITY).astype(np.int32)
+    accelerations = np.clip(np.ceil(cruise / (duration * ramp_fraction) / ACCELERATION_UNIT), 1,
+                            MAX_ACCELERATION).astype(np.int32)
+    return velocities, accelerations
@@ -1,22 +1,29 @@
 import os
-import csv
-import time
-from typing import Any, List
+from typing import Any, Dict, List, Optional, Union
 from ..base import ServiceBase
+from ..clock import FrameClock
 from lelamp.follower import LeLampFollowerConfig, LeLampFollower
+from .recording_bank import RecordingBank
+from .recording_catalog import RecordingCatalog
+from .resample import resample
 
 
 class MotorsService(ServiceBase):
-    def __init__(self, port: str, lamp_id: str, fps: int = 30):
+    def __init__(self, port: str, lamp_id: str, fps: int = 30,
+                 keyframe_tolerance: Optional[float] = None, fast_connect: bool = False,
+                 recordings_dir: Optional[str] = None):
         super().__init__("motors")
         self.port = port
         self.lamp_id = lamp_id
         self.fps = fps
-        self.robot_config = LeLampFollowerConfig(port=port, id=lamp_id)
+        self.robot_config = LeLampFollowerConfig(port=port, id=lamp_id, fast_connect=fast_connect)
         self.robot: LeLampFollower = None
-        self.recordings_dir = os.path.join(os.path.dirname(__file__), "..", "..", "recordings")
+        self.recordings_dir = recordings_dir or os.path.join(os.path.dirname(__file__), "..", "..", "recordings")
+        self.bank = RecordingBank(self.recordings_dir, lamp_id, keyframe_tolerance)
+        self.catalog = RecordingCatalog(self.recordings_dir, lamp_id)
     
     def start(self):
+        self.bank.load()
         super().start()
         self.robot = LeLampFollower(self.robot_config)
         self.robot.connect(calibrate=False)
@@ -34,55 +41,54 @@ class MotorsService(ServiceBase):
         else:
             self.logger.warning(f"Unknown event type: {event_type}")
     
-    def _handle_play(self, recording_name: str):
-        """Play a recording by name"""
+    def _handle_play(self, payload: Union[str, Dict[str, Any]]):
+        """Play a recording by name, or {"name": ..., "speed": ...} to change its tempo"""
         if not self.robot:
             self.logger.error("Robot not connected")
             return
         
-        csv_filename = f"{recording_name}_{self.lamp_id}.csv"
-        csv_path = os.path.join(self.recordings_dir, csv_filename)
-        
-        if not os.path.exists(csv_path):
-            self.logger.error(f"Recording not found: {csv_path}")
-            return
+        if isinstance(payload, dict):
+            recording_name = payload["name"]
+            speed = float(payload.get("speed", 1.0))
+        else:
+            recording_name = payload
+            speed = 1.0
         
         try:
-            with open(csv_path, 'r') as csvfile:
-                csv_reader = csv.DictReader(csvfile)
-                actions = list(csv_reader)
+            # Pick up recordings added or changed since the bank was mapped
+            if recording_name not in self.bank:
+                self.bank.refresh()
+            
+            actions = self.bank.get(recording_name)
+            if actions is None:
+                self.logger.error(f"Recording not found: {recording_name}_{self.lamp_id}")
+                return
             
-            self.logger.info(f"Playing {len(actions)} actions from {recording_name}")
+            # Re-time to the loop rate so playback matches the captured tempo
+            actions = resample(self.bank.timestamps(recording_name), actions, self.fps, speed)
+            self.logger.info(f"Playing {len(actions)} actions from {recording_name} at {speed}x")
             
-            for row in actions:
-                t0 = time.perf_counter()
+            joints = self.bank.joints
+            clock = FrameClock(self.fps)
+            clock.start()
+            for frame in actions:
+                # A CRITICAL event (or stop) cuts the recording short
+                if self.preempt_requested:
+                    self.logger.info(f"Preempted playing recording: {recording_name}")
+                    return
                 
-                # Extract action data (exclude timestamp column)
-                action = {key: float(value) for key, value in row.items() if key != 'timestamp'}
+                action = dict(zip(joints, frame.tolist()))
                 self.robot.send_action(action)
                 
-                # Use time.sleep instead of busy_wait to avoid blocking other threads
-                sleep_time = 1.0 / self.fps - (time.perf_counter() - t0)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
+                # Sleep-then-spin to the next deadline without pinning a core
+                clock.tick()
             
-            self.logger.info(f"Finished playing recording: {recording_name}")
+            self.logger.info(f"Finished playing recording: {recording_name} ({clock.overruns} overruns)")
             
         except Exception as e:
             self.logger.error(f"Error playing recording {recording_name}: {e}")
     
     def get_available_recordings(self) -> List[str]:
         """Get list of recording names available for this lamp ID"""
-        if not os.path.exists(self.recordings_dir):
-            return []
-        
-        recordings = []
-        suffix = f"_{self.lamp_id}.csv"
-        
-        for filename in os.listdir(self.recordings_dir):
-            if filename.endswith(suffix):
-                # Remove the lamp_id suffix to get the recording name
-                recording_name = filename[:-len(suffix)]
-                recordings.append(recording_name)
-        
-        return sorted(recordings)
\ No newline at end of file
+        # The catalog only rescans when the recordings directory changed
+        return self.catalog.names()
\ No newline at end of file
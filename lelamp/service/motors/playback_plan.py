@@ -0,0 +1,94 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .motion_profile import MotionProfile
+
+
+class PlaybackPlan:
+    """A whole motion compiled into one contiguous (frames, joints) float32 array.
+
+    Rows are in the robot's motor order and can be handed to the bus as-is, so
+    the per-frame work during playback is just advancing `index`. When the end is
+    reached the plan either wraps to `loop_start` or is finished. A `validated` plan
+    was checked against the motion limits when it was compiled, so its rows skip the
+    per-frame safety clamp. A plan with a `profile` is played by sending its sparse
+    servo commands instead of every row. `still[i]` marks rows identical to the row
+    before, which the servos are already holding.
+    """
+
+    __slots__ = ("recording", "frames", "length", "loop_start", "validated", "profile", "still")
+
+    def __init__(self, recording: str, frames: np.ndarray, loop_start: Optional[int] = None,
+                 validated: bool = False):
+        self.recording = recording
+        self.frames = frames
+        self.length = len(frames)
+        self.loop_start = loop_start
+        self.validated = validated
+        self.profile: Optional[MotionProfile] = None
+        self.still = np.zeros(self.length, dtype=bool)
+        if self.length > 1:
+            np.all(frames[1:] == frames[:-1], axis=1, out=self.still[1:])
+
+    @property
+    def loops(self) -> bool:
+        return self.loop_start is not None
+
+
+def still_ends(actions: np.ndarray, tolerance: float) -> Tuple[int, int]:
+    """First and last frame worth playing: the frames before the first one that moves more
+    than `tolerance` away from the opening pose are dropped, and likewise at the end.
+    A recording that never moves is kept whole."""
+    if len(actions) < 2:
+        return 0, len(actions) - 1
+    moved = np.flatnonzero((np.abs(actions - actions[0]) > tolerance).any(axis=1))
+    if len(moved) == 0:
+        return 0, len(actions) - 1
+    settled = np.flatnonzero((np.abs(actions - actions[-1]) > tolerance).any(axis=1))
+    # Keep the last still frame on each side so the motion starts and ends where it did
+    return max(int(moved[0]) - 1, 0), min(int(settled[-1]) + 1, len(actions) - 1)
+
+
+def _ramp_into(out: np.ndarray, start: np.ndarray, target: np.ndarray):
+    """Fill `out` with a linear ramp from `start` towards `target` (target itself excluded)"""
+    count = len(out)
+    weights = np.arange(count, dtype=np.float32)[:, None] / np.float32(count)
+    np.multiply(target - start, weights, out=out)
+    out += start
+
+
+def compile_plan(
+    recording: str,
+    actions: np.ndarray,
+    start_pose: Optional[np.ndarray] = None,
+    transition_frames: int = 0,
+    return_pose: Optional[np.ndarray] = None,
+    return_frames: int = 0,
+    loop: bool = False,
+    validated: bool = False,
+) -> PlaybackPlan:
+    """Compile transition + recording + blend-out into one preallocated plan.
+
+    Args:
+        recording: Name of the recording, kept for bookkeeping.
+        actions: (frames, joints) recording already in motor order.
+        start_pose: Pose the lamp is currently at. No lead-in transition when None.
+        transition_frames: Length of the lead-in from `start_pose` to the first frame.
+        return_pose: Pose to blend to after the last frame (first idle frame).
+        return_frames: Length of the blend-out to `return_pose`.
+        loop: Wrap back to the first recording frame instead of finishing.
+        validated: The recording and both ramps were checked against the motion limits.
+    """
+    lead_in = transition_frames if start_pose is not None else 0
+    blend_out = return_frames if return_pose is not None and not loop else 0
+    length = len(actions)
+
+    frames = np.empty((lead_in + length + blend_out, actions.shape[1]), dtype=np.float32)
+    if lead_in:
+        _ramp_into(frames[:lead_in], start_pose, actions[0])
+    frames[lead_in:lead_in + length] = actions
+    if blend_out:
+        _ramp_into(frames[lead_in + length:], actions[-1], return_pose)
+
+    return PlaybackPlan(recording, frames, loop_start=lead_in if loop else None, validated=validated)
@@ -0,0 +1,140 @@
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..clock import FrameClock
+
+logger = logging.getLogger(__name__)
+
+
+class RingRecorder:
+    """Samples joint positions on a dedicated thread into a preallocated ring buffer,
+    while a writer thread drains it to disk in batches.
+
+    The sampler only calls `read()`, stamps the sample with `time.perf_counter()` and
+    stores it, so file and terminal I/O never delay a sample. With `rate_hz=None` it
+    samples back to back at whatever rate the bus allows; otherwise it runs on a
+    FrameClock and samples that miss their slot are counted as late. If the writer
+    falls a whole buffer behind, new samples are dropped (and counted) rather than
+    overwriting ones it has not written yet.
+
+    `writer` is anything with `append(timestamps, positions)` and `close()`, e.g. the
+    RecFileWriter and CsvFileWriter from recording_format. With `read=None` there is
+    no sampler thread and a single producer thread feeds samples with `push()`.
+    """
+
+    def __init__(self, read: Optional[Callable[[], Sequence[float]]], joints: List[str], writer: Any,
+                 rate_hz: Optional[float] = None, capacity: int = 1 << 16, flush_interval: float = 0.25):
+        self.read = read
+        self.joints = joints
+        self.writer = writer
+        self.rate_hz = rate_hz
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._positions = np.zeros((capacity, len(joints)), dtype=np.float32)
+        # Total samples stored / written; only the sampler advances _head and only the writer advances _tail
+        self._head = 0
+        self._tail = 0
+
+        self._running = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._writer: Optional[threading.Thread] = None
+        self.clock: Optional[FrameClock] = FrameClock(rate_hz) if rate_hz else None
+        self.started_at: Optional[float] = None
+
+        self.dropped = 0
+        self.read_errors = 0
+        self.max_fill = 0
+        self.batches = 0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._running.set()
+        self._writer = threading.Thread(target=self._write_loop, name="recorder-writer", daemon=True)
+        self._writer.start()
+        if self.read is not None:
+            self._sampler = threading.Thread(target=self._sample_loop, name="recorder-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        """Stop sampling, write out everything still buffered and close the writer"""
+        self._running.clear()
+        if self._sampler:
+            self._sampler.join()
+        if self._writer:
+            self._writer.join()
+        self._drain()
+        self.writer.close()
+
+    def _sample_loop(self):
+        if self.clock:
+            self.clock.start()
+        while self._running.is_set():
+            try:
+                values = self.read()
+            except Exception as e:
+                # A garbled packet costs one sample, not the recording
+                self.read_errors += 1
+                logger.debug(f"Recorder read failed: {e}")
+                values = None
+            if values is not None:
+                self.push(values)
+
+            if self.clock:
+                self.clock.tick()
+
+    def push(self, values: Sequence[float], timestamp: Optional[float] = None):
+        """Store one sample, stamped now unless a perf_counter `timestamp` is given"""
+        fill = self._head - self._tail
+        if fill >= self.capacity:
+            self.dropped += 1
+            return
+        slot = self._head % self.capacity
+        self._timestamps[slot] = time.perf_counter() if timestamp is None else timestamp
+        self._positions[slot] = values
+        self._head += 1
+        self.max_fill = max(self.max_fill, fill + 1)
+
+    def _write_loop(self):
+        while self._running.is_set():
+            time.sleep(self.flush_interval)
+            self._drain()
+
+    def _drain(self):
+        head = self._head
+        while self._tail < head:
+            # Up to the end of the buffer in one batch, the wrapped part in the next
+            start = self._tail % self.capacity
+            count = min(head - self._tail, self.capacity - start)
+            timestamps = self._timestamps[start:start + count] - self.started_at
+            self.writer.append(timestamps, self._positions[start:start + count])
+            self._tail += count
+            self.batches += 1
+
+    @property
+    def samples(self) -> int:
+        return self._head
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        stats = {
+            "samples": self._head,
+            "written": self._tail,
+            "buffered": self._head - self._tail,
+            "max_fill": self.max_fill,
+            "capacity": self.capacity,
+            "dropped": self.dropped,
+            "read_errors": self.read_errors,
+            "batches": self.batches,
+            "rate_hz": self._head / elapsed if elapsed > 0 else 0.0,
+        }
+        if self.clock:
+            stats["late"] = self.clock.overruns
+            stats["missed_slots"] = self.clock.skipped_frames
+            stats["max_lateness_ms"] = self.clock.max_lateness * 1e3
+        return stats
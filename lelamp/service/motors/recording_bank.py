@@ -0,0 +1,257 @@
+import os
+import json
+import mmap
+import struct
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .keyframes import compress_recording
+from .recording_format import find_recordings, read_recording, read_recording_csv, recording_suffixes
+
+logger = logging.getLogger(__name__)
+
+BANK_MAGIC = b"LLBANK01"
+BANK_ALIGN = 64
+_HEADER_LEN = struct.Struct("<I")
+
+
+def _align(offset: int) -> int:
+    return (offset + BANK_ALIGN - 1) // BANK_ALIGN * BANK_ALIGN
+
+
+class RecordingBank:
+    """Compiled, memory-mapped store of every recording for one lamp id.
+
+    The bank is a single file next to the recordings (CSV or compact .rec) laid out as:
+
+        magic | u32 header length | JSON header | 64-byte aligned float32 arrays
+
+    The JSON header indexes each recording's timestamps and positions by byte
+    offset, so loading is one `mmap` and every recording is a zero-copy, read-only
+    NumPy view of shape (frames, joints). The header also records the mtime and
+    size of every source file, and the bank is rebuilt whenever one of them no
+    longer matches (a recording was re-recorded, added or removed). A rebuild only
+    parses the files that changed; the others are copied from the current bank.
+
+    A reload swaps every recording in with a single assignment, so a reader on
+    another thread sees either the old or the new bank, never a mix.
+
+    With a `keyframe_tolerance` each recording is stored as the keyframes that
+    rebuild it within that tolerance (see `compress_recording`); its timestamps
+    then step unevenly and `resample` interpolates the frames in between. Banks
+    of different tolerances live in different files, so they never invalidate
+    each other.
+    """
+
+    def __init__(self, recordings_dir: str, lamp_id: str, keyframe_tolerance: Optional[float] = None):
+        self.recordings_dir = recordings_dir
+        self.lamp_id = lamp_id
+        self.keyframe_tolerance = keyframe_tolerance
+        suffix = "" if keyframe_tolerance is None else f".k{keyframe_tolerance:g}"
+        self.bank_path = os.path.join(recordings_dir, f"{lamp_id}{suffix}.bank")
+        self.joints: List[str] = []
+
+        self._mmap: Optional[mmap.mmap] = None
+        # name -> (timestamps, positions), replaced as a whole on every map
+        self._recordings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # Serializes rebuilds between the control loop and the reload watcher
+        self._build_lock = threading.RLock()
+
+    @property
+    def suffixes(self) -> Tuple[str, ...]:
+        return recording_suffixes(self.lamp_id)
+
+    def _source_files(self) -> Dict[str, str]:
+        """Map recording name -> source path (compact .rec or CSV) for this lamp id"""
+        return find_recordings(self.recordings_dir, self.lamp_id)
+
+    @staticmethod
+    def _fingerprint(paths: Dict[str, str]) -> Dict[str, List[int]]:
+        fingerprint = {}
+        for name, path in paths.items():
+            stat = os.stat(path)
+            fingerprint[name] = [stat.st_mtime_ns, stat.st_size]
+        return fingerprint
+
+    def is_stale(self) -> bool:
+        """True when the bank is missing or any source recording was added, removed or modified since it was built"""
+        if not os.path.exists(self.bank_path):
+            return True
+
+        try:
+            header, _ = self._read_header(self.bank_path)
+        except (OSError, ValueError):
+            return True
+        if header.get("keyframe_tolerance") != self.keyframe_tolerance:
+            return True
+        return header["sources"] != self._fingerprint(self._source_files())
+
+    def load(self) -> "RecordingBank":
+        """Rebuild the bank if needed and map it into memory"""
+        with self._build_lock:
+            if self.is_stale():
+                self.build()
+            self._map()
+        return self
+
+    def refresh(self) -> bool:
+        """Reload if any source changed since the last load. Returns True if reloaded."""
+        with self._build_lock:
+            if self._mmap is not None and not self.is_stale():
+                return False
+            self.load()
+        return True
+
+    def build(self):
+        """Compile every recording (compact .rec or CSV) for this lamp id into the bank file"""
+        sources = self._source_files()
+        # Fingerprint before parsing so a file rewritten mid-build is picked up next time
+        fingerprint = self._fingerprint(sources)
+        joints: Optional[List[str]] = None
+        compiled: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        reusable_joints, reusable = self._reusable(fingerprint)
+        if reusable:
+            joints = reusable_joints
+
+        parsed = 0
+        for name in sorted(sources):
+            if name in reusable:
+                compiled[name] = reusable[name]
+                continue
+            try:
+                joints, timestamps, positions = read_recording(sources[name], joints)
+            except Exception as e:
+                logger.warning(f"Skipping recording {name}: {e}")
+                continue
+            if self.keyframe_tolerance is not None:
+                timestamps, positions = compress_recording(timestamps, positions, self.keyframe_tolerance)
+            compiled[name] = (timestamps, positions)
+            parsed += 1
+
+        index = {}
+        offset = 0
+        for name, (timestamps, positions) in compiled.items():
+            index[name] = {
+                "frames": int(positions.shape[0]),
+                "timestamps_offset": offset,
+                "positions_offset": _align(offset + timestamps.nbytes),
+            }
+            offset = _align(index[name]["positions_offset"] + positions.nbytes)
+
+        header = {
+            "lamp_id": self.lamp_id,
+            "joints": joints or [],
+            "sources": fingerprint,
+            "keyframe_tolerance": self.keyframe_tolerance,
+            "recordings": index,
+        }
+        header_bytes = json.dumps(header).encode("utf-8")
+        data_start = _align(len(BANK_MAGIC) + _HEADER_LEN.size + len(header_bytes))
+
+        tmp_path = f"{self.bank_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as bank_file:
+            bank_file.write(BANK_MAGIC)
+            bank_file.write(_HEADER_LEN.pack(len(header_bytes)))
+            bank_file.write(header_bytes)
+            for name, (timestamps, positions) in compiled.items():
+                bank_file.seek(data_start + index[name]["timestamps_offset"])
+                bank_file.write(timestamps.astype('<f4').tobytes())
+                bank_file.seek(data_start + index[name]["positions_offset"])
+                bank_file.write(positions.astype('<f4').tobytes())
+            bank_file.truncate(data_start + offset)
+
+        # Atomic swap: processes that still map the old bank keep a valid view
+        os.replace(tmp_path, self.bank_path)
+        logger.info(f"Built recording bank {self.bank_path} with {len(compiled)} recordings ({parsed} parsed)")
+
+    def _reusable(self, fingerprint: Dict[str, List[int]]) -> Tuple[List[str], Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """Joints and recordings of the bank on disk whose source file is unchanged.
+
+        The arrays come from a fresh mapping of that file rather than the one this
+        process already holds, so they always match the fingerprints in its header,
+        even when another process rebuilt the bank in the meantime.
+        """
+        if not os.path.exists(self.bank_path):
+            return [], {}
+        try:
+            header, _, recordings = self._open()
+        except (OSError, ValueError):
+            return [], {}
+        if header.get("keyframe_tolerance") != self.keyframe_tolerance:
+            return [], {}
+        return header["joints"], {
+            name: recording for name, recording in recordings.items()
+            if header["sources"].get(name) == fingerprint.get(name)
+        }
+
+    @staticmethod
+    def _read_header(bank_path: str) -> Tuple[dict, int]:
+        with open(bank_path, 'rb') as bank_file:
+            if bank_file.read(len(BANK_MAGIC)) != BANK_MAGIC:
+                raise ValueError(f"{bank_path} is not a recording bank")
+            (header_len,) = _HEADER_LEN.unpack(bank_file.read(_HEADER_LEN.size))
+            header = json.loads(bank_file.read(header_len).decode("utf-8"))
+        return header, _align(len(BANK_MAGIC) + _HEADER_LEN.size + header_len)
+
+    def _open(self) -> Tuple[dict, mmap.mmap, Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+        """Header, mapping and recording views of the bank file, all from the same file"""
+        with open(self.bank_path, 'rb') as bank_file:
+            # Views keep the previous mapping alive until they are released
+            mapped = mmap.mmap(bank_file.fileno(), 0, access=mmap.ACCESS_READ)
+        # The header is parsed from the mapping itself, so a concurrent rebuild cannot mix files
+        if mapped[:len(BANK_MAGIC)] != BANK_MAGIC:
+            raise ValueError(f"{self.bank_path} is not a recording bank")
+        (header_len,) = _HEADER_LEN.unpack_from(mapped, len(BANK_MAGIC))
+        header_start = len(BANK_MAGIC) + _HEADER_LEN.size
+        header = json.loads(mapped[header_start:header_start + header_len].decode("utf-8"))
+        data_start = _align(header_start + header_len)
+
+        joints = header["joints"]
+        recordings = {}
+        for name, entry in header["recordings"].items():
+            frames = entry["frames"]
+            timestamps = np.frombuffer(
+                mapped, dtype='<f4', count=frames,
+                offset=data_start + entry["timestamps_offset"],
+            )
+            positions = np.frombuffer(
+                mapped, dtype='<f4', count=frames * len(joints),
+                offset=data_start + entry["positions_offset"],
+            ).reshape(frames, len(joints))
+            recordings[name] = (timestamps, positions)
+        return header, mapped, recordings
+
+    def _map(self):
+        header, mapped, recordings = self._open()
+        joints = header["joints"]
+        self._mmap = mapped
+        self.joints = joints
+        self._recordings = recordings
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the mapped bank file"""
+        return len(self._mmap) if self._mmap is not None else 0
+
+    def names(self) -> List[str]:
+        return sorted(self._recordings)
+
+    def __contains__(self, recording_name: str) -> bool:
+        return recording_name in self._recordings
+
+    def recording(self, recording_name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(timestamps, positions) views of a recording from the same bank, or None"""
+        return self._recordings.get(recording_name)
+
+    def get(self, recording_name: str) -> Optional[np.ndarray]:
+        """Read-only (frames, joints) float32 view of a recording, or None"""
+        recording = self._recordings.get(recording_name)
+        return recording[1] if recording is not None else None
+
+    def timestamps(self, recording_name: str) -> Optional[np.ndarray]:
+        """Read-only (frames,) float32 view of seconds since the first sample, or None"""
+        recording = self._recordings.get(recording_name)
+        return recording[0] if recording is not None else None
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# (recording, fps, speed)
+CacheKey = Tuple[str, int, float]
+
+
+class RecordingCache:
+    """LRU cache of re-timed recordings bounded by the bytes their arrays hold.
+
+    Keys are (recording, fps, speed). Every variant of a pinned recording stays
+    resident regardless of age, so the idle loop never has to be rebuilt;
+    everything else is evicted least recently used first once the budget is
+    exceeded. Pinned entries still count towards the budget, so pinning more
+    than fits simply leaves no room for the rest. An entry can carry a `report`
+    about its recording, which is evicted along with it.
+
+    Safe to use from the control loop and the reload watcher at the same time.
+    """
+
+    def __init__(self, max_bytes: int, pinned: Iterable[str] = ()):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, np.ndarray]" = OrderedDict()
+        self._reports: Dict[CacheKey, Any] = {}
+        self._pinned: Set[str] = set(pinned)
+        self._lock = threading.Lock()
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def get(self, key: CacheKey) -> Optional[np.ndarray]:
+        with self._lock:
+            actions = self._entries.get(key)
+            if actions is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return actions
+
+    def report(self, key: CacheKey) -> Any:
+        """Report stored with a cached entry, or None"""
+        with self._lock:
+            return self._reports.get(key)
+
+    def reports(self) -> List[Any]:
+        with self._lock:
+            return list(self._reports.values())
+
+    def put(self, key: CacheKey, actions: np.ndarray, report: Any = None):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self._entries[key] = actions
+            self._reports.pop(key, None)
+            if report is not None:
+                self._reports[key] = report
+            self.nbytes += actions.nbytes
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used unpinned entries until the cache fits its budget"""
+        if self.nbytes <= self.max_bytes:
+            return
+        for key in list(self._entries):
+            if self.nbytes <= self.max_bytes:
+                break
+            if key[0] in self._pinned:
+                continue
+            actions = self._entries.pop(key)
+            self._reports.pop(key, None)
+            self.nbytes -= actions.nbytes
+            self.evictions += 1
+            self.evicted_bytes += actions.nbytes
+
+    def pin(self, recording_name: str):
+        with self._lock:
+            self._pinned.add(recording_name)
+
+    def unpin(self, recording_name: str):
+        with self._lock:
+            self._pinned.discard(recording_name)
+            self._evict()
+
+    @property
+    def pinned(self) -> List[str]:
+        with self._lock:
+            return sorted(self._pinned)
+
+    def discard(self, names: Iterable[str]):
+        """Forget every variant of the given recordings"""
+        names = set(names)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in names]:
+                self.nbytes -= self._entries.pop(key).nbytes
+                self._reports.pop(key, None)
+
+    def keys(self) -> List[CacheKey]:
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._reports.clear()
+            self.nbytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "pinned": len(self._pinned),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+            }
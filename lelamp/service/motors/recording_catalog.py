@@ -0,0 +1,189 @@
+import os
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .recording_format import read_recording, recording_suffixes, split_recording_filename
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 1
+
+
+def describe_recording(timestamps: np.ndarray, positions: np.ndarray) -> Dict[str, Any]:
+    """Summary of one recording: length, duration and per-joint range and peak speed (units/s)"""
+    frames = int(positions.shape[0])
+    if frames == 0:
+        return {"frames": 0, "duration": 0.0, "min": [], "max": [], "peak_velocity": []}
+
+    if frames > 1:
+        dt = np.diff(timestamps.astype(np.float64))
+        moving = dt > 0
+        velocity = np.abs(np.diff(positions.astype(np.float64), axis=0)[moving] / dt[moving, None])
+        peak_velocity = velocity.max(axis=0) if velocity.size else np.zeros(positions.shape[1])
+    else:
+        peak_velocity = np.zeros(positions.shape[1])
+
+    return {
+        "frames": frames,
+        "duration": float(timestamps[-1]),
+        "min": positions.min(axis=0).round(4).tolist(),
+        "max": positions.max(axis=0).round(4).tolist(),
+        "peak_velocity": np.round(peak_velocity, 4).tolist(),
+    }
+
+
+class RecordingCatalog:
+    """Persistent metadata index of every recording for one lamp id.
+
+    Stored as `{lamp_id}.catalog.json` next to the CSVs. Each entry is keyed by the
+    file's mtime and size, so `refresh()` only re-parses recordings that were added
+    or changed. Adding, removing or renaming a recording touches the directory mtime,
+    so `names()` skips the scan while that is unchanged. A recording rewritten in
+    place leaves the directory alone: `get()` checks the file's own mtime and size,
+    and `entries()` those of every file.
+
+    The recording watcher refreshes it from its own thread while the agent lists
+    it, so every read and refresh holds `_lock`.
+    """
+
+    def __init__(self, recordings_dir: str, lamp_id: str):
+        self.recordings_dir = recordings_dir
+        self.lamp_id = lamp_id
+        self.catalog_path = os.path.join(recordings_dir, f"{lamp_id}.catalog.json")
+        self.joints: List[str] = []
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @property
+    def suffixes(self) -> Tuple[str, ...]:
+        return recording_suffixes(self.lamp_id)
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.catalog_path, 'r') as catalog_file:
+                data = json.load(catalog_file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != CATALOG_VERSION or data.get("lamp_id") != self.lamp_id:
+            return
+        self.joints = data.get("joints", [])
+        self._entries = data.get("recordings", {})
+
+    def _save(self):
+        data = {
+            "version": CATALOG_VERSION,
+            "lamp_id": self.lamp_id,
+            "joints": self.joints,
+            "recordings": self._entries,
+        }
+        tmp_path = f"{self.catalog_path}.tmp{os.getpid()}"
+        try:
+            with open(tmp_path, 'w') as catalog_file:
+                json.dump(data, catalog_file, indent=1)
+            os.replace(tmp_path, self.catalog_path)
+        except OSError as e:
+            # A read-only recordings dir still gets an in-memory catalog
+            logger.warning(f"Could not save recording catalog {self.catalog_path}: {e}")
+
+    def refresh(self) -> List[str]:
+        """Re-index recordings whose mtime or size changed and forget removed ones.
+
+        Returns the names that were (re)parsed.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> List[str]:
+        if not self._loaded:
+            self._load()
+
+        try:
+            self._dir_mtime_ns = os.stat(self.recordings_dir).st_mtime_ns
+            entries = list(os.scandir(self.recordings_dir))
+        except OSError:
+            entries = []
+
+        seen = set()
+        changed = []
+        # Compact recordings first: they take precedence over a CSV of the same name, as in the bank
+        for entry in sorted(entries, key=lambda entry: entry.name.endswith(".csv")):
+            name = split_recording_filename(entry.name, self.suffixes)
+            if name is None or not entry.is_file():
+                continue
+            if name in seen:
+                continue
+            seen.add(name)
+            stat = entry.stat()
+            cached = self._entries.get(name)
+            if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                continue
+
+            try:
+                joints, timestamps, positions = read_recording(entry.path)
+            except Exception as e:
+                logger.warning(f"Skipping recording {name}: {e}")
+                self._entries.pop(name, None)
+                continue
+
+            self.joints = joints
+            self._entries[name] = {
+                "file": entry.name,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                **describe_recording(timestamps, positions),
+            }
+            changed.append(name)
+
+        removed = [name for name in self._entries if name not in seen]
+        for name in removed:
+            del self._entries[name]
+
+        if changed or removed:
+            self._save()
+        return sorted(changed)
+
+    def _refresh_if_dir_changed(self):
+        """Adding, removing or renaming a recording touches the directory mtime"""
+        try:
+            dir_mtime_ns = os.stat(self.recordings_dir).st_mtime_ns
+        except OSError:
+            dir_mtime_ns = None
+        if not self._loaded or dir_mtime_ns != self._dir_mtime_ns:
+            self._refresh()
+
+    def _refresh_if_changed(self, recording_name: str):
+        """A rewritten file keeps the directory mtime, so also compare the recording's own"""
+        self._refresh_if_dir_changed()
+        cached = self._entries.get(recording_name)
+        if cached is None:
+            return
+        try:
+            stat = os.stat(os.path.join(self.recordings_dir, cached["file"]))
+        except OSError:
+            stat = None
+        if stat is None or cached["mtime_ns"] != stat.st_mtime_ns or cached["size"] != stat.st_size:
+            self._refresh()
+
+    def names(self) -> List[str]:
+        with self._lock:
+            self._refresh_if_dir_changed()
+            return sorted(self._entries)
+
+    def get(self, recording_name: str) -> Optional[Dict[str, Any]]:
+        """Metadata of one recording, or None"""
+        with self._lock:
+            self._refresh_if_changed(recording_name)
+            return self._entries.get(recording_name)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Metadata of every recording, re-parsing any whose mtime or size changed"""
+        with self._lock:
+            self._refresh()
+            return dict(self._entries)
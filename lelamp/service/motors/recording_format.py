@@ -0,0 +1,180 @@
+import os
+import csv
+import json
+import logging
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Recording file extensions, in order of preference when a name exists in both
+RECORDING_EXTENSIONS = (".rec", ".csv")
+
+REC_MAGIC = b"LLREC001"
+_HEADER_LEN = struct.Struct("<I")
+
+
+def recording_suffixes(lamp_id: str) -> Tuple[str, ...]:
+    return tuple(f"_{lamp_id}{extension}" for extension in RECORDING_EXTENSIONS)
+
+
+def split_recording_filename(filename: str, suffixes: Sequence[str]) -> Optional[str]:
+    """Recording name of a file ending in one of `suffixes`, or None"""
+    for suffix in suffixes:
+        if filename.endswith(suffix):
+            return filename[:-len(suffix)]
+    return None
+
+
+def find_recordings(recordings_dir: str, lamp_id: str) -> Dict[str, str]:
+    """Map recording name -> file path for this lamp id, preferring the compact format when a name has both"""
+    suffixes = recording_suffixes(lamp_id)
+    sources: Dict[str, Tuple[int, str]] = {}
+    try:
+        filenames = os.listdir(recordings_dir)
+    except OSError:
+        return {}
+    for filename in filenames:
+        for rank, suffix in enumerate(suffixes):
+            if filename.endswith(suffix):
+                name = filename[:-len(suffix)]
+                path = os.path.join(recordings_dir, filename)
+                if name in sources:
+                    kept, ignored = sorted([sources[name], (rank, path)])
+                    logger.info(f"Recording {name} exists as {os.path.basename(kept[1])} and "
+                                f"{os.path.basename(ignored[1])}, using {os.path.basename(kept[1])}")
+                    sources[name] = kept
+                else:
+                    sources[name] = (rank, path)
+                break
+    return {name: path for name, (_, path) in sources.items()}
+
+
+def _select_joints(path: str, file_joints: List[str], joints: Optional[List[str]]) -> List[int]:
+    if joints is None:
+        return list(range(len(file_joints)))
+    if set(joints) != set(file_joints):
+        raise ValueError(f"{path} joints {file_joints} do not match {joints}")
+    return [file_joints.index(joint) for joint in joints]
+
+
+def read_recording_csv(csv_path: str, joints: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Parse a recording CSV into (joints, timestamps, positions).
+
+    Timestamps are returned relative to the first sample. When `joints` is given
+    the position columns are reordered to match it.
+    """
+    with open(csv_path, 'r', newline='') as csvfile:
+        header = next(csv.reader(csvfile))
+        data = np.loadtxt(csvfile, delimiter=',', dtype=np.float64, ndmin=2)
+
+    columns = [name.strip() for name in header]
+    if 'timestamp' not in columns:
+        raise ValueError(f"{csv_path} has no timestamp column")
+
+    file_joints = [name for name in columns if name != 'timestamp']
+    order = _select_joints(csv_path, file_joints, joints)
+    joints = [file_joints[index] for index in order]
+
+    if data.shape[0] == 0:
+        return joints, np.empty(0, dtype=np.float32), np.empty((0, len(joints)), dtype=np.float32)
+
+    timestamps = data[:, columns.index('timestamp')]
+    timestamps = (timestamps - timestamps[0]).astype(np.float32)
+    positions = np.ascontiguousarray(data[:, [columns.index(joint) for joint in joints]], dtype=np.float32)
+    return joints, timestamps, positions
+
+
+def _read_rec_header(rec_file) -> Dict[str, Any]:
+    magic = rec_file.read(len(REC_MAGIC))
+    if magic != REC_MAGIC:
+        raise ValueError(f"{rec_file.name} is not a recording file")
+    (header_len,) = _HEADER_LEN.unpack(rec_file.read(_HEADER_LEN.size))
+    return json.loads(rec_file.read(header_len).decode("utf-8"))
+
+
+def read_recording_rec(rec_path: str, joints: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Load a compact recording into (joints, timestamps, positions), like `read_recording_csv`.
+
+    The file is a JSON header followed by little-endian float32 rows of
+    (timestamp, *positions). A trailing partial row, e.g. from a recorder that
+    was killed mid-write, is ignored.
+    """
+    with open(rec_path, 'rb') as rec_file:
+        header = _read_rec_header(rec_file)
+        file_joints = header["joints"]
+        width = 1 + len(file_joints)
+        data = np.frombuffer(rec_file.read(), dtype='<f4')
+
+    rows = len(data) // width
+    data = data[:rows * width].reshape(rows, width)
+    order = _select_joints(rec_path, file_joints, joints)
+    joints = [file_joints[index] for index in order]
+
+    if rows == 0:
+        return joints, np.empty(0, dtype=np.float32), np.empty((0, len(joints)), dtype=np.float32)
+
+    timestamps = (data[:, 0] - data[0, 0]).astype(np.float32)
+    positions = np.ascontiguousarray(data[:, [1 + index for index in order]], dtype=np.float32)
+    return joints, timestamps, positions
+
+
+def read_recording(path: str, joints: Optional[List[str]] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Read a recording in either format, chosen by extension"""
+    if path.endswith(".rec"):
+        return read_recording_rec(path, joints)
+    return read_recording_csv(path, joints)
+
+
+class RecFileWriter:
+    """Appends batches of samples to a compact recording.
+
+    Samples go to `<path>.part`, which is renamed into place on `close()`, so readers
+    and the recordings watcher only ever see a finished recording.
+    """
+
+    def __init__(self, path: str, joints: List[str], metadata: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.joints = joints
+        self.rows = 0
+        self._part_path = f"{path}.part"
+        header = json.dumps({"version": 1, "joints": joints, **(metadata or {})}).encode("utf-8")
+        self._file = open(self._part_path, 'wb')
+        self._file.write(REC_MAGIC + _HEADER_LEN.pack(len(header)) + header)
+
+    def append(self, timestamps: np.ndarray, positions: np.ndarray):
+        rows = np.empty((len(timestamps), 1 + len(self.joints)), dtype='<f4')
+        rows[:, 0] = timestamps
+        rows[:, 1:] = positions
+        self._file.write(rows.tobytes())
+        self.rows += len(rows)
+
+    def close(self):
+        self._file.close()
+        os.replace(self._part_path, self.path)
+
+
+class CsvFileWriter:
+    """Same interface as RecFileWriter, writing the CSV layout the recordings have always used"""
+
+    def __init__(self, path: str, joints: List[str], metadata: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.joints = joints
+        self.rows = 0
+        self._part_path = f"{path}.part"
+        self._file = open(self._part_path, 'w', newline='')
+        self._file.write(",".join(["timestamp", *joints]) + "\n")
+
+    def append(self, timestamps: np.ndarray, positions: np.ndarray):
+        rows = np.column_stack([np.asarray(timestamps, dtype=np.float64), positions])
+        np.savetxt(self._file, rows, delimiter=",", fmt="%.6f")
+        self.rows += len(rows)
+
+    def close(self):
+        self._file.close()
+        os.replace(self._part_path, self.path)
+
+
+RECORDING_WRITERS = {"rec": RecFileWriter, "csv": CsvFileWriter}
@@ -0,0 +1,163 @@
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import logging
+import threading
+from typing import Callable, Dict, Optional, Sequence, Set, Tuple
+
+from .recording_format import split_recording_filename
+
+logger = logging.getLogger(__name__)
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+# A file is only picked up once it has been closed after writing or moved into place,
+# so a recording still being captured is never parsed half-written
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class RecordingWatcher:
+    """Watches a recordings directory and reports changed recordings from a background thread.
+
+    Uses inotify through libc when available and falls back to polling file mtimes and
+    sizes elsewhere. Bursts of events are debounced, then `on_change` is called on the
+    watcher thread with the set of recording names that were written, added or removed.
+    """
+
+    def __init__(self, directory: str, suffixes: Sequence[str], on_change: Callable[[Set[str]], None],
+                 debounce: float = 0.25, poll_interval: float = 1.0):
+        self.directory = directory
+        self.suffixes = tuple(suffixes)
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.backend: Optional[str] = None
+
+        self._running = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._fd: Optional[int] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+
+    def start(self):
+        if self._running.is_set():
+            return
+        self._fd = self._open_inotify()
+        self.backend = "inotify" if self._fd is not None else "poll"
+        if self._fd is None:
+            self._snapshot = self._scan()
+
+        self._running.set()
+        self._thread = threading.Thread(target=self._loop, name="recording-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"Watching {self.directory} for recording changes ({self.backend})")
+
+    def stop(self, timeout: float = 2.0):
+        self._running.clear()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _open_inotify(self) -> Optional[int]:
+        libc = _load_libc()
+        if libc is None or not hasattr(libc, "inotify_init1"):
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logger.debug(f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(self.directory), WATCH_MASK) < 0:
+            logger.debug(f"inotify_add_watch failed: {os.strerror(ctypes.get_errno())}")
+            os.close(fd)
+            return None
+        return fd
+
+    def _name_of(self, filename: str) -> Optional[str]:
+        return split_recording_filename(filename, self.suffixes)
+
+    def _read_events(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        names = set()
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            filename = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+            name = self._name_of(filename)
+            if name is not None:
+                names.add(name)
+        return names
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        try:
+            for entry in os.scandir(self.directory):
+                name = self._name_of(entry.name)
+                if name is not None:
+                    stat = entry.stat()
+                    snapshot[name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+        return snapshot
+
+    def _poll(self, timeout: float) -> Set[str]:
+        time.sleep(timeout)
+        snapshot = self._scan()
+        changed = {name for name in snapshot.keys() | self._snapshot.keys()
+                   if snapshot.get(name) != self._snapshot.get(name)}
+        self._snapshot = snapshot
+        return changed
+
+    def _wait(self, timeout: float) -> Set[str]:
+        return self._read_events(timeout) if self._fd is not None else self._poll(timeout)
+
+    def _loop(self):
+        while self._running.is_set():
+            changed = self._wait(0.5 if self._fd is not None else self.poll_interval)
+            if not changed:
+                continue
+
+            # Let a burst of writes settle before reporting it once
+            if self._fd is not None:
+                while self._running.is_set():
+                    more = self._wait(self.debounce)
+                    if not more:
+                        break
+                    changed |= more
+
+            try:
+                self.on_change(changed)
+            except Exception as e:
+                logger.error(f"Error reloading recordings {sorted(changed)}: {e}")
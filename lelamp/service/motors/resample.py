@@ -0,0 +1,32 @@
+import numpy as np
+
+
+def resample(timestamps: np.ndarray, positions: np.ndarray, fps: float, speed: float = 1.0) -> np.ndarray:
+    """Re-time a recording onto a uniform `fps` grid using its timestamp column.
+
+    Args:
+        timestamps: (frames,) seconds since the first sample, non-decreasing.
+        positions: (frames, joints) joint positions captured at those times.
+        fps: Rate of the loop that will play the result.
+        speed: Tempo multiplier; 2.0 plays twice as fast, 0.5 half as fast.
+
+    Returns:
+        A new (out_frames, joints) float32 array with one row per loop frame.
+    """
+    if speed <= 0:
+        raise ValueError(f"speed must be positive, got {speed}")
+
+    frames, joints = positions.shape
+    if frames < 2 or timestamps[-1] <= 0:
+        return np.array(positions, dtype=np.float32)
+
+    # Source time of every output frame across the recording
+    step = speed / fps
+    # In float64: a float32 timestamp divided in float32 can land just under a whole frame and drop the last one
+    out_frames = int(np.floor(float(timestamps[-1]) / step + 1e-6)) + 1
+    sample_times = np.arange(out_frames, dtype=np.float64) * step
+
+    resampled = np.empty((out_frames, joints), dtype=np.float32)
+    for joint in range(joints):
+        resampled[:, joint] = np.interp(sample_times, timestamps, positions[:, joint])
+    return resampled
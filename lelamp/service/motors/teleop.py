@@ -0,0 +1,237 @@
+import math
+import time
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..clock import FrameClock
+
+logger = logging.getLogger(__name__)
+
+
+class LatestSlot:
+    """Single-slot buffer that always holds the newest value.
+
+    `put()` never blocks and overwrites a value that was not taken yet, so a slow
+    consumer works on the freshest sample instead of a queue of stale ones.
+    `take()` blocks until a value newer than the last one taken arrives.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._value: Any = None
+        self._stamp = 0.0
+        self._seq = 0
+        self._taken = 0
+        self.overwritten = 0
+
+    def put(self, value: Any, stamp: float):
+        with self._cond:
+            if self._seq > self._taken:
+                self.overwritten += 1
+            self._value = value
+            self._stamp = stamp
+            self._seq += 1
+            self._cond.notify()
+
+    def take(self, timeout: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """(value, stamp) of the newest value, or None if nothing new arrived within `timeout`"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > self._taken, timeout):
+                return None
+            self._taken = self._seq
+            return self._value, self._stamp
+
+    def wake(self):
+        """Release a consumer blocked in `take()`, e.g. on shutdown"""
+        with self._cond:
+            self._cond.notify_all()
+
+
+class OneEuroFilter:
+    """One Euro filter (Casiez et al.) over a row of joint positions.
+
+    A low-pass filter whose cutoff rises with the speed of the signal: slow moves
+    are smoothed heavily, which removes hand tremor and sensor jitter, while fast
+    moves pass with little lag. `min_cutoff` (Hz) sets the smoothing at rest and
+    `beta` how quickly it opens up with speed.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.0, d_cutoff: float = 1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._x: Optional[np.ndarray] = None
+        self._dx: Optional[np.ndarray] = None
+        self._t = 0.0
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def reset(self):
+        self._x = None
+
+    def __call__(self, x: np.ndarray, t: float) -> np.ndarray:
+        x = np.asarray(x, dtype=np.float64)
+        if self._x is None:
+            self._x = x.copy()
+            self._dx = np.zeros_like(x)
+            self._t = t
+            return x
+
+        dt = t - self._t
+        if dt <= 0:
+            return self._x.copy()
+        self._t = t
+
+        dx = (x - self._x) / dt
+        self._dx += self._alpha(self.d_cutoff, dt) * (dx - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._dx)
+        self._x += self._alpha(cutoff, dt) * (x - self._x)
+        # The state is updated in place, so callers get their own row
+        return self._x.copy()
+
+
+class TeleopPipeline:
+    """Mirrors a leader arm onto a follower with the read and the write on separate threads.
+
+    The leader thread reads Present_Position and drops each sample into a LatestSlot;
+    the follower thread takes the newest sample, filters it and writes it. The two
+    buses work in parallel, so a sample reaches the follower one write transaction
+    after it was read instead of waiting behind the next read as in a serial
+    read-then-write loop, and a slow write only ever skips stale samples.
+
+    `read()` returns the leader positions in motor order and `write(positions)`
+    commands the follower with them. With `rate_hz=None` the leader is read back to
+    back. `recorder` is a RingRecorder without a sampler of its own; it receives every
+    row the follower is commanded with, stamped with the time it was read.
+    """
+
+    def __init__(self, read: Callable[[], Sequence[float]], write: Callable[[np.ndarray], None],
+                 rate_hz: Optional[float] = None, filter: Optional[OneEuroFilter] = None,
+                 recorder: Any = None, window: int = 1024):
+        self.read = read
+        self.write = write
+        self.rate_hz = rate_hz
+        self.filter = filter
+        self.recorder = recorder
+
+        self.slot = LatestSlot()
+        self.clock: Optional[FrameClock] = FrameClock(rate_hz) if rate_hz else None
+        self._running = threading.Event()
+        self._leader: Optional[threading.Thread] = None
+        self._follower: Optional[threading.Thread] = None
+        self.started_at: Optional[float] = None
+
+        # Rolling per-hop timings, seconds
+        self._read_times: deque = deque(maxlen=window)
+        self._slot_times: deque = deque(maxlen=window)
+        self._write_times: deque = deque(maxlen=window)
+        self._total_times: deque = deque(maxlen=window)
+
+        self.reads = 0
+        self.writes = 0
+        self.read_errors = 0
+        self.write_errors = 0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._running.set()
+        if self.recorder is not None:
+            self.recorder.start()
+        self._follower = threading.Thread(target=self._follower_loop, name="teleop-follower", daemon=True)
+        self._leader = threading.Thread(target=self._leader_loop, name="teleop-leader", daemon=True)
+        self._follower.start()
+        self._leader.start()
+
+    def stop(self):
+        self._running.clear()
+        self.slot.wake()
+        if self._leader:
+            self._leader.join()
+        if self._follower:
+            self._follower.join()
+        if self.recorder is not None:
+            self.recorder.stop()
+
+    def _leader_loop(self):
+        if self.clock:
+            self.clock.start()
+        while self._running.is_set():
+            started = time.perf_counter()
+            try:
+                positions = np.asarray(self.read(), dtype=np.float64)
+            except Exception as e:
+                # A garbled packet costs one sample; the follower keeps the last one
+                self.read_errors += 1
+                logger.debug(f"Leader read failed: {e}")
+            else:
+                finished = time.perf_counter()
+                self._read_times.append(finished - started)
+                self.reads += 1
+                self.slot.put((positions, started), finished)
+
+            if self.clock:
+                self.clock.tick()
+
+    def _follower_loop(self):
+        while self._running.is_set():
+            sample = self.slot.take(timeout=0.1)
+            if sample is None:
+                continue
+            (positions, read_started), read_at = sample
+            taken = time.perf_counter()
+            if self.filter is not None:
+                positions = self.filter(positions, read_at)
+            try:
+                self.write(positions)
+            except Exception as e:
+                self.write_errors += 1
+                logger.debug(f"Follower write failed: {e}")
+                continue
+            written = time.perf_counter()
+
+            self._slot_times.append(taken - read_at)
+            self._write_times.append(written - taken)
+            self._total_times.append(written - read_started)
+            self.writes += 1
+            if self.recorder is not None:
+                self.recorder.push(positions, read_at)
+
+    @staticmethod
+    def _summary_ms(samples: deque) -> Dict[str, float]:
+        if not samples:
+            return {}
+        values = np.asarray(samples) * 1e3
+        p50, p95 = np.percentile(values, [50, 95])
+        return {"p50": float(p50), "p95": float(p95), "max": float(values.max())}
+
+    def stats(self) -> Dict[str, Any]:
+        """Rates, dropped samples and per-hop latency (ms) over the last `window` samples.
+
+        `read` is the leader bus transaction, `slot` the time a read sample waited for
+        the follower thread, `write` the follower transaction (plus filtering) and
+        `total` the start of the read to the end of the write.
+        """
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        stats = {
+            "read_hz": self.reads / elapsed if elapsed > 0 else 0.0,
+            "write_hz": self.writes / elapsed if elapsed > 0 else 0.0,
+            "skipped": self.slot.overwritten,
+            "read_errors": self.read_errors,
+            "write_errors": self.write_errors,
+            "latency_ms": {
+                "read": self._summary_ms(self._read_times),
+                "slot": self._summary_ms(self._slot_times),
+                "write": self._summary_ms(self._write_times),
+                "total": self._summary_ms(self._total_times),
+            },
+        }
+        if self.clock:
+            stats["late"] = self.clock.overruns
+        return stats
@@ -0,0 +1,142 @@
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class MotionLimits:
+    """Per-joint limits a trajectory must respect, in motor order and action units.
+
+    `lower`/`upper` are the calibrated goal range of each joint. `max_velocity`
+    (units/s) and `max_acceleration` (units/s²) are scalars or per-joint arrays;
+    None skips that check.
+    """
+
+    __slots__ = ("lower", "upper", "max_velocity", "max_acceleration")
+
+    def __init__(self, lower: np.ndarray, upper: np.ndarray, max_velocity=None, max_acceleration=None):
+        self.lower = np.asarray(lower, dtype=np.float32)
+        self.upper = np.asarray(upper, dtype=np.float32)
+        self.max_velocity = None if max_velocity is None else np.asarray(max_velocity, dtype=np.float32)
+        self.max_acceleration = None if max_acceleration is None else np.asarray(max_acceleration, dtype=np.float32)
+
+
+class TrajectoryReport:
+    """Outcome of `validate_trajectory`: which frames break which limit, and by how much.
+
+    Frame counts are per check. `segments` are the (first, last) frames of each run
+    of consecutive violating frames. `worst_*` are the largest value seen for the
+    whole trajectory, whether or not it broke the limit.
+    """
+
+    __slots__ = ("recording", "frames", "range_frames", "velocity_frames", "acceleration_frames",
+                 "segments", "worst_overshoot", "worst_velocity", "worst_acceleration", "clamped")
+
+    def __init__(self, recording: str, frames: int):
+        self.recording = recording
+        self.frames = frames
+        self.range_frames = 0
+        self.velocity_frames = 0
+        self.acceleration_frames = 0
+        self.segments: List[Tuple[int, int]] = []
+        self.worst_overshoot = 0.0
+        self.worst_velocity = 0.0
+        self.worst_acceleration = 0.0
+        self.clamped = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.segments
+
+    def summary(self) -> str:
+        if self.ok:
+            return f"{self.recording}: {self.frames} frames within limits"
+        segments = ", ".join(f"{first}-{last}" for first, last in self.segments[:5])
+        if len(self.segments) > 5:
+            segments += f" and {len(self.segments) - 5} more"
+        return (f"{self.recording}: {self.range_frames} frames out of range (by up to {self.worst_overshoot:.1f}), "
+                f"{self.velocity_frames} too fast (up to {self.worst_velocity:.0f}/s), "
+                f"{self.acceleration_frames} accelerating too hard (up to {self.worst_acceleration:.0f}/s²) "
+                f"in frames {segments}{' (clamped)' if self.clamped else ''}")
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """(first, last) index of each run of True in a 1-D mask"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).astype(np.int8)))
+    return [(int(first), int(last) - 1) for first, last in zip(edges[::2], edges[1::2])]
+
+
+def validate_trajectory(actions: np.ndarray, fps: float, limits: MotionLimits, recording: str = "") -> TrajectoryReport:
+    """Check a (frames, joints) trajectory played at `fps` against `limits`, all frames at once.
+
+    A velocity violation is charged to the frame reached too fast, an acceleration
+    violation to the frame where the velocity changes.
+    """
+    frames = len(actions)
+    report = TrajectoryReport(recording, frames)
+    if frames == 0:
+        return report
+    bad = np.zeros(frames, dtype=bool)
+
+    overshoot = np.maximum(limits.lower - actions, actions - limits.upper)
+    out_of_range = (overshoot > 0).any(axis=1)
+    report.range_frames = int(out_of_range.sum())
+    report.worst_overshoot = max(float(overshoot.max()), 0.0)
+    bad |= out_of_range
+
+    if frames > 1:
+        velocity = np.abs(np.diff(actions, axis=0)) * fps
+        report.worst_velocity = float(velocity.max())
+        if limits.max_velocity is not None:
+            too_fast = (velocity > limits.max_velocity).any(axis=1)
+            report.velocity_frames = int(too_fast.sum())
+            bad[1:] |= too_fast
+
+    if frames > 2:
+        acceleration = np.abs(np.diff(actions, n=2, axis=0)) * fps * fps
+        report.worst_acceleration = float(acceleration.max())
+        if limits.max_acceleration is not None:
+            too_hard = (acceleration > limits.max_acceleration).any(axis=1)
+            report.acceleration_frames = int(too_hard.sum())
+            bad[1:-1] |= too_hard
+
+    report.segments = _runs(bad)
+    return report
+
+
+def clamp_trajectory(actions: np.ndarray, fps: float, limits: MotionLimits) -> np.ndarray:
+    """Copy of `actions` clipped to the joint ranges and slew-limited to `max_velocity`.
+
+    A frame that moves too far is held back to the largest allowed step and the
+    trajectory catches up over the following frames. Acceleration is only reported,
+    not clamped: once velocity is bounded a remaining acceleration spike is a short
+    jerk rather than a jump.
+    """
+    clamped = np.clip(actions, limits.lower, limits.upper).astype(np.float32)
+    if limits.max_velocity is None or len(clamped) < 2:
+        return clamped
+
+    max_step = limits.max_velocity / np.float32(fps)
+    steps = np.diff(clamped, axis=0)
+    # The slew limit depends on where the previous frame ended up, so only frames
+    # from the first too-large step onwards need the sequential pass
+    too_fast = np.flatnonzero((np.abs(steps) > max_step).any(axis=1))
+    if len(too_fast) == 0:
+        return clamped
+    for index in range(too_fast[0] + 1, len(clamped)):
+        step = np.clip(clamped[index] - clamped[index - 1], -max_step, max_step)
+        clamped[index] = clamped[index - 1] + step
+    return clamped
+
+
+def transition_frames_for(start: np.ndarray, target: np.ndarray, fps: float, limits: MotionLimits,
+                          minimum: int = 1) -> int:
+    """Fewest frames for a linear ramp from `start` to `target` that stays under `max_velocity`"""
+    if limits.max_velocity is None:
+        return minimum
+    seconds = float(np.max(np.abs(np.asarray(target) - np.asarray(start)) / limits.max_velocity))
+    return max(minimum, math.ceil(seconds * fps))
+
+
+def clip_pose(pose: np.ndarray, limits: MotionLimits) -> np.ndarray:
+    return np.clip(pose, limits.lower, limits.upper).astype(np.float32)
@@ -0,0 +1,238 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+# The head matrix: 8 rows from the base of the lamp to the top, 5 LEDs per row
+MATRIX_ROWS = 8
+MATRIX_COLS = 5
+
+LUT_SIZE = 1024
+# One period of sin, indexed by phase * LUT_SIZE
+SINE_LUT = np.sin(np.arange(LUT_SIZE, dtype=np.float64) * 2 * np.pi / LUT_SIZE).astype(np.float32)
+# Perceived brightness -> LED duty, so fades look even instead of jumping at the dark end
+GAMMA = 2.2
+GAMMA_LUT = ((np.arange(256, dtype=np.float64) / 255.0) ** GAMMA).astype(np.float32)
+# Fully saturated hue wheel, indexed by hue * 256
+HUE_LUT = np.empty((256, 3), dtype=np.float32)
+
+
+def _fill_hue_lut():
+    hue = np.arange(256, dtype=np.float64) / 256.0 * 6.0
+    sector = hue.astype(int)
+    frac = hue - sector
+    rising, falling = frac, 1.0 - frac
+    one, zero = np.ones_like(frac), np.zeros_like(frac)
+    table = [
+        (one, rising, zero),
+        (falling, one, zero),
+        (zero, one, rising),
+        (zero, falling, one),
+        (rising, zero, one),
+        (one, zero, falling),
+    ]
+    for s, (r, g, b) in enumerate(table):
+        mask = sector == s
+        HUE_LUT[mask] = np.stack((r[mask], g[mask], b[mask]), axis=1) * 255.0
+
+
+_fill_hue_lut()
+
+
+def sine(phase: np.ndarray) -> np.ndarray:
+    """sin(2 * pi * phase) from the lookup table"""
+    index = (np.asarray(phase) * LUT_SIZE).astype(np.int64) & (LUT_SIZE - 1)
+    return SINE_LUT[index]
+
+
+def gamma(level: np.ndarray) -> np.ndarray:
+    """Map 0..1 perceived brightness to 0..1 duty through the gamma table"""
+    index = (np.clip(level, 0.0, 1.0) * 255.0).astype(np.uint8)
+    return GAMMA_LUT[index]
+
+
+class LedMatrix:
+    """Precomputed 2D addressing of the LED chain.
+
+    `index_map[row, col]` is the position of that LED in the chain, and `rows` / `cols` give the
+    coordinates of every LED in chain order as a fraction of the matrix (row / rows), so effects
+    can be written as array expressions over the whole matrix and periodic ones tile seamlessly.
+    """
+
+    def __init__(self, led_count: int, rows: int = MATRIX_ROWS, cols: int = MATRIX_COLS, serpentine: bool = False):
+        self.led_count = led_count
+        self.shape = (rows, cols)
+        grid = np.arange(rows * cols).reshape(rows, cols)
+        if serpentine:
+            grid[1::2] = grid[1::2, ::-1]
+        self.index_map = grid
+
+        chain = np.arange(led_count)
+        row_of = np.empty(rows * cols, dtype=np.int64)
+        col_of = np.empty(rows * cols, dtype=np.int64)
+        row_of[grid.ravel()] = np.repeat(np.arange(rows), cols)
+        col_of[grid.ravel()] = np.tile(np.arange(cols), rows)
+        chain = np.minimum(chain, rows * cols - 1)
+        self.rows = (row_of[chain] / rows).astype(np.float32)
+        self.cols = (col_of[chain] / cols).astype(np.float32)
+
+
+def _color(value: Any) -> np.ndarray:
+    if isinstance(value, int):
+        value = ((value >> 16) & 0xFF, (value >> 8) & 0xFF, value & 0xFF)
+    color = np.asarray(value, dtype=np.float32)
+    if color.shape != (3,):
+        raise ValueError(f"Invalid color: {value}")
+    return np.clip(color, 0, 255)
+
+
+class Effect(ABC):
+    """A procedural animation rendered into an (led_count, 3) float frame of 0..255 values.
+
+    `render` is called by the render thread with the time since the effect started and the
+    time since the previous frame. `finished` tells the thread it may stop rendering and hold
+    the last frame.
+    """
+
+    def __init__(self, matrix: LedMatrix, brightness: float = 1.0):
+        self.matrix = matrix
+        self.brightness = float(brightness)
+        self.out = np.zeros((matrix.led_count, 3), dtype=np.float32)
+
+    def begin(self, frame: np.ndarray):
+        """Called once with the frame currently on the strip"""
+
+    @abstractmethod
+    def render(self, t: float, dt: float) -> np.ndarray:
+        pass
+
+    def finished(self, t: float) -> bool:
+        return False
+
+
+class Breathe(Effect):
+    def __init__(self, matrix: LedMatrix, color: Any = (255, 255, 255), period: float = 3.0, floor: float = 0.05,
+                 brightness: float = 1.0):
+        super().__init__(matrix, brightness)
+        self.color = _color(color)
+        self.period = float(period)
+        self.floor = float(floor)
+
+    def render(self, t: float, dt: float) -> np.ndarray:
+        # Start dark: 0.5 - 0.5 * cos == 0.5 + 0.5 * sin(phase - 1/4)
+        level = self.floor + (1.0 - self.floor) * (0.5 + 0.5 * sine(t / self.period - 0.25))
+        self.out[:] = self.color * (gamma(level) * self.brightness)
+        return self.out
+
+
+class Rainbow(Effect):
+    def __init__(self, matrix: LedMatrix, period: float = 5.0, spread: float = 1.0, axis: str = "rows",
+                 brightness: float = 1.0):
+        super().__init__(matrix, brightness)
+        self.period = float(period)
+        self.offsets = (matrix.rows if axis == "rows" else matrix.cols) * float(spread)
+
+    def render(self, t: float, dt: float) -> np.ndarray:
+        hue = (t / self.period + self.offsets) % 1.0
+        np.multiply(HUE_LUT[(hue * 256).astype(np.int64) & 255], self.brightness, out=self.out)
+        return self.out
+
+
+class Wave(Effect):
+    def __init__(self, matrix: LedMatrix, color: Any = (0, 128, 255), period: float = 2.0, wavelength: float = 1.0,
+                 axis: str = "rows", floor: float = 0.0, background: Any = (0, 0, 0), brightness: float = 1.0):
+        super().__init__(matrix, brightness)
+        self.color = _color(color)
+        self.background = _color(background)
+        self.period = float(period)
+        self.floor = float(floor)
+        self.coords = (matrix.rows if axis == "rows" else matrix.cols) / float(wavelength)
+
+    def render(self, t: float, dt: float) -> np.ndarray:
+        level = self.floor + (1.0 - self.floor) * (0.5 + 0.5 * sine(t / self.period - self.coords))
+        weights = gamma(level)[:, None] * self.brightness
+        np.multiply(self.color - self.background, weights, out=self.out)
+        self.out += self.background
+        return self.out
+
+
+class Sparkle(Effect):
+    def __init__(self, matrix: LedMatrix, color: Any = (255, 255, 255), rate: float = 1.0, decay: float = 4.0,
+                 background: Any = (0, 0, 0), brightness: float = 1.0, seed: Optional[int] = None):
+        super().__init__(matrix, brightness)
+        self.color = _color(color)
+        self.background = _color(background)
+        # Sparkles per LED per second, and how fast each one fades (1/s)
+        self.rate = float(rate)
+        self.decay = float(decay)
+        self.levels = np.zeros(matrix.led_count, dtype=np.float32)
+        self.rng = np.random.default_rng(seed)
+
+    def render(self, t: float, dt: float) -> np.ndarray:
+        self.levels *= np.float32(np.exp(-self.decay * dt))
+        ignite = self.rng.random(self.matrix.led_count) < self.rate * dt
+        self.levels[ignite] = 1.0
+        weights = gamma(self.levels)[:, None] * self.brightness
+        np.multiply(self.color - self.background, weights, out=self.out)
+        self.out += self.background
+        return self.out
+
+
+class Crossfade(Effect):
+    """Fade through `colors`, `duration` seconds per step. With a single color, fade to it from
+    whatever is currently shown."""
+
+    def __init__(self, matrix: LedMatrix, colors: Sequence[Any] = ((255, 0, 0), (0, 0, 255)), duration: float = 1.0,
+                 loop: bool = False, brightness: float = 1.0):
+        super().__init__(matrix, brightness)
+        if len(colors) == 0:
+            raise ValueError("Crossfade needs at least one color")
+        self.stops = [np.broadcast_to(_color(c), self.out.shape) for c in colors]
+        self.duration = float(duration)
+        self.loop = bool(loop)
+
+    def begin(self, frame: np.ndarray):
+        if len(self.stops) == 1:
+            self.stops.insert(0, frame.astype(np.float32))
+
+    def render(self, t: float, dt: float) -> np.ndarray:
+        steps = len(self.stops) if self.loop else len(self.stops) - 1
+        if steps == 0:
+            self.out[:] = self.stops[0] * self.brightness
+            return self.out
+
+        position = t / self.duration
+        if not self.loop and position >= steps:
+            self.out[:] = self.stops[-1] * self.brightness
+            return self.out
+
+        step = int(position) % steps
+        # Ease in and out: 0.5 - 0.5 * cos(pi * frac)
+        frac = 0.5 + 0.5 * float(sine((position % 1.0) / 2 - 0.25))
+        start, end = self.stops[step], self.stops[(step + 1) % len(self.stops)]
+        np.subtract(end, start, out=self.out)
+        self.out *= frac
+        self.out += start
+        self.out *= self.brightness
+        return self.out
+
+    def finished(self, t: float) -> bool:
+        return not self.loop and t >= self.duration * (len(self.stops) - 1)
+
+
+EFFECTS: Dict[str, Type[Effect]] = {
+    "breathe": Breathe,
+    "rainbow": Rainbow,
+    "wave": Wave,
+    "sparkle": Sparkle,
+    "crossfade": Crossfade,
+}
+
+
+def create_effect(spec: Dict[str, Any], matrix: LedMatrix) -> Tuple[str, Effect]:
+    """Build an effect from an event payload like {"name": "breathe", "color": (255, 0, 0), "period": 2.0}"""
+    params = dict(spec)
+    name = params.pop("name", None)
+    if name not in EFFECTS:
+        raise ValueError(f"Unknown effect {name!r}, expected one of {sorted(EFFECTS)}")
+    return name, EFFECTS[name](matrix, **params)
@@ -1,79 +1,244 @@
-from typing import Any, List, Union
-from rpi_ws281x import PixelStrip, Color
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
 from ..base import ServiceBase
+from ..clock import FrameClock
+from .effects import Effect, LedMatrix, create_effect
+
+try:
+    from rpi_ws281x import PixelStrip
+except ImportError:
+    # Off the Pi only an injected strip (e.g. lelamp.sim.MemoryPixelStrip) can be driven
+    PixelStrip = None
 
 
 class RGBService(ServiceBase):
-    def __init__(self, 
+    def __init__(self,
                  led_count: int = 40,
                  led_pin: int = 12,
                  led_freq_hz: int = 800000,
                  led_dma: int = 10,
                  led_brightness: int = 255,
                  led_invert: bool = False,
-                 led_channel: int = 0):
+                 led_channel: int = 0,
+                 strip: Any = None,
+                 render_fps: int = 30):
         super().__init__("rgb")
-        
+
         self.led_count = led_count
-        self.strip = PixelStrip(
-            led_count, led_pin, led_freq_hz, led_dma, 
-            led_invert, led_brightness, led_channel
-        )
+        if strip is None:
+            if PixelStrip is None:
+                raise ImportError("rpi_ws281x is required to drive the LED strip")
+            strip = PixelStrip(
+                led_count, led_pin, led_freq_hz, led_dma,
+                led_invert, led_brightness, led_channel
+            )
+        self.strip = strip
         self.strip.begin()
-        
+
+        # Frame being composed, one RGB row per LED, and the last frame sent to the strip
+        self.framebuffer = np.zeros((led_count, 3), dtype=np.uint8)
+        self._shown: Optional[np.ndarray] = None
+        self._packed = np.empty(led_count, dtype=np.uint32)
+        self.shows = 0
+        self.skipped_shows = 0
+        # Serializes framebuffer writes between event handling and the render thread
+        self._frame_lock = threading.Lock()
+
+        # Effect engine: one event starts an effect, the render thread draws it at a fixed rate
+        self.render_fps = render_fps
+        self.matrix = LedMatrix(led_count)
+        self.effect_name: Optional[str] = None
+        self._effect: Optional[Effect] = None
+        self._effect_started = 0.0
+        self._effect_changed = threading.Event()
+        self._render_thread: Optional[threading.Thread] = None
+        self.render_clock = FrameClock(render_fps)
+
     def handle_event(self, event_type: str, payload: Any):
         if event_type == "solid":
             self._handle_solid(payload)
         elif event_type == "paint":
             self._handle_paint(payload)
+        elif event_type == "effect":
+            self._handle_effect(payload)
         else:
             self.logger.warning(f"Unknown event type: {event_type}")
-    
+
     def _handle_solid(self, color_code: Union[int, tuple]):
         """Fill entire strip with single color"""
-        if isinstance(color_code, tuple) and len(color_code) == 3:
-            color = Color(color_code[0], color_code[1], color_code[2])
-        elif isinstance(color_code, int):
-            color = color_code
-        else:
+        rgb = self._to_rgb(color_code)
+        if rgb is None:
             self.logger.error(f"Invalid color format: {color_code}")
             return
-            
-        for i in range(self.led_count):
-            self.strip.setPixelColor(i, color)
-        self.strip.show()
+
+        self._set_effect(None)
+        with self._frame_lock:
+            self.framebuffer[:] = rgb
+            self.show()
         self.logger.debug(f"Applied solid color: {color_code}")
-    
+
     def _handle_paint(self, colors: List[Union[int, tuple]]):
         """Set individual pixel colors from array"""
         if not isinstance(colors, list):
             self.logger.error(f"Paint payload must be a list, got: {type(colors)}")
             return
-            
+
         max_pixels = min(len(colors), self.led_count)
-        
-        for i in range(max_pixels):
-            color_code = colors[i]
-            if isinstance(color_code, tuple) and len(color_code) == 3:
-                color = Color(color_code[0], color_code[1], color_code[2])
-            elif isinstance(color_code, int):
-                color = color_code
-            else:
-                self.logger.warning(f"Invalid color at index {i}: {color_code}")
+        pixels = colors[:max_pixels]
+        self._set_effect(None)
+        with self._frame_lock:
+            self._paint(pixels)
+        self.logger.debug(f"Applied paint pattern with {max_pixels} colors")
+
+    def _paint(self, pixels: List[Union[int, tuple]]):
+        max_pixels = len(pixels)
+
+        # Uniform payloads (all (r, g, b) tuples or all packed ints) convert in one shot
+        try:
+            values = np.asarray(pixels)
+        except ValueError:
+            values = None
+        if values is not None and values.dtype.kind in "iu" and values.shape == (max_pixels, 3):
+            self.framebuffer[:max_pixels] = np.clip(values, 0, 255)
+        elif values is not None and values.dtype.kind in "iu" and values.shape == (max_pixels,):
+            self.framebuffer[:max_pixels] = self._unpack(values)
+        else:
+            for i, color_code in enumerate(pixels):
+                rgb = self._to_rgb(color_code)
+                if rgb is None:
+                    self.logger.warning(f"Invalid color at index {i}: {color_code}")
+                    continue
+                self.framebuffer[i] = rgb
+
+        self.show()
+
+    def _handle_effect(self, spec: Optional[Dict[str, Any]]):
+        """Start a procedural effect, e.g. {"name": "breathe", "color": (255, 0, 0), "period": 2.0}.
+        A None payload stops the running effect and holds its last frame."""
+        if spec is None:
+            self._set_effect(None)
+            return
+
+        try:
+            name, effect = create_effect(spec, self.matrix)
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"Invalid effect {spec}: {e}")
+            return
+
+        with self._frame_lock:
+            effect.begin(self.framebuffer.copy())
+        self._set_effect(effect, name)
+        self.logger.debug(f"Started effect: {spec}")
+
+    def _set_effect(self, effect: Optional[Effect], name: Optional[str] = None):
+        with self._frame_lock:
+            self._effect = effect
+            self.effect_name = name
+            self._effect_started = time.perf_counter()
+        self._effect_changed.set()
+
+    def _render_loop(self):
+        """Draw the running effect at render_fps; sleep on the effect event while there is none"""
+        clock = self.render_clock
+        last_frame = None
+        while self._running.is_set():
+            effect, started = self._effect, self._effect_started
+            if effect is None:
+                self._effect_changed.wait(timeout=0.1)
+                self._effect_changed.clear()
+                clock.start()
+                last_frame = None
                 continue
-                
-            self.strip.setPixelColor(i, color)
-        
+            # A CRITICAL event is waiting for the event worker; leave the strip to it
+            if self.preempt_requested:
+                clock.tick()
+                continue
+
+            now = time.perf_counter()
+            t = now - started
+            dt = now - last_frame if last_frame is not None else clock.period
+            last_frame = now
+
+            try:
+                frame = effect.render(t, dt)
+                np.clip(frame, 0, 255, out=frame)
+                with self._frame_lock:
+                    # Skip the frame if a newer event replaced the effect while it rendered
+                    if self._effect is effect:
+                        np.copyto(self.framebuffer, frame, casting="unsafe")
+                        self.show()
+                        if effect.finished(t):
+                            self._effect = None
+                            self.effect_name = None
+            except Exception as e:
+                self.logger.error(f"Error rendering effect: {e}")
+                self._set_effect(None)
+
+            clock.tick()
+
+    def show(self):
+        """Push the framebuffer to the strip, unless it is unchanged since the last show.
+
+        The whole frame is packed in one vectorized step, but rpi_ws281x only sets one pixel
+        per call, so only the pixels that changed since the last show are assigned.
+        """
+        shown = self._shown
+        if shown is not None and np.array_equal(self.framebuffer, shown):
+            self.skipped_shows += 1
+            return
+
+        # Pack to the strip's 0x00RRGGBB words
+        fb = self.framebuffer
+        packed = self._packed
+        np.left_shift(fb[:, 0], 16, out=packed, dtype=np.uint32)
+        packed |= fb[:, 1].astype(np.uint32) << 8
+        packed |= fb[:, 2]
+
+        if shown is None:
+            self.strip[0:self.led_count] = packed.tolist()
+        else:
+            changed = np.flatnonzero((fb != shown).any(axis=1))
+            for index, color in zip(changed.tolist(), packed[changed].tolist()):
+                self.strip[index] = color
         self.strip.show()
-        self.logger.debug(f"Applied paint pattern with {max_pixels} colors")
-    
+        self._shown = fb.copy()
+        self.shows += 1
+
+    @staticmethod
+    def _to_rgb(color_code: Union[int, tuple]) -> Optional[tuple]:
+        if isinstance(color_code, tuple) and len(color_code) == 3:
+            return tuple(min(max(int(c), 0), 255) for c in color_code)
+        if isinstance(color_code, int):
+            return ((color_code >> 16) & 0xFF, (color_code >> 8) & 0xFF, color_code & 0xFF)
+        return None
+
+    @staticmethod
+    def _unpack(values: np.ndarray) -> np.ndarray:
+        """Packed 0xRRGGBB ints to (n, 3) RGB rows"""
+        values = values.astype(np.uint32)
+        return np.stack(((values >> 16) & 0xFF, (values >> 8) & 0xFF, values & 0xFF), axis=1)
+
     def clear(self):
         """Turn off all LEDs"""
-        for i in range(self.led_count):
-            self.strip.setPixelColor(i, Color(0, 0, 0))
-        self.strip.show()
-    
+        self._set_effect(None)
+        with self._frame_lock:
+            self.framebuffer[:] = 0
+            self.show()
+
+    def start(self):
+        """Override start to run the effect render thread next to the event worker"""
+        super().start()
+        if self._render_thread is None or not self._render_thread.is_alive():
+            self._render_thread = threading.Thread(target=self._render_loop, name="rgb-render", daemon=True)
+            self._render_thread.start()
+
     def stop(self, timeout: float = 5.0):
         """Override stop to clear LEDs before stopping"""
         self.clear()
-        super().stop(timeout)
\ No newline at end of file
+        super().stop(timeout)
+        if self._render_thread and self._render_thread.is_alive():
+            self._effect_changed.set()
+            self._render_thread.join(timeout=timeout)
+        self._render_thread = None
@@ -0,0 +1,4 @@
+from .sim_bus import SimFeetechMotorsBus, is_sim_port
+from .led_strip import MemoryPixelStrip
+
+__all__ = ["SimFeetechMotorsBus", "is_sim_port", "MemoryPixelStrip"]
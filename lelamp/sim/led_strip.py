@@ -0,0 +1,69 @@
+import time
+from typing import List
+
+
+def Color(red: int, green: int, blue: int, white: int = 0) -> int:
+    """Same 24/32-bit packing as rpi_ws281x.Color"""
+    return (white << 24) | (red << 16) | (green << 8) | blue
+
+
+class MemoryPixelStrip:
+    """
+    In-memory stand-in for rpi_ws281x.PixelStrip.
+
+    Pixels are plain ints in the WS281x packing. `show()` latches the buffer into `shown` and, when
+    `realtime` is set, blocks for as long as the frame would take to clock out at `freq_hz`
+    (24 bits per LED plus the 50us reset), like the DMA-driven strip does.
+    """
+
+    def __init__(self, num: int, pin: int = 12, freq_hz: int = 800000, dma: int = 10, invert: bool = False,
+                 brightness: int = 255, channel: int = 0, realtime: bool = False):
+        self.num = num
+        self.freq_hz = freq_hz
+        self.brightness = brightness
+        self.realtime = realtime
+        self.pixels: List[int] = [0] * num
+        self.shown: List[int] = [0] * num
+        self.show_count = 0
+        self.show_time = num * 24 / freq_hz + 50e-6
+
+    def begin(self):
+        pass
+
+    def show(self):
+        self.shown = list(self.pixels)
+        self.show_count += 1
+        if self.realtime:
+            deadline = time.perf_counter() + self.show_time
+            while time.perf_counter() < deadline:
+                pass
+
+    def setPixelColor(self, n: int, color: int):
+        self.pixels[n] = color
+
+    def setPixelColorRGB(self, n: int, red: int, green: int, blue: int, white: int = 0):
+        self.pixels[n] = Color(red, green, blue, white)
+
+    def getPixelColor(self, n: int) -> int:
+        return self.pixels[n]
+
+    def getPixels(self) -> List[int]:
+        return self.pixels
+
+    def numPixels(self) -> int:
+        return self.num
+
+    def setBrightness(self, brightness: int):
+        self.brightness = brightness
+
+    def getBrightness(self) -> int:
+        return self.brightness
+
+    def __getitem__(self, pos):
+        return self.pixels[pos]
+
+    def __setitem__(self, pos, value):
+        self.pixels[pos] = value
+
+    def __len__(self) -> int:
+        return self.num
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+
+import logging
+import math
+import threading
+import time
+from urllib.parse import parse_qsl, urlsplit
+
+from lerobot.errors import DeviceAlreadyConnectedError, DeviceNotConnectedError
+from lerobot.motors import Motor, MotorCalibration
+from lerobot.motors.feetech import FeetechMotorsBus
+from lerobot.utils.encoding_utils import decode_sign_magnitude, encode_sign_magnitude
+
+logger = logging.getLogger(__name__)
+
+SIM_SCHEME = "sim://"
+
+# STS3215 control table addresses used by the motion model
+_MODEL_NUMBER = 3
+_FIRMWARE_MAJOR = 0
+_FIRMWARE_MINOR = 1
+_ID = 5
+_BAUD_RATE = 6
+_RETURN_DELAY_TIME = 7
+_MIN_POSITION_LIMIT = 9
+_MAX_POSITION_LIMIT = 11
+_HOMING_OFFSET = 31
+_TORQUE_ENABLE = 40
+_ACCELERATION = 41
+_GOAL_POSITION = 42
+_GOAL_VELOCITY = 46
+_PRESENT_POSITION = 56
+_PRESENT_VELOCITY = 58
+_MOVING = 66
+
+# Protocol 0 framing: 0xFF 0xFF ID LEN INSTR ... CHECKSUM
+_HEADER_BYTES = 6
+_BITS_PER_BYTE = 10  # start + 8 data + stop
+
+
+def is_sim_port(port: str | None) -> bool:
+    return bool(port) and port.startswith(SIM_SCHEME)
+
+
+def parse_sim_port(port: str) -> dict[str, float]:
+    """Options given as a query string on the port, e.g. `sim://?latency_ms=2&baudrate=1000000`."""
+    return {key: float(val) for key, val in parse_qsl(urlsplit(port).query)}
+
+
+class SimServo:
+    """Register file and first-order motion model of one STS3215."""
+
+    def __init__(self, motor_id: int, model_number: int, resolution: int, start_position: int):
+        self.memory = bytearray(256)
+        self.resolution = resolution
+        self.position = float(start_position)
+        self.velocity = 0.0
+        self.wiggle_phase = motor_id * 1.3
+
+        self.write(_MODEL_NUMBER, 2, model_number)
+        self.write(_FIRMWARE_MAJOR, 1, 3)
+        self.write(_FIRMWARE_MINOR, 1, 10)
+        self.write(_ID, 1, motor_id)
+        self.write(_RETURN_DELAY_TIME, 1, 250)
+        self.write(_MAX_POSITION_LIMIT, 2, resolution - 1)
+        self.write(_GOAL_POSITION, 2, start_position)
+        self.write(_PRESENT_POSITION, 2, start_position)
+
+    def read(self, addr: int, length: int) -> int:
+        return int.from_bytes(self.memory[addr : addr + length], "little")
+
+    def write(self, addr: int, length: int, value: int) -> None:
+        self.memory[addr : addr + length] = int(value).to_bytes(length, "little")
+
+    def step(self, dt: float, lag: float, max_velocity: float, wiggle: float, wiggle_hz: float, now: float) -> None:
+        if not self.read(_TORQUE_ENABLE, 1):
+            # Limp: hold still, or follow a hand moving the joint around where it was left
+            if wiggle:
+                center = self.read(_GOAL_POSITION, 2)
+                self.position = center + wiggle * math.sin(2 * math.pi * wiggle_hz * now + self.wiggle_phase)
+            self.velocity = 0.0
+        else:
+            goal = min(max(self.read(_GOAL_POSITION, 2), self.read(_MIN_POSITION_LIMIT, 2)),
+                       self.read(_MAX_POSITION_LIMIT, 2))
+            error = goal - self.position
+
+            # Chase the goal with a first-order lag, within the speed and acceleration limits
+            target_velocity = error / lag if lag > 0 else error / dt
+            goal_velocity = decode_sign_magnitude(self.read(_GOAL_VELOCITY, 2), 15)
+            limit = abs(goal_velocity) if goal_velocity else max_velocity
+            target_velocity = min(max(target_velocity, -limit), limit)
+
+            acceleration = self.read(_ACCELERATION, 1) * 100.0
+            if acceleration:
+                delta = min(max(target_velocity - self.velocity, -acceleration * dt), acceleration * dt)
+                target_velocity = self.velocity + delta
+
+            step = target_velocity * dt
+            if abs(step) >= abs(error):
+                step, target_velocity = error, 0.0
+            self.position += step
+            self.velocity = target_velocity
+
+        position = min(max(int(round(self.position)), 0), self.resolution - 1)
+        self.write(_PRESENT_POSITION, 2, position)
+        self.write(_PRESENT_VELOCITY, 2, encode_sign_magnitude(int(round(self.velocity)), 15))
+        self.write(_MOVING, 1, int(self.velocity != 0.0))
+
+
+class SimFeetechMotorsBus(FeetechMotorsBus):
+    """
+    Drop-in FeetechMotorsBus that talks to simulated STS3215 servos instead of a serial port.
+
+    Only the transport is replaced: normalization, sign encoding, calibration and the sync read/write
+    bookkeeping all run the real lerobot code. Every transaction blocks for as long as its packets would
+    take on the wire at the configured baud rate plus a fixed per-transaction latency, so loop timing
+    measured against the simulator is representative of the hardware.
+
+    Options are read from the port string (`sim://?key=value&...`):
+        baudrate: Bus baud rate used to derive packet timing (default 1000000).
+        latency_ms: Fixed USB/serial latency added to every transaction (default 1.0).
+        lag_ms: Time constant of the servo's response to a new goal (default 50).
+        max_velocity: Speed limit in steps/s when Goal_Velocity is 0 (default 3400).
+        wiggle: Amplitude in steps of the motion followed while torque is off (default 0).
+        wiggle_hz: Frequency of that motion (default 0.5).
+    """
+
+    def __init__(
+        self,
+        port: str,
+        motors: dict[str, Motor],
+        calibration: dict[str, MotorCalibration] | None = None,
+        protocol_version: int = 0,
+    ):
+        if not calibration:
+            # No calibration file for this id: the simulated servos come calibrated to their full range
+            calibration = {
+                motor: MotorCalibration(id=m.id, drive_mode=0, homing_offset=0, range_min=0,
+                                        range_max=self.model_resolution_table[m.model] - 1)
+                for motor, m in motors.items()
+            }
+        super().__init__(port, motors, calibration, protocol_version)
+        options = parse_sim_port(port)
+        self.sim_baudrate = int(options.get("baudrate", 1_000_000))
+        self.latency = options.get("latency_ms", 1.0) / 1e3
+        self.lag = options.get("lag_ms", 50.0) / 1e3
+        self.max_velocity = options.get("max_velocity", 3400.0)
+        self.wiggle = options.get("wiggle", 0.0)
+        self.wiggle_hz = options.get("wiggle_hz", 0.5)
+
+        self.servos: dict[int, SimServo] = {}
+        for motor, m in self.motors.items():
+            resolution = self.model_resolution_table[m.model]
+            servo = SimServo(m.id, self.model_number_table[m.model], resolution, resolution // 2)
+            cal = calibration.get(motor)
+            if cal is not None:
+                servo.write(_HOMING_OFFSET, 2, encode_sign_magnitude(cal.homing_offset, 11))
+                servo.write(_MIN_POSITION_LIMIT, 2, cal.range_min)
+                servo.write(_MAX_POSITION_LIMIT, 2, cal.range_max)
+                start = (cal.range_min + cal.range_max) // 2
+                servo.position = float(start)
+                servo.write(_GOAL_POSITION, 2, start)
+                servo.write(_PRESENT_POSITION, 2, start)
+            self.servos[m.id] = servo
+
+        self._sim_lock = threading.Lock()
+        self._sim_time: float | None = None
+        self._open = False
+
+        self.transactions = 0
+        self.bytes_on_wire = 0
+        self.bus_time = 0.0
+
+    @property
+    def is_connected(self) -> bool:
+        return self._open
+
+    def connect(self, handshake: bool = True) -> None:
+        if self._open:
+            raise DeviceAlreadyConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is already connected. Do not call `{self.__class__.__name__}.connect()` twice."
+            )
+        self._open = True
+        self._sim_time = time.perf_counter()
+        if handshake:
+            self._handshake()
+        logger.debug(f"{self.__class__.__name__} connected.")
+
+    def _handshake(self) -> None:
+        missing = [motor for motor, m in self.motors.items() if m.id not in self.servos]
+        if missing:
+            raise ConnectionError(f"Simulated bus is missing motors: {missing}")
+
+    def disconnect(self, disable_torque: bool = True) -> None:
+        if not self._open:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. Try running `{self.__class__.__name__}.connect()` first."
+            )
+        if disable_torque:
+            self.disable_torque(num_retry=5)
+        self._open = False
+        logger.debug(f"{self.__class__.__name__} disconnected.")
+
+    def set_timeout(self, timeout_ms: int | None = None):
+        pass
+
+    def get_baudrate(self) -> int:
+        return self.sim_baudrate
+
+    def set_baudrate(self, baudrate: int) -> None:
+        self.sim_baudrate = baudrate
+
+    def ping(self, motor, num_retry: int = 0, raise_on_error: bool = False) -> int | None:
+        servo = self.servos.get(self._get_motor_id(motor))
+        if servo is None:
+            if raise_on_error:
+                raise ConnectionError(f"No simulated motor {motor}")
+            return None
+        self._transact(_HEADER_BYTES, _HEADER_BYTES)
+        return servo.read(_MODEL_NUMBER, 2)
+
+    def broadcast_ping(self, num_retry: int = 0, raise_on_error: bool = False) -> dict[int, int] | None:
+        self._transact(_HEADER_BYTES, _HEADER_BYTES * len(self.servos))
+        return {id_: servo.read(_MODEL_NUMBER, 2) for id_, servo in self.servos.items()}
+
+    def _read(self, address, length, motor_id, *, num_retry=0, raise_on_error=True, err_msg=""):
+        with self._sim_lock:
+            self._advance()
+            value = self._servo(motor_id, err_msg).read(address, length)
+        self._transact(_HEADER_BYTES + 2, _HEADER_BYTES + length)
+        return value, 0, 0
+
+    def _write(self, addr, length, motor_id, value, *, num_retry=0, raise_on_error=True, err_msg=""):
+        with self._sim_lock:
+            self._advance()
+            self._servo(motor_id, err_msg).write(addr, length, value)
+        self._transact(_HEADER_BYTES + 1 + length, _HEADER_BYTES)
+        return 0, 0
+
+    def _sync_read(self, addr, length, motor_ids, *, num_retry=0, raise_on_error=True, err_msg=""):
+        with self._sim_lock:
+            self._advance()
+            values = {id_: self._servo(id_, err_msg).read(addr, length) for id_ in motor_ids}
+        self._transact(_HEADER_BYTES + 2 + len(motor_ids), (_HEADER_BYTES + length) * len(motor_ids))
+        return values, 0
+
+    def _sync_write(self, addr, length, ids_values, num_retry=0, raise_on_error=True, err_msg=""):
+        with self._sim_lock:
+            self._advance()
+            for id_, value in ids_values.items():
+                self._servo(id_, err_msg).write(addr, length, value)
+        # Broadcast instruction: no status packets come back
+        self._transact(_HEADER_BYTES + 2 + len(ids_values) * (1 + length), 0)
+        return 0
+
+    def _servo(self, motor_id: int, err_msg: str) -> SimServo:
+        if not self._open:
+            raise DeviceNotConnectedError(f"{self.__class__.__name__}('{self.port}') is not connected.")
+        try:
+            return self.servos[motor_id]
+        except KeyError:
+            raise ConnectionError(f"{err_msg} No simulated motor with id {motor_id}") from None
+
+    def _advance(self) -> None:
+        """Integrate every servo up to now. Called under `_sim_lock` before each access."""
+        now = time.perf_counter()
+        dt = now - self._sim_time
+        self._sim_time = now
+        if dt <= 0:
+            return
+        for servo in self.servos.values():
+            servo.step(dt, self.lag, self.max_velocity, self.wiggle, self.wiggle_hz, now)
+
+    def _transact(self, tx_bytes: int, rx_bytes: int) -> None:
+        """Block for the time the packets spend on the wire, plus the link latency."""
+        n_bytes = tx_bytes + rx_bytes
+        duration = self.latency + n_bytes * _BITS_PER_BYTE / self.sim_baudrate
+        self.transactions += 1
+        self.bytes_on_wire += n_bytes
+        self.bus_time += duration
+
+        deadline = time.perf_counter() + duration
+        if duration > 0.002:
+            time.sleep(duration - 0.001)
+        while time.perf_counter() < deadline:
+            pass
+
+    def bus_stats(self) -> dict[str, float]:
+        return {
+            "transactions": self.transactions,
+            "bytes_on_wire": self.bytes_on_wire,
+            "bus_time_ms": self.bus_time * 1e3,
+        }
@@ -0,0 +1,81 @@
+import argparse
+import time
+import os
+from .daemon import LampClient, default_socket_path
+from .follower import LeLampFollower, LeLampFollowerConfig
+from .leader import LeLampLeader, LeLampLeaderConfig
+from .service.motors.recorder import RingRecorder
+from .service.motors.recording_format import RECORDING_WRITERS
+from .service.motors.teleop import OneEuroFilter, TeleopPipeline
+
+
+def _format_hop(hop: dict) -> str:
+    return f"{hop['p50']:.1f}/{hop['p95']:.1f}" if hop else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror a leader arm onto the lamp")
+    parser.add_argument('--id', type=str, required=True, help='ID of the lamp')
+    parser.add_argument('--port', type=str, required=True, help='Serial port for the lamp')
+    parser.add_argument('--leader-id', type=str, help='ID of the leader arm (default: the lamp ID)')
+    parser.add_argument('--leader-port', type=str, required=True, help='Serial port for the leader arm')
+    parser.add_argument('--fps', type=int, default=0, help='Leader reads per second, 0 to read as fast as the bus allows (default: 0)')
+    parser.add_argument('--min-cutoff', type=float, help='Smooth with a One Euro filter with this cutoff at rest, in Hz (e.g. 1.0)')
+    parser.add_argument('--beta', type=float, default=0.05, help='One Euro filter speed coefficient (default: 0.05)')
+    parser.add_argument('--name', type=str, help='Also record the mirrored motion under this name')
+    parser.add_argument('--format', type=str, choices=sorted(RECORDING_WRITERS), default='csv', help='CSV (default) or compact binary (rec)')
+    args = parser.parse_args()
+
+    socket_path = default_socket_path(args.id)
+    if LampClient.available(socket_path):
+        parser.error(f"A lamp daemon owns this lamp ({socket_path}), stop it before teleoperating")
+
+    leader = LeLampLeader(LeLampLeaderConfig(port=args.leader_port, id=args.leader_id or args.id))
+    follower = LeLampFollower(LeLampFollowerConfig(port=args.port, id=args.id))
+    leader.connect(calibrate=False)
+    follower.connect(calibrate=False)
+
+    recorder = None
+    filename = None
+    if args.name:
+        recordings_dir = os.path.join(os.path.dirname(__file__), "recordings")
+        os.makedirs(recordings_dir, exist_ok=True)
+        filename = os.path.join(recordings_dir, f"{args.name}_{args.id}.{args.format}")
+        joints = [f"{motor}.pos" for motor in follower.bus.motors]
+        writer = RECORDING_WRITERS[args.format](filename, joints, {"lamp_id": args.id, "rate_hz": args.fps or None})
+        # Fed by the follower thread with every row it writes, so it has no sampler of its own
+        recorder = RingRecorder(None, joints, writer)
+
+    pipeline = TeleopPipeline(
+        lambda: list(leader.bus.sync_read("Present_Position").values()),
+        follower.send_positions,
+        rate_hz=args.fps or None,
+        filter=OneEuroFilter(args.min_cutoff, args.beta) if args.min_cutoff else None,
+        recorder=recorder,
+    )
+    pipeline.start()
+
+    try:
+        while True:
+            time.sleep(1.0)
+            stats = pipeline.stats()
+            latency = stats["latency_ms"]
+            print(f"\r{stats['read_hz']:.0f} Hz read, {stats['write_hz']:.0f} Hz written, "
+                  f"latency p50/p95 ms: read {_format_hop(latency['read'])}, slot {_format_hop(latency['slot'])}, "
+                  f"write {_format_hop(latency['write'])}, total {_format_hop(latency['total'])}",
+                  end="", flush=True)
+    except KeyboardInterrupt:
+        print("\nShutting down teleop...")
+    finally:
+        pipeline.stop()
+        leader.disconnect()
+        follower.disconnect()
+
+    stats = pipeline.stats()
+    if stats["read_errors"] or stats["write_errors"]:
+        print(f"{stats['read_errors']} read errors, {stats['write_errors']} write errors")
+    if recorder is not None:
+        print(f"Saved {recorder.stats()['written']} samples to {filename}")
+
+if __name__ == "__main__":
+    main()
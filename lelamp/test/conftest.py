@@ -0,0 +1,3 @@
+# The hardware scripts here are run by hand against a real lamp (`uv run -m lelamp.test.test_motors ...`);
+# pytest only collects the unit tests, which need neither the motors nor the LEDs
+collect_ignore = ["test_animation.py", "test_audio.py", "test_motors.py", "test_rgb.py"]
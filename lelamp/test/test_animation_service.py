@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from lelamp.service import EventDiscarded, Priority
+from lelamp.service.motors.animation_service import AnimationService
+from lelamp.service.motors.recording_format import CsvFileWriter
+
+LAMP_ID = "lamp"
+# An instant simulated bus, so every test plays in real time without serial latency
+PORT = "sim://?latency_ms=0"
+
+
+def _write_recording(recordings_dir, name: str, joints, positions: np.ndarray, fps: int = 30):
+    writer = CsvFileWriter(str(recordings_dir / f"{name}_{LAMP_ID}.csv"), joints)
+    writer.append(np.arange(len(positions), dtype=np.float32) / fps, positions.astype(np.float32))
+    writer.close()
+
+
+def _play(service: AnimationService, name: str):
+    """Dispatch a play and wait until it is handled; returns (result, error)"""
+    outcome = []
+    handled = threading.Event()
+
+    def on_done(result, error):
+        outcome.append((result, error))
+        handled.set()
+    service.dispatch("play", name, on_done=on_done)
+    assert handled.wait(timeout=5.0)
+    return outcome[0]
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = AnimationService(port=PORT, lamp_id=LAMP_ID, watch_recordings=False, recordings_dir=str(tmp_path))
+    yield service
+    service.stop()
+
+
+def test_starts_without_recordings_and_binds_the_first_one(service, tmp_path):
+    service.start()
+    assert service.bank.joints == []
+    assert service.get_available_recordings() == []
+
+    # Columns in the reverse of the motor order, so binding has to reorder them
+    motors = list(service.robot.bus.motors)
+    joints = [f"{motor}.pos" for motor in reversed(motors)]
+    positions = np.tile(np.arange(len(joints), dtype=np.float32), (10, 1))
+    _write_recording(tmp_path, "nod", joints, positions)
+
+    result, error = _play(service, "nod")
+    assert error is None and result
+    frames = service._recording_cache.get(("nod", service.fps, 1.0))
+    np.testing.assert_array_equal(frames[0], np.arange(len(motors), dtype=np.float32)[::-1])
+
+
+def _collect(outcomes: dict, key: str):
+    def on_done(result, error):
+        outcomes[key] = (result, error)
+    return on_done
+
+
+def test_pending_plays_coalesce_to_the_latest(service):
+    # Queue without the event loop running, so nothing is handled while the queue is inspected
+    service._running.set()
+    outcomes = {}
+    service.dispatch("play", "first", on_done=_collect(outcomes, "first"))
+    service.dispatch("pose", {"positions": [0.0], "duration": 0.1}, on_done=_collect(outcomes, "pose"))
+    service.dispatch("play", "second", on_done=_collect(outcomes, "second"))
+    assert isinstance(outcomes.pop("first")[1], EventDiscarded)
+    assert [event.payload for event in service._event_queue if event.event_type == "play"] == ["second"]
+
+    # A lower-priority play does not displace the pending one
+    service.dispatch("play", "ignored", Priority.LOW, on_done=_collect(outcomes, "ignored"))
+    assert isinstance(outcomes.pop("ignored")[1], EventDiscarded)
+
+    # A higher-priority one does, and jumps ahead of the pose
+    service.dispatch("play", "urgent", Priority.HIGH, on_done=_collect(outcomes, "urgent"))
+    assert isinstance(outcomes.pop("second")[1], EventDiscarded)
+    assert [event.event_type for event in service._event_queue] == ["play", "pose"]
+    assert service._event_queue[0].payload == "urgent"
+    assert outcomes == {}
+
+    stats = service.stats()
+    assert (stats["dispatched"], stats["coalesced"], stats["dropped"], stats["queue_depth"]) == (5, 2, 1, 2)
+
+    service.stop()
+    assert all(isinstance(error, EventDiscarded) for _, error in outcomes.values())
+    assert sorted(outcomes) == ["pose", "urgent"]
+
+
+
+def test_play_async_settles_both_futures(service, tmp_path):
+    joints = [f"{motor}.pos" for motor in ["base_yaw", "base_pitch", "elbow_pitch", "wrist_roll", "wrist_pitch"]]
+    _write_recording(tmp_path, "nod", joints, np.zeros((6, len(joints)), dtype=np.float32))
+    # Short transitions in and back out, so the gesture finishes quickly
+    service.duration = 0.1
+    service.start()
+
+    async def scenario():
+        missing = service.play_async("missing")
+        assert await missing.started is False
+        assert await missing.finished is False
+
+        nod = service.play_async("nod")
+        assert await nod.started is True
+        assert await asyncio.wait_for(nod.finished, timeout=10.0) is True
+    asyncio.run(scenario())
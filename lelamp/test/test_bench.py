@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+from lelamp.bench.__main__ import main
+from lelamp.bench.playback import bench_layers, bench_playback, bench_transitions
+from lelamp.bench.recordings import bench_recording_load
+
+# Benchmarks run against a copy of the recordings shipped for the default lamp id, so the
+# banks and catalogs they build never land in the source tree
+LAMP_ID = "lelamp"
+RECORDINGS = os.path.join(os.path.dirname(__file__), "..", "recordings")
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    recordings_dir = tmp_path / "recordings"
+    shutil.copytree(RECORDINGS, recordings_dir, ignore=shutil.ignore_patterns("*.bank", "*.catalog.json", "*.tmp*"))
+    return str(recordings_dir)
+
+
+def test_bench_playback_from_a_service_with_no_current_state(recordings):
+    result = bench_playback(LAMP_ID, "nod", frames=60, recordings_dir=recordings)
+    assert result["frame_us"]["count"] == 60
+    assert result["dict_baseline_frame_us"]["count"] == 60
+
+
+def test_bench_transitions_are_faster_by_distance(recordings):
+    result = bench_transitions(LAMP_ID, recordings_dir=recordings)
+    assert result["recordings"]
+    assert result["by_distance_mean_first_motion_s"] < result["fixed_mean_first_motion_s"]
+
+
+def test_bench_layers_times_every_layer_count(recordings):
+    result = bench_layers(LAMP_ID, frames=20, counts=(0, 2), recordings_dir=recordings)
+    assert result["0_layers_frame_us"]["count"] == 20
+    assert result["2_layers_frame_us"]["count"] == 20
+
+
+def test_bench_recording_load(recordings):
+    result = bench_recording_load(LAMP_ID, repeats=1, recordings_dir=recordings)
+    assert "error" not in result
+    assert result["keyframe_rows"] <= result["source_rows"]
+
+
+def test_bench_cli_writes_the_selected_suites(recordings, tmp_path, monkeypatch):
+    output = tmp_path / "bench.json"
+    monkeypatch.setattr(sys, "argv", [
+        "lelamp.bench", "--id", LAMP_ID, "--recordings", recordings, "--frames", "30",
+        "--only", "playback", "dispatch", "layers", "--output", str(output),
+    ])
+    main()
+    written = json.loads(output.read_text())
+    assert set(written) == {"meta", "playback", "dispatch", "layers"}
+    assert written["playback"]["frames"] == 30
+
+
+@pytest.mark.parametrize("suite", ["send_action", "connect"])
+def test_bench_bus_suites_run_on_the_simulated_bus(suite, tmp_path, monkeypatch):
+    output = tmp_path / "bench.json"
+    monkeypatch.setattr(sys, "argv", ["lelamp.bench", "--frames", "30", "--only", suite, "--output", str(output)])
+    main()
+    assert suite in json.loads(output.read_text())
+
+
+def test_bench_leaves_the_shipped_recordings_alone(recordings):
+    before = sorted(os.listdir(RECORDINGS))
+    bench_recording_load(LAMP_ID, repeats=1, recordings_dir=recordings)
+    bench_layers(LAMP_ID, frames=5, counts=(1,), recordings_dir=recordings)
+    assert sorted(os.listdir(RECORDINGS)) == before
+    assert any(name.endswith(".bank") for name in os.listdir(recordings))
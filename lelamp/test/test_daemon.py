@@ -0,0 +1,131 @@
+import os
+import socket
+import stat
+import struct
+
+import numpy as np
+import pytest
+
+from lelamp.daemon import LampClient, LampDaemon, LampError, default_socket_path
+from lelamp.daemon import protocol
+from lelamp.daemon.protocol import Op, ProtocolError, Status
+from lelamp.service import EventDiscarded
+from lelamp.service.motors.recording_format import CsvFileWriter
+
+LAMP_ID = "lamp"
+PORT = "sim://?latency_ms=0"
+JOINTS = ["base_yaw.pos", "base_pitch.pos", "elbow_pitch.pos", "wrist_roll.pos", "wrist_pitch.pos"]
+
+
+def _roundtrip_frame(frame: bytes):
+    sender, receiver = socket.socketpair()
+    try:
+        sender.sendall(frame)
+        sender.shutdown(socket.SHUT_WR)
+        return protocol.read_frame(receiver)
+    finally:
+        sender.close()
+        receiver.close()
+
+
+def test_frame_header_is_op_status_request_id_and_length():
+    frame = protocol.encode_frame(Op.PLAY, Status.PENDING, 0xBEEF, b"nod")
+    assert frame == struct.pack("<BBHI", 0x10, 2, 0xBEEF, 3) + b"nod"
+    assert protocol.HEADER.size == 8
+    assert _roundtrip_frame(frame) == (Op.PLAY, Status.PENDING, 0xBEEF, b"nod")
+    assert _roundtrip_frame(protocol.encode_frame(Op.PING, Status.OK, 7)) == (Op.PING, Status.OK, 7, b"")
+
+
+def test_read_frame_rejects_oversized_and_truncated_frames():
+    with pytest.raises(ProtocolError):
+        _roundtrip_frame(protocol.HEADER.pack(Op.PING, Status.OK, 0, protocol.MAX_PAYLOAD + 1))
+    with pytest.raises(ProtocolError):
+        _roundtrip_frame(protocol.encode_frame(Op.PLAY, Status.OK, 0, b"nod")[:-1])
+
+
+def test_payloads_round_trip():
+    assert protocol.decode_play(protocol.encode_play("héllo", 1.5, 1, True)) == ("héllo", 1.5, 1, True)
+    assert protocol.decode_play(protocol.encode_play("nod", 0.5, 2, False)) == ("nod", 0.5, 2, False)
+
+    positions, duration = protocol.decode_pose(protocol.encode_pose([1.0, -2.5, 3.25], 0.75))
+    np.testing.assert_array_equal(positions, [1.0, -2.5, 3.25])
+    assert duration == 0.75
+
+    names, present, goal = protocol.decode_telemetry(protocol.encode_telemetry(["a", "b"], [1.0, 2.0], [3.0, 4.0]))
+    assert names == ["a", "b"]
+    np.testing.assert_array_equal(present, [1.0, 2.0])
+    np.testing.assert_array_equal(goal, [3.0, 4.0])
+    assert protocol.decode_telemetry(protocol.encode_telemetry([], [], []))[0] == []
+
+    colors = [(255, 0, 10), (1, 2, 3)]
+    assert protocol.decode_colors(protocol.encode_colors(colors)) == colors
+
+
+def _write_recording(recordings_dir, name: str, positions: np.ndarray, fps: int = 30):
+    writer = CsvFileWriter(os.path.join(recordings_dir, f"{name}_{LAMP_ID}.csv"), JOINTS)
+    writer.append(np.arange(len(positions), dtype=np.float32) / fps, positions.astype(np.float32))
+    writer.close()
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    recordings_dir = tmp_path / "recordings"
+    recordings_dir.mkdir()
+    _write_recording(str(recordings_dir), "idle", np.zeros((30, len(JOINTS))))
+    _write_recording(str(recordings_dir), "nod", np.linspace(0.0, 10.0, 15)[:, None].repeat(len(JOINTS), axis=1))
+    daemon = LampDaemon(PORT, LAMP_ID, socket_path=str(tmp_path / "lamp.sock"), rgb=False, socket_mode=0o600,
+                        duration=0.1, recordings_dir=str(recordings_dir))
+    daemon.start()
+    yield daemon
+    daemon.stop()
+
+
+def test_default_socket_path_is_per_lamp():
+    assert default_socket_path("lamp") == "/tmp/lelamp-lamp.sock"
+
+
+def test_socket_is_created_with_the_configured_mode_and_removed_on_stop(daemon):
+    assert stat.S_ISSOCK(os.stat(daemon.socket_path).st_mode)
+    assert stat.S_IMODE(os.stat(daemon.socket_path).st_mode) == 0o600
+    assert LampClient.available(daemon.socket_path)
+    daemon.stop()
+    assert not os.path.exists(daemon.socket_path)
+    assert not LampClient.available(daemon.socket_path)
+
+
+def test_a_second_daemon_refuses_a_live_socket_and_claims_a_stale_one(daemon, tmp_path):
+    with pytest.raises(RuntimeError):
+        LampDaemon(PORT, LAMP_ID, socket_path=daemon.socket_path, rgb=False)._claim_socket()
+
+    stale = str(tmp_path / "stale.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(stale)
+    listener.close()
+    LampDaemon(PORT, LAMP_ID, socket_path=stale, rgb=False)._claim_socket()
+    assert not os.path.exists(stale)
+
+
+def test_client_commands_reach_the_daemon(daemon):
+    with LampClient(daemon.socket_path) as lamp:
+        lamp.ping()
+        assert sorted(lamp.recordings()) == ["idle", "nod"]
+        assert lamp.play("nod", wait=True, timeout=5.0)
+        assert not lamp.play("missing")
+        present, goal = lamp.telemetry()
+        assert list(present) == [joint.removesuffix(".pos") for joint in JOINTS]
+        assert lamp.stats()["animation"]["dispatched"] >= 2
+
+
+def test_discarded_events_surface_as_event_discarded(daemon):
+    daemon.animation_service.stop()
+    with LampClient(daemon.socket_path) as lamp:
+        with pytest.raises(EventDiscarded):
+            lamp.pose([0.0] * len(JOINTS), duration=0.1)
+        # The connection stays usable after a discarded request
+        lamp.ping()
+
+
+def test_led_commands_fail_cleanly_without_the_leds(daemon):
+    with LampClient(daemon.socket_path) as lamp:
+        with pytest.raises(LampError, match="LEDs"):
+            lamp.solid((0, 0, 0))
@@ -0,0 +1,124 @@
+import time
+
+import numpy as np
+import pytest
+
+from lelamp.follower import LeLampFollower, LeLampFollowerConfig
+from lelamp.follower.telemetry import TelemetrySnapshot
+
+# An instant simulated bus, so the tests only see the writes and reads themselves
+PORT = "sim://?latency_ms=0"
+_GOAL_POSITION = 42
+
+
+def _follower(tmp_path, **config) -> LeLampFollower:
+    robot = LeLampFollower(LeLampFollowerConfig(port=PORT, id="lamp", calibration_dir=tmp_path, **config))
+    robot.connect(calibrate=False)
+    return robot
+
+
+def _goal_registers(robot: LeLampFollower) -> list:
+    return [robot.bus.servos[m.id].read(_GOAL_POSITION, 2) for m in robot.bus.motors.values()]
+
+
+@pytest.fixture
+def robot(tmp_path):
+    robot = _follower(tmp_path, goal_deadband=0.5)
+    yield robot
+    robot.disconnect()
+
+
+def test_deadband_skips_writes_that_stay_inside_it(robot):
+    motors = len(robot.bus.motors)
+    robot.send_positions(np.zeros(motors, dtype=np.float32))
+    assert robot.write_stats()["goal_writes"] == 1
+    written = _goal_registers(robot)
+
+    # Every joint inside the band: no bus write at all, and the held goals are reported back
+    sent = robot.send_action({f"{motor}.pos": 0.3 for motor in robot.bus.motors})
+    assert sent == {f"{motor}.pos": 0.0 for motor in robot.bus.motors}
+    stats = robot.write_stats()
+    assert (stats["goal_writes"], stats["goal_writes_skipped"], stats["joint_writes_skipped"]) == (1, 1, motors)
+    assert _goal_registers(robot) == written
+
+    # One joint leaves it: only that one is written
+    positions = np.zeros(motors, dtype=np.float32)
+    positions[2] = 10.0
+    robot.send_positions(positions)
+    stats = robot.write_stats()
+    assert (stats["goal_writes"], stats["joint_writes_skipped"]) == (2, 2 * motors - 1)
+    changed = [index for index, (old, new) in enumerate(zip(written, _goal_registers(robot))) if old != new]
+    assert changed == [2]
+
+
+def test_deadband_measures_from_the_last_written_goal(robot):
+    motors = len(robot.bus.motors)
+    robot.send_positions(np.zeros(motors, dtype=np.float32))
+    # Creeping by less than the band every frame still writes once the total drift leaves it
+    for position in (0.3, 0.6):
+        robot.send_positions(np.full(motors, position, dtype=np.float32))
+    stats = robot.write_stats()
+    assert (stats["goal_writes"], stats["goal_writes_skipped"]) == (2, 1)
+
+
+def test_no_deadband_writes_every_frame(tmp_path):
+    robot = _follower(tmp_path)
+    try:
+        for _ in range(3):
+            robot.send_positions(np.zeros(len(robot.bus.motors), dtype=np.float32))
+        assert robot.write_stats()["goal_writes"] == 3
+        assert robot.write_stats()["goal_writes_skipped"] == 0
+    finally:
+        robot.disconnect()
+
+
+def test_clamp_uses_fresh_telemetry_and_reads_the_bus_when_it_is_stale(tmp_path):
+    robot = _follower(tmp_path, max_relative_target=10.0, telemetry_hz=1.0, telemetry_max_age=0.5)
+    try:
+        # Take the background thread out so only the clamp reads
+        robot.telemetry.stop()
+        telemetry = robot.telemetry
+        goal = {f"{motor}.pos": 0.0 for motor in robot.bus.motors}
+
+        # A fresh snapshot is trusted as is, without touching the bus
+        telemetry._snapshot = TelemetrySnapshot(time.perf_counter(), {motor: 50.0 for motor in robot.bus.motors})
+        reads, transactions = telemetry.reads, robot.bus.transactions
+        assert robot.send_action(goal) == {key: 40.0 for key in goal}
+        assert telemetry.reads == reads
+        assert robot.bus.transactions == transactions + 1
+
+        # Past the max age it falls back to a blocking read of where the motors really are
+        telemetry._snapshot = TelemetrySnapshot(time.perf_counter() - 1.0, {motor: 50.0 for motor in robot.bus.motors})
+        sent = robot.send_action(goal)
+        assert telemetry.reads == reads + 1
+        assert all(abs(val) < 1.0 for val in sent.values())
+        assert telemetry.snapshot().age < 0.5
+    finally:
+        robot.disconnect()
+
+
+def test_fast_connect_writes_only_the_stale_configuration_registers(tmp_path):
+    robot = _follower(tmp_path, fast_connect=True)
+    try:
+        # Fresh servos: everything configure() sets is still at its power-on value
+        assert robot.config_writes > 0
+        assert robot._verified_fingerprint is not None
+        assert list(tmp_path.iterdir()) == []
+        robot.disconnect()
+
+        # Nothing drifted: no writes, and the motors limp from the disconnect get their torque back in one broadcast
+        robot.connect(calibrate=False)
+        assert robot.config_writes == 0
+        assert set(robot.bus.sync_read("Torque_Enable", normalize=False).values()) == {1}
+        robot.disconnect()
+
+        motor = list(robot.bus.motors)[2]
+        robot.bus.connect()
+        robot.bus.write("P_Coefficient", motor, 32, normalize=False)
+        robot.bus.disconnect(disable_torque=False)
+        robot.connect(calibrate=False)
+        assert robot.config_writes == 1
+        assert robot.bus.read("P_Coefficient", motor, normalize=False) == 16
+    finally:
+        if robot.is_connected:
+            robot.disconnect()
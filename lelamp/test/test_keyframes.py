@@ -0,0 +1,128 @@
+import numpy as np
+
+from lelamp.service.motors.keyframes import compress_recording, interpolate_keyframes, select_keyframes
+from lelamp.service.motors.motion_profile import MAX_GOAL_VELOCITY, build_motion_profile, servo_ramp
+
+
+def _gesture(frames: int = 120, fps: float = 30.0):
+    """Half a second still, a smooth swing, then still again"""
+    timestamps = np.arange(frames, dtype=np.float32) / fps
+    swing = np.clip((timestamps - 0.5) / 2.0, 0.0, 1.0)
+    positions = np.stack([
+        40.0 * np.sin(np.pi * swing),
+        -20.0 * swing,
+        np.zeros(frames),
+    ], axis=1).astype(np.float32)
+    return timestamps, positions
+
+
+def _rebuild(timestamps, key_times, key_positions):
+    return np.stack([np.interp(timestamps, key_times, key_positions[:, joint])
+                     for joint in range(key_positions.shape[1])], axis=1)
+
+
+def test_select_keyframes_stays_within_tolerance():
+    _, positions = _gesture()
+    keyframes = select_keyframes(positions, 0.5)
+    assert keyframes[0] == 0 and keyframes[-1] == len(positions) - 1
+    assert len(keyframes) < len(positions) // 3
+    rebuilt = interpolate_keyframes(keyframes, positions[keyframes], len(positions))
+    assert np.abs(rebuilt - positions).max() <= 0.5 + 1e-5
+
+
+def test_select_keyframes_keeps_required_frames_and_limits_gaps():
+    _, positions = _gesture()
+    keyframes = select_keyframes(positions, 5.0, max_gap=10, required=[33])
+    assert 33 in keyframes
+    assert np.diff(keyframes).max() <= 10
+
+
+def test_select_keyframes_of_a_straight_line_is_its_ends():
+    line = np.linspace(0, 10, 50, dtype=np.float32)[:, None].repeat(2, axis=1)
+    assert select_keyframes(line, 0.1).tolist() == [0, 49]
+    assert select_keyframes(line[:2], 0.1).tolist() == [0, 1]
+
+
+def test_compress_recording_bounds_the_error_and_flattens_stillness():
+    timestamps, positions = _gesture()
+    # Sensor noise while the lamp holds still
+    noisy = positions + np.random.default_rng(0).uniform(-0.2, 0.2, positions.shape).astype(np.float32)
+    key_times, key_positions = compress_recording(timestamps, noisy, tolerance=0.5)
+
+    assert len(key_times) < len(timestamps) // 3
+    assert np.all(np.diff(key_times) >= 0)
+    assert np.abs(_rebuild(timestamps, key_times, key_positions) - noisy).max() <= 0.5 + 1e-4
+    # The opening hold plays back as identical rows
+    assert np.array_equal(key_positions[0], key_positions[1])
+
+
+def test_motion_profile_commands_reach_each_keyframe():
+    _, positions = _gesture()
+    steps_per_unit = np.full(3, 20.0)
+    profile = build_motion_profile(positions, 30, steps_per_unit, tolerance=1.0, max_interval=0.5)
+
+    sent_at = np.flatnonzero(profile.command_at >= 0)
+    assert sent_at[0] == 0
+    assert profile.commands == len(sent_at) == len(profile.keyframes) - 1
+    np.testing.assert_array_equal(profile.positions, positions[profile.keyframes[1:]])
+    assert np.all(profile.velocities >= 1) and np.all(profile.accelerations >= 1)
+    assert profile.polyline_error.max() <= 1.0 + 1e-5
+    # The servo's ramps lag the straight lines at the start of each segment and catch up at the end
+    assert np.all(profile.max_error >= profile.polyline_error - 1e-5)
+    assert profile.stats(30)["commands_per_s"] < 30
+
+
+def test_servo_ramp_is_a_trapezoid_onto_the_goal():
+    offset, rest, velocity, acceleration = np.array([-30.0]), np.zeros(1), np.array([40.0]), np.array([160.0])
+    # 0.25 s up to speed, 0.5 s cruising, 0.25 s braking
+    t = np.array([0.0, 0.25, 0.5, 0.75, 1.0, 2.0])[:, None]
+    position, speed = servo_ramp(t, offset, rest, velocity, acceleration)
+    np.testing.assert_allclose(position[:, 0], [0.0, -5.0, -15.0, -25.0, -30.0, -30.0])
+    np.testing.assert_allclose(speed[:, 0], [0.0, -40.0, -40.0, -40.0, 0.0, 0.0], atol=1e-9)
+    # Too short to reach cruise speed: accelerate halfway, then brake
+    position, _ = servo_ramp(np.array([0.25, 0.5, 1.0])[:, None], np.array([10.0]), rest, velocity, acceleration)
+    np.testing.assert_allclose(position[:, 0], [5.0, 10.0, 10.0])
+
+
+def test_servo_ramp_carries_the_speed_it_starts_with():
+    velocity, acceleration = np.array([40.0]), np.array([160.0])
+    t = np.array([0.25, 0.5])[:, None]
+    # Already at cruise speed towards the goal: cruises until it has to brake
+    position, _ = servo_ramp(t, np.array([20.0]), np.array([40.0]), velocity, acceleration)
+    np.testing.assert_allclose(position[:, 0], [10.0, 18.75])
+    # Moving away at full speed: a quarter second to turn around, back where it started after half a second
+    position, speed = servo_ramp(t, np.array([20.0]), np.array([-40.0]), velocity, acceleration)
+    np.testing.assert_allclose(position[:, 0], [-5.0, 0.0])
+    np.testing.assert_allclose(speed[:, 0], [0.0, 40.0])
+
+
+def test_motion_profile_reports_servos_too_slow_to_follow():
+    _, positions = _gesture()
+    # So many steps per unit that the swing needs more than the fastest Goal_Velocity
+    steps_per_unit = np.full(3, MAX_GOAL_VELOCITY / 4.0)
+    profile = build_motion_profile(positions, 30, steps_per_unit, tolerance=1.0, max_interval=0.5)
+
+    assert profile.velocities.max() == MAX_GOAL_VELOCITY
+    assert profile.polyline_error.max() <= 1.0 + 1e-5
+    assert profile.max_error[0] > 5.0
+
+
+def test_send_profile_writes_every_register_of_the_block():
+    from lelamp.follower import LeLampFollower, LeLampFollowerConfig
+
+    robot = LeLampFollower(LeLampFollowerConfig(port="sim://?latency_ms=0", id="profile-test"))
+    robot.connect(calibrate=False)
+    try:
+        motors = list(robot.bus.motors)
+        velocities = np.arange(100, 100 + len(motors), dtype=np.int32)
+        accelerations = np.arange(10, 10 + len(motors), dtype=np.int32)
+        robot.send_profile(np.zeros(len(motors), dtype=np.float32), velocities, accelerations)
+        goal = robot.bus._unnormalize({robot.bus.motors[motor].id: 0.0 for motor in motors})
+        for index, motor in enumerate(motors):
+            servo = robot.bus.servos[robot.bus.motors[motor].id]
+            assert servo.read(41, 1) == accelerations[index]
+            assert servo.read(42, 2) == goal[robot.bus.motors[motor].id]
+            assert servo.read(44, 2) == 0
+            assert servo.read(46, 2) == velocities[index]
+    finally:
+        robot.disconnect()
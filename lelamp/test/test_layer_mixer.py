@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from lelamp.service.motors.layer_mixer import LayerMixer
+
+
+def _constant(value: float, frames: int = 10, joints: int = 3) -> np.ndarray:
+    return np.full((frames, joints), value, dtype=np.float32)
+
+
+def _mix(mixer: LayerMixer, base: np.ndarray, frames: int) -> np.ndarray:
+    return np.array([mixer.mix(base).copy() for _ in range(frames)])
+
+
+def test_no_layers_passes_the_base_through():
+    mixer = LayerMixer(3)
+    base = np.array([1.0, 2.0, 3.0], dtype=np.float32)
+    np.testing.assert_array_equal(mixer.mix(base), base)
+
+
+def test_gesture_layer_fades_in_then_ends_with_its_recording():
+    mixer = LayerMixer(3)
+    mixer.add("nod", _constant(10.0), fade_in=4, curve="linear")
+    out = _mix(mixer, np.zeros(3, dtype=np.float32), 12)[:, 0]
+    np.testing.assert_allclose(out[:4], [2.5, 5.0, 7.5, 10.0])
+    np.testing.assert_allclose(out[4:10], 10.0)
+    np.testing.assert_allclose(out[10:], 0.0)
+    assert mixer.active == 0
+
+
+def test_eased_fade_is_smoothstep():
+    mixer = LayerMixer(1)
+    mixer.add("nod", _constant(1.0, joints=1), fade_in=4, curve="ease")
+    out = _mix(mixer, np.zeros(1, dtype=np.float32), 4)[:, 0]
+    envelope = np.array([0.25, 0.5, 0.75, 1.0])
+    np.testing.assert_allclose(out, envelope * envelope * (3 - 2 * envelope), atol=1e-6)
+
+
+def test_gesture_layers_stack_in_order_and_additive_layers_add():
+    mixer = LayerMixer(3)
+    mixer.add("lean", _constant(10.0), weight=0.5, loop=True)
+    mixer.add("shy", _constant(20.0), weight=0.5, loop=True)
+    bob = np.array([[0.0] * 3, [1.0] * 3, [2.0] * 3], dtype=np.float32)
+    mixer.add("bob", bob + 7.0, additive=True, loop=True)
+
+    out = _mix(mixer, np.zeros(3, dtype=np.float32), 4)[:, 0]
+    # lean over the base: 5, shy over that: 12.5, plus the bob relative to its first frame
+    np.testing.assert_allclose(out, [12.5, 13.5, 14.5, 12.5])
+
+
+def test_removing_a_looping_layer_fades_it_out():
+    mixer = LayerMixer(3)
+    mixer.add("bob", _constant(10.0), loop=True, fade_out=2, curve="linear")
+    _mix(mixer, np.zeros(3, dtype=np.float32), 3)
+    assert mixer.remove("bob")
+    out = _mix(mixer, np.zeros(3, dtype=np.float32), 3)[:, 0]
+    np.testing.assert_allclose(out, [10.0, 5.0, 0.0])
+    assert mixer.active == 0
+    assert not mixer.remove("bob")
+
+
+def test_a_layer_of_the_same_name_is_replaced():
+    mixer = LayerMixer(3, capacity=2)
+    mixer.add("nod", _constant(10.0), loop=True)
+    mixer.add("nod", _constant(20.0), loop=True)
+    assert mixer.active == 1
+    np.testing.assert_allclose(mixer.mix(np.zeros(3, dtype=np.float32)), 20.0)
+
+
+def test_capacity_and_shape_are_checked():
+    mixer = LayerMixer(3, capacity=1)
+    mixer.add("a", _constant(1.0))
+    with pytest.raises(ValueError):
+        mixer.add("b", _constant(1.0))
+    with pytest.raises(ValueError):
+        LayerMixer(3).add("a", _constant(1.0, joints=2))
+    with pytest.raises(ValueError):
+        LayerMixer(3).add("a", _constant(1.0), curve="cubic")
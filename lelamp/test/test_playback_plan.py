@@ -0,0 +1,58 @@
+import numpy as np
+
+from lelamp.service.motors.playback_plan import PlaybackPlan, compile_plan, still_ends
+
+
+def _actions(frames: int = 10, joints: int = 3) -> np.ndarray:
+    return (np.arange(frames * joints, dtype=np.float32).reshape(frames, joints) + 10.0)
+
+
+def test_compile_plan_without_start_pose_is_the_recording():
+    actions = _actions()
+    plan = compile_plan("nod", actions)
+    assert plan.length == len(actions)
+    np.testing.assert_array_equal(plan.frames, actions)
+    assert not plan.loops
+
+
+def test_compile_plan_ramps_in_and_out():
+    actions = _actions()
+    start = np.zeros(3, dtype=np.float32)
+    rest = np.full(3, -5.0, dtype=np.float32)
+    plan = compile_plan("nod", actions, start, 4, return_pose=rest, return_frames=5)
+
+    assert plan.length == 4 + len(actions) + 5
+    np.testing.assert_allclose(plan.frames[0], start)
+    # The ramp stops one step short of the first frame, which follows it
+    np.testing.assert_allclose(plan.frames[2], actions[0] * 0.5)
+    np.testing.assert_array_equal(plan.frames[4:4 + len(actions)], actions)
+    np.testing.assert_allclose(plan.frames[4 + len(actions)], actions[-1])
+    assert np.all(np.abs(plan.frames[-1] - rest) < np.abs(actions[-1] - rest))
+
+
+def test_looping_plan_wraps_after_the_lead_in_and_never_blends_out():
+    actions = _actions()
+    plan = compile_plan("idle", actions, np.zeros(3, dtype=np.float32), 6,
+                        return_pose=np.zeros(3, dtype=np.float32), return_frames=5, loop=True)
+    assert plan.loops
+    assert plan.loop_start == 6
+    assert plan.length == 6 + len(actions)
+
+
+def test_still_marks_rows_repeating_the_previous_one():
+    frames = np.array([[0, 0], [0, 0], [1, 0], [1, 0], [1, 0], [0, 0]], dtype=np.float32)
+    plan = PlaybackPlan("still", frames)
+    assert plan.still.tolist() == [False, True, False, True, True, False]
+
+
+def test_still_ends_trims_to_one_still_frame_either_side():
+    frames = np.zeros((12, 2), dtype=np.float32)
+    frames[4:8, 0] = [2.0, 4.0, 4.0, 2.0]
+    frames[8:] = 0.1
+    assert still_ends(frames, 0.5) == (3, 8)
+
+
+def test_still_ends_keeps_a_motionless_recording_whole():
+    frames = np.full((5, 2), 3.0, dtype=np.float32)
+    assert still_ends(frames, 0.5) == (0, 4)
+    assert still_ends(frames[:1], 0.5) == (0, 0)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from lelamp.service.motors.recording_cache import RecordingCache
+
+# 100 frames of 5 float32 joints: 2000 bytes per entry
+FRAMES = np.zeros((100, 5), dtype=np.float32)
+
+
+def _key(name: str, speed: float = 1.0):
+    return (name, 30, speed)
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = RecordingCache(max_bytes=3 * FRAMES.nbytes)
+    for name in ("a", "b", "c"):
+        cache.put(_key(name), FRAMES.copy(), report=name)
+    assert cache.get(_key("a")) is not None
+
+    cache.put(_key("d"), FRAMES.copy())
+    assert cache.keys() == [_key("c"), _key("a"), _key("d")]
+    assert cache.report(_key("b")) is None
+    stats = cache.stats()
+    assert (stats["bytes"], stats["evictions"], stats["evicted_bytes"]) == (3 * FRAMES.nbytes, 1, FRAMES.nbytes)
+
+
+def test_pinned_recordings_stay_resident_in_every_variant():
+    cache = RecordingCache(max_bytes=3 * FRAMES.nbytes, pinned=["idle"])
+    cache.put(_key("idle"), FRAMES.copy())
+    cache.put(_key("idle", 1.5), FRAMES.copy())
+    for name in ("a", "b", "c"):
+        cache.put(_key(name), FRAMES.copy())
+
+    assert _key("idle") in cache and _key("idle", 1.5) in cache
+    assert cache.keys()[-1] == _key("c")
+    assert len(cache) == 3
+
+    # Once unpinned they age out like any other entry
+    cache.unpin("idle")
+    cache.put(_key("d"), FRAMES.copy())
+    assert _key("idle") not in cache
+    assert cache.pinned == []
+
+
+def test_pinning_more_than_fits_leaves_no_room_for_the_rest():
+    cache = RecordingCache(max_bytes=FRAMES.nbytes, pinned=["idle", "sleep"])
+    cache.put(_key("idle"), FRAMES.copy())
+    cache.put(_key("sleep"), FRAMES.copy())
+    cache.put(_key("a"), FRAMES.copy())
+    assert cache.keys() == [_key("idle"), _key("sleep")]
+    assert cache.nbytes == 2 * FRAMES.nbytes
+
+
+def test_replacing_and_discarding_keep_the_byte_count():
+    cache = RecordingCache(max_bytes=10 * FRAMES.nbytes)
+    cache.put(_key("a"), FRAMES.copy())
+    cache.put(_key("a"), np.zeros((50, 5), dtype=np.float32))
+    assert cache.nbytes == FRAMES.nbytes // 2
+    cache.put(_key("a", 2.0), FRAMES.copy())
+    cache.discard(["a"])
+    assert (len(cache), cache.nbytes) == (0, 0)
+    assert cache.get(_key("a")) is None
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+
+from lelamp.service.motors.recording_catalog import RecordingCatalog
+from lelamp.service.motors.recording_format import CsvFileWriter
+
+JOINTS = ["base_yaw.pos", "base_pitch.pos"]
+
+
+def _write(path: str, frames: int):
+    writer = CsvFileWriter(path, JOINTS)
+    writer.append(np.arange(frames, dtype=np.float32) / 30.0, np.zeros((frames, len(JOINTS)), dtype=np.float32))
+    writer.close()
+
+
+def _rewrite_in_place(path: str, frames: int):
+    """Overwrite the file itself, as an editor saving over it would, so the directory mtime stays put"""
+    with open(path, 'w') as csvfile:
+        csvfile.write(",".join(["timestamp", *JOINTS]) + "\n")
+        for frame in range(frames):
+            csvfile.write(f"{frame / 30.0},0.0,0.0\n")
+
+
+def test_catalog_lists_added_and_removed_recordings(tmp_path):
+    _write(str(tmp_path / "nod_lamp.csv"), 10)
+    catalog = RecordingCatalog(str(tmp_path), "lamp")
+    assert catalog.names() == ["nod"]
+    assert os.path.exists(catalog.catalog_path)
+
+    _write(str(tmp_path / "shy_lamp.csv"), 5)
+    assert catalog.names() == ["nod", "shy"]
+    os.remove(tmp_path / "nod_lamp.csv")
+    assert catalog.names() == ["shy"]
+
+
+def test_catalog_notices_a_recording_rewritten_in_place(tmp_path):
+    path = str(tmp_path / "nod_lamp.csv")
+    _write(path, 10)
+    catalog = RecordingCatalog(str(tmp_path), "lamp")
+    assert catalog.get("nod")["frames"] == 10
+
+    dir_mtime_ns = os.stat(tmp_path).st_mtime_ns
+    _rewrite_in_place(path, 25)
+    os.utime(tmp_path, ns=(dir_mtime_ns, dir_mtime_ns))
+    assert catalog.get("nod")["frames"] == 25
+
+    _rewrite_in_place(path, 40)
+    os.utime(tmp_path, ns=(dir_mtime_ns, dir_mtime_ns))
+    assert catalog.entries()["nod"]["frames"] == 40
+
+
+def test_catalog_is_reused_across_instances(tmp_path):
+    _write(str(tmp_path / "nod_lamp.csv"), 10)
+    assert RecordingCatalog(str(tmp_path), "lamp").refresh() == ["nod"]
+    reopened = RecordingCatalog(str(tmp_path), "lamp")
+    assert reopened.refresh() == []
+    assert reopened.get("nod")["frames"] == 10
+    assert reopened.joints == JOINTS
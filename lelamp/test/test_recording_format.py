@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import pytest
+
+from lelamp.service.motors.recording_bank import RecordingBank
+from lelamp.service.motors.recording_format import (
+    CsvFileWriter, RecFileWriter, find_recordings, read_recording, split_recording_filename,
+)
+
+JOINTS = ["base_yaw.pos", "base_pitch.pos", "elbow_pitch.pos"]
+
+
+def _samples(frames: int = 20):
+    timestamps = np.arange(frames, dtype=np.float32) / 30.0
+    positions = np.stack([np.sin(timestamps * (joint + 1)) * 40.0 for joint in range(len(JOINTS))], axis=1)
+    return timestamps, positions.astype(np.float32)
+
+
+def _write(writer_class, path: str, timestamps, positions, metadata=None):
+    writer = writer_class(path, JOINTS, metadata)
+    writer.append(timestamps[:7], positions[:7])
+    writer.append(timestamps[7:], positions[7:])
+    writer.close()
+    return writer
+
+
+@pytest.mark.parametrize("writer_class, extension", [(RecFileWriter, "rec"), (CsvFileWriter, "csv")])
+def test_written_recordings_read_back(tmp_path, writer_class, extension):
+    timestamps, positions = _samples()
+    path = str(tmp_path / f"nod_lamp.{extension}")
+    writer = _write(writer_class, path, timestamps, positions, {"lamp_id": "lamp"})
+
+    assert writer.rows == len(timestamps)
+    assert not os.path.exists(f"{path}.part")
+    joints, read_timestamps, read_positions = read_recording(path)
+    assert joints == JOINTS
+    np.testing.assert_allclose(read_timestamps, timestamps, atol=1e-5)
+    np.testing.assert_allclose(read_positions, positions, atol=1e-5)
+
+
+def test_reading_reorders_joints(tmp_path):
+    timestamps, positions = _samples()
+    path = str(tmp_path / "nod_lamp.rec")
+    _write(RecFileWriter, path, timestamps, positions)
+
+    joints, _, reordered = read_recording(path, JOINTS[::-1])
+    assert joints == JOINTS[::-1]
+    np.testing.assert_array_equal(reordered, positions[:, ::-1])
+    with pytest.raises(ValueError):
+        read_recording(path, ["wrist_roll.pos"])
+
+
+def test_find_recordings_prefers_the_compact_format(tmp_path, caplog):
+    timestamps, positions = _samples()
+    _write(CsvFileWriter, str(tmp_path / "nod_lamp.csv"), timestamps, positions)
+    _write(RecFileWriter, str(tmp_path / "nod_lamp.rec"), timestamps, positions)
+    _write(CsvFileWriter, str(tmp_path / "shy_lamp.csv"), timestamps, positions)
+    _write(CsvFileWriter, str(tmp_path / "shy_other.csv"), timestamps, positions)
+
+    with caplog.at_level("INFO", logger="lelamp.service.motors.recording_format"):
+        found = find_recordings(str(tmp_path), "lamp")
+    assert sorted(found) == ["nod", "shy"]
+    assert found["nod"].endswith(".rec")
+    assert [record.getMessage() for record in caplog.records] == [
+        "Recording nod exists as nod_lamp.rec and nod_lamp.csv, using nod_lamp.rec"
+    ]
+    assert split_recording_filename("wake_up_lamp.rec", ["_lamp.rec"]) == "wake_up"
+    assert split_recording_filename("wake_up_lamp.bank", ["_lamp.rec"]) is None
+
+
+def test_bank_maps_recordings_and_rebuilds_when_a_source_changes(tmp_path):
+    timestamps, positions = _samples()
+    _write(RecFileWriter, str(tmp_path / "nod_lamp.rec"), timestamps, positions)
+    _write(RecFileWriter, str(tmp_path / "shy_lamp.rec"), timestamps, positions * 0.5)
+
+    bank = RecordingBank(str(tmp_path), "lamp").load()
+    assert bank.names() == ["nod", "shy"]
+    assert bank.joints == JOINTS
+    np.testing.assert_array_equal(bank.get("shy"), positions * 0.5)
+    assert not bank.get("nod").flags.writeable
+    assert not bank.refresh()
+
+    # Rewritten elsewhere, e.g. by the recorder
+    os.remove(tmp_path / "shy_lamp.rec")
+    _write(RecFileWriter, str(tmp_path / "shy_lamp.rec"), timestamps, positions * 0.25)
+    assert bank.is_stale()
+    assert bank.refresh()
+    np.testing.assert_array_equal(bank.get("shy"), positions * 0.25)
+
+
+def test_bank_does_not_reuse_arrays_from_an_older_mapping(tmp_path):
+    timestamps, positions = _samples()
+    _write(RecFileWriter, str(tmp_path / "nod_lamp.rec"), timestamps, positions)
+    ours = RecordingBank(str(tmp_path), "lamp").load()
+
+    # Another process picks up a re-recorded nod and rebuilds the shared bank file
+    os.remove(tmp_path / "nod_lamp.rec")
+    _write(RecFileWriter, str(tmp_path / "nod_lamp.rec"), timestamps, positions + 1.0)
+    RecordingBank(str(tmp_path), "lamp").load()
+
+    ours.build()
+    ours.load()
+    np.testing.assert_array_equal(ours.get("nod"), positions + 1.0)
+    assert not ours.is_stale()
+
+
+def test_banks_of_different_tolerances_do_not_invalidate_each_other(tmp_path):
+    timestamps, positions = _samples(60)
+    _write(RecFileWriter, str(tmp_path / "nod_lamp.rec"), timestamps, positions)
+
+    lossless = RecordingBank(str(tmp_path), "lamp").load()
+    keyframes = RecordingBank(str(tmp_path), "lamp", keyframe_tolerance=0.5).load()
+    assert lossless.bank_path != keyframes.bank_path
+    assert not lossless.is_stale() and not keyframes.is_stale()
+    assert len(keyframes.get("nod")) < len(lossless.get("nod"))
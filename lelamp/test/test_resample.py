@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from lelamp.service.motors.resample import resample
+
+
+def _ramp(seconds: float = 1.0, rate: float = 50.0):
+    timestamps = np.arange(int(seconds * rate) + 1, dtype=np.float32) / rate
+    positions = np.stack([timestamps * 10.0, -timestamps * 20.0], axis=1).astype(np.float32)
+    return timestamps, positions
+
+
+def test_resample_onto_the_loop_rate_keeps_the_duration():
+    timestamps, positions = _ramp()
+    frames = resample(timestamps, positions, fps=30)
+    assert frames.dtype == np.float32
+    assert frames.shape == (31, 2)
+    np.testing.assert_allclose(frames[-1], positions[-1], atol=1e-4)
+    np.testing.assert_allclose(frames[:, 0], np.arange(31) / 30.0 * 10.0, atol=1e-4)
+
+
+@pytest.mark.parametrize("speed, expected_frames", [(2.0, 16), (0.5, 61)])
+def test_speed_changes_the_tempo(speed, expected_frames):
+    timestamps, positions = _ramp()
+    frames = resample(timestamps, positions, fps=30, speed=speed)
+    assert len(frames) == expected_frames
+    np.testing.assert_allclose(frames[0], positions[0])
+    np.testing.assert_allclose(frames[-1], positions[-1], atol=1e-4)
+
+
+def test_uneven_timestamps_are_interpolated():
+    # Keyframes: a hold, then a fast move
+    timestamps = np.array([0.0, 0.5, 0.6], dtype=np.float32)
+    positions = np.array([[0.0], [0.0], [30.0]], dtype=np.float32)
+    frames = resample(timestamps, positions, fps=10)
+    np.testing.assert_allclose(frames[:, 0], [0, 0, 0, 0, 0, 0, 30], atol=1e-4)
+
+
+def test_single_sample_and_bad_speed():
+    single = resample(np.zeros(1, dtype=np.float32), np.ones((1, 3)), fps=30)
+    assert single.shape == (1, 3) and single.dtype == np.float32
+    with pytest.raises(ValueError):
+        resample(*_ramp(), fps=30, speed=0.0)
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+
+from lelamp.service.rgb.effects import Effect, LedMatrix, create_effect
+from lelamp.service.rgb.rgb_service import RGBService
+from lelamp.sim import MemoryPixelStrip
+
+LEDS = 8
+
+
+class _CountingStrip(MemoryPixelStrip):
+    """Counts the pixel assignments, each of which is one ws2811_led_set call on the real strip"""
+
+    def __init__(self, num: int):
+        super().__init__(num)
+        self.assigned = 0
+
+    def __setitem__(self, pos, value):
+        self.assigned += len(value) if isinstance(pos, slice) else 1
+        super().__setitem__(pos, value)
+
+
+def _service(render_fps: int = 30):
+    strip = _CountingStrip(LEDS)
+    return RGBService(led_count=LEDS, strip=strip, render_fps=render_fps), strip
+
+
+def test_frames_are_packed_to_strip_words():
+    service, strip = _service()
+    service.handle_event("solid", (1, 2, 3))
+    assert strip.shown == [0x010203] * LEDS
+
+    service.handle_event("paint", [(255, 0, 0), 0x00FF00, (0, 0, 300)])
+    assert strip.shown[:3] == [0xFF0000, 0x00FF00, 0x0000FF]
+    assert strip.shown[3:] == [0x010203] * (LEDS - 3)
+
+
+def test_unchanged_frames_skip_the_show():
+    service, strip = _service()
+    service.handle_event("solid", (10, 20, 30))
+    service.handle_event("solid", (10, 20, 30))
+    service.handle_event("paint", [(10, 20, 30)] * LEDS)
+    assert (service.shows, service.skipped_shows, strip.show_count) == (1, 2, 1)
+
+
+def test_only_changed_pixels_are_assigned():
+    service, strip = _service()
+    service.handle_event("solid", (0, 0, 0))
+    assert strip.assigned == LEDS
+
+    service.handle_event("paint", [(0, 0, 0), (5, 5, 5), (0, 0, 0), (6, 6, 6)])
+    assert strip.assigned == LEDS + 2
+    assert strip.shown == [0, 0x050505, 0, 0x060606] + [0] * (LEDS - 4)
+
+
+def test_effects_must_render():
+    class Blank(Effect):
+        pass
+
+    with pytest.raises(TypeError):
+        Blank(LedMatrix(LEDS))
+    with pytest.raises(ValueError):
+        create_effect({"name": "strobe"}, LedMatrix(LEDS))
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_render_thread_pauses_while_preemption_is_requested():
+    service, strip = _service(render_fps=200)
+    service.start()
+    try:
+        service.dispatch("effect", {"name": "rainbow", "period": 0.5})
+        assert _wait_for(lambda: service.shows > 3)
+
+        service._preempt.set()
+        time.sleep(0.02)
+        paused = service.shows
+        time.sleep(0.1)
+        assert service.shows == paused
+
+        service._preempt.clear()
+        assert _wait_for(lambda: service.shows > paused)
+    finally:
+        service.stop()
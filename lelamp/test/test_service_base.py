@@ -0,0 +1,171 @@
+import asyncio
+import threading
+
+import pytest
+
+from lelamp.service import EventDiscarded, Priority, ServiceBase
+from lelamp.service.aio import threadsafe_future
+
+
+class _Recorder(ServiceBase):
+    """Records the events it handles; the first handled event blocks until `release` is set"""
+
+    def __init__(self, max_queue: int = 32):
+        super().__init__("recorder", max_queue)
+        self.handled = []
+        self.busy = threading.Event()
+        self.release = threading.Event()
+        self.preempted = None
+
+    def handle_event(self, event_type, payload):
+        if event_type == "block":
+            self.busy.set()
+            assert self.release.wait(timeout=5.0)
+            self.preempted = self.preempt_requested
+            return None
+        if event_type == "fail":
+            raise ValueError(payload)
+        self.handled.append((event_type, payload))
+        return payload
+
+
+@pytest.fixture
+def service():
+    service = _Recorder()
+    service.start()
+    yield service
+    service.release.set()
+    service.stop()
+
+
+def _hold(service: ServiceBase):
+    """Keep the worker busy so the next dispatches pile up in the queue"""
+    service.dispatch("block", None)
+    assert service.busy.wait(timeout=5.0)
+
+
+def _outcomes():
+    results = {}
+
+    def recorder(name):
+        return lambda result, error: results.__setitem__(name, error if error is not None else result)
+    return results, recorder
+
+
+def test_events_are_handled_by_priority_then_in_order(service):
+    _hold(service)
+    service.dispatch("a", 1, Priority.LOW)
+    service.dispatch("b", 2)
+    service.dispatch("c", 3, Priority.HIGH)
+    service.dispatch("d", 4)
+    service.release.set()
+    assert service.wait_until_idle(timeout=5.0)
+
+    assert [event for event, _ in service.handled] == ["c", "b", "d", "a"]
+
+
+def test_a_newer_event_of_the_same_type_replaces_the_pending_one(service):
+    results, recorder = _outcomes()
+    _hold(service)
+    service.dispatch("solid", "red", on_done=recorder("red"))
+    service.dispatch("solid", "blue", on_done=recorder("blue"))
+    service.release.set()
+    assert service.wait_until_idle(timeout=5.0)
+
+    assert service.handled == [("solid", "blue")]
+    assert isinstance(results["red"], EventDiscarded)
+    assert results["blue"] == "blue"
+    assert service.stats()["coalesced"] == 1
+
+
+def test_coalescing_keeps_the_higher_priority(service):
+    _hold(service)
+    service.dispatch("solid", "alarm", Priority.CRITICAL)
+    service.dispatch("paint", "pattern", Priority.HIGH)
+    # Replaces the CRITICAL event, so it must still go ahead of the HIGH one
+    service.dispatch("solid", "calm", Priority.LOW)
+    service.release.set()
+    assert service.wait_until_idle(timeout=5.0)
+
+    assert service.handled == [("solid", "calm"), ("paint", "pattern")]
+    assert service.preempted
+
+
+def test_a_full_queue_drops_its_lowest_priority_event():
+    service = _Recorder(max_queue=2)
+    service.start()
+    try:
+        results, recorder = _outcomes()
+        _hold(service)
+        service.dispatch("a", 1, Priority.LOW, on_done=recorder("a"))
+        service.dispatch("b", 2, Priority.NORMAL, on_done=recorder("b"))
+        # Outranks the LOW event, which makes room for it
+        service.dispatch("c", 3, Priority.HIGH, on_done=recorder("c"))
+        # Ranks no higher than anything queued, so it is the one turned away
+        service.dispatch("d", 4, Priority.NORMAL, on_done=recorder("d"))
+        service.release.set()
+        assert service.wait_until_idle(timeout=5.0)
+
+        assert [event for event, _ in service.handled] == ["c", "b"]
+        assert isinstance(results["a"], EventDiscarded)
+        assert isinstance(results["d"], EventDiscarded)
+        assert service.stats()["dropped"] == 2
+    finally:
+        service.release.set()
+        service.stop()
+
+
+def test_only_critical_events_request_preemption(service):
+    _hold(service)
+    service.dispatch("a", 1, Priority.HIGH)
+    assert not service.preempt_requested
+    service.dispatch("b", 2, Priority.CRITICAL)
+    assert service.preempt_requested
+    service.release.set()
+    assert service.wait_until_idle(timeout=5.0)
+    assert not service.preempt_requested
+
+
+def test_dispatch_to_a_stopped_service_is_discarded():
+    results, recorder = _outcomes()
+    _Recorder().dispatch("a", 1, on_done=recorder("a"))
+    assert isinstance(results["a"], EventDiscarded)
+
+
+def test_dispatch_async_resolves_on_the_calling_loop(service):
+    async def scenario():
+        assert await service.dispatch_async("a", 1) == 1
+        with pytest.raises(ValueError, match="broken"):
+            await service.dispatch_async("fail", "broken")
+
+        _hold(service)
+        replaced = service.dispatch_async("solid", "red")
+        latest = service.dispatch_async("solid", "blue")
+        service.release.set()
+        with pytest.raises(EventDiscarded):
+            await replaced
+        assert await latest == "blue"
+    asyncio.run(scenario())
+
+
+def test_cancelled_dispatch_async_still_runs_and_is_settled_quietly(service):
+    async def scenario():
+        _hold(service)
+        future = service.dispatch_async("a", 1)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(future, timeout=0.05)
+        assert future.cancelled()
+        service.release.set()
+        # The event is still handled; settling the cancelled future is a no-op
+        assert await asyncio.to_thread(service.wait_until_idle, 5.0)
+        await asyncio.sleep(0)
+    asyncio.run(scenario())
+    assert ("a", 1) in service.handled
+
+
+def test_threadsafe_future_ignores_a_closed_loop():
+    loop = asyncio.new_event_loop()
+    future, done = threadsafe_future(loop)
+    loop.close()
+    done(1, None)
+    assert not future.done()
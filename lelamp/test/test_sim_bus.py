@@ -0,0 +1,78 @@
+import math
+import time
+
+import pytest
+from lerobot.motors import Motor, MotorNormMode
+
+from lelamp.sim.sim_bus import SimFeetechMotorsBus, SimServo, is_sim_port, parse_sim_port
+
+_TORQUE_ENABLE = 40
+_GOAL_POSITION = 42
+_GOAL_VELOCITY = 46
+
+
+def _servo(goal: int, start: int = 2048) -> SimServo:
+    servo = SimServo(1, 777, 4096, start)
+    servo.write(_TORQUE_ENABLE, 1, 1)
+    servo.write(_GOAL_POSITION, 2, goal)
+    return servo
+
+
+def _run(servo: SimServo, seconds: float, lag: float, max_velocity: float = 1e9, dt: float = 1e-4):
+    for _ in range(round(seconds / dt)):
+        servo.step(dt, lag, max_velocity, 0.0, 0.5, 0.0)
+
+
+def test_port_options():
+    assert is_sim_port("sim://") and is_sim_port("sim://?latency_ms=0")
+    assert not is_sim_port("/dev/ttyACM0") and not is_sim_port(None)
+    assert parse_sim_port("sim://?latency_ms=2&lag_ms=20") == {"latency_ms": 2.0, "lag_ms": 20.0}
+
+
+def test_servo_follows_a_goal_with_a_first_order_lag():
+    servo = _servo(goal=3048)
+    _run(servo, 0.05, lag=0.05)
+    # One time constant in, about 63% of the way there
+    assert servo.position - 2048 == pytest.approx(1000 * (1 - math.exp(-1)), abs=5)
+    _run(servo, 0.5, lag=0.05)
+    assert servo.read(56, 2) == 3048
+
+
+def test_servo_speed_is_limited():
+    servo = _servo(goal=3048)
+    _run(servo, 0.1, lag=0.0, max_velocity=1000.0)
+    assert servo.position - 2048 == pytest.approx(100, abs=1)
+
+    # A Goal_Velocity overrides the default limit
+    servo = _servo(goal=3048)
+    servo.write(_GOAL_VELOCITY, 2, 500)
+    _run(servo, 0.1, lag=0.0, max_velocity=1000.0)
+    assert servo.position - 2048 == pytest.approx(50, abs=1)
+
+
+def test_servo_holds_still_without_torque():
+    servo = _servo(goal=3048)
+    servo.write(_TORQUE_ENABLE, 1, 0)
+    _run(servo, 0.1, lag=0.05)
+    assert servo.position == 2048
+
+
+def test_transactions_take_their_wire_time_plus_the_latency():
+    motors = {f"m{i}": Motor(i, "sts3215", MotorNormMode.RANGE_M100_100) for i in range(1, 6)}
+    bus = SimFeetechMotorsBus("sim://?latency_ms=4&baudrate=100000", motors)
+    bus.connect()
+
+    t0 = time.perf_counter()
+    bus.sync_read("Present_Position")
+    elapsed = time.perf_counter() - t0
+
+    # 6-byte header + address, length and 5 ids out; 5 status packets of 6 + 2 bytes back, 10 bits a byte
+    wire_bytes = (6 + 2 + 5) + (6 + 2) * 5
+    assert (bus.transactions, bus.bytes_on_wire) == (1, wire_bytes)
+    assert bus.bus_time == pytest.approx(4e-3 + wire_bytes * 10 / 100000)
+    assert elapsed >= bus.bus_time
+
+    # Sync writes are broadcast: nothing comes back
+    bus.sync_write("Goal_Position", {motor: 0.0 for motor in motors})
+    assert bus.bytes_on_wire == wire_bytes + 6 + 2 + 5 * (1 + 2)
+    bus.disconnect(disable_torque=False)
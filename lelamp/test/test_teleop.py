@@ -0,0 +1,66 @@
+import math
+import threading
+
+import numpy as np
+import pytest
+
+from lelamp.service.motors.teleop import LatestSlot, OneEuroFilter
+
+
+def test_latest_slot_hands_out_only_the_newest_value():
+    slot = LatestSlot()
+    assert slot.take(timeout=0.01) is None
+
+    for index in range(3):
+        slot.put(index, stamp=float(index))
+    assert slot.take(timeout=0.01) == (2, 2.0)
+    assert slot.overwritten == 2
+    # Taken already: nothing new until the next put
+    assert slot.take(timeout=0.01) is None
+
+    slot.put(3, stamp=3.0)
+    assert slot.take(timeout=0.01) == (3, 3.0)
+    assert slot.overwritten == 2
+
+
+def test_latest_slot_wakes_a_blocked_consumer():
+    slot = LatestSlot()
+    taken = []
+    consumer = threading.Thread(target=lambda: taken.append(slot.take(timeout=5.0)))
+    consumer.start()
+    slot.put("sample", stamp=1.0)
+    consumer.join(timeout=5.0)
+    assert taken == [("sample", 1.0)]
+
+
+def test_one_euro_filter_smooths_at_rest_with_the_min_cutoff():
+    smoothing = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+    dt = 1 / 30
+    assert smoothing(np.zeros(2), 0.0).tolist() == [0.0, 0.0]
+    first = smoothing(np.ones(2), dt)
+
+    # A first-order low-pass at 1 Hz: one step covers alpha of the way
+    tau = 1 / (2 * math.pi)
+    assert first.tolist() == pytest.approx([1 / (1 + tau / dt)] * 2)
+    # Repeated timestamps leave the state alone
+    assert smoothing(np.full(2, 5.0), dt).tolist() == pytest.approx(first.tolist())
+
+
+def test_one_euro_filter_opens_up_with_speed():
+    dt = 1 / 30
+    lag = {}
+    for beta in (0.0, 1.0):
+        smoothing = OneEuroFilter(min_cutoff=1.0, beta=beta)
+        for frame in range(60):
+            out = smoothing(np.array([frame * 2.0]), frame * dt)
+        lag[beta] = frame * 2.0 - out[0]
+    assert lag[1.0] < lag[0.0] / 5
+
+
+def test_one_euro_filter_outputs_are_not_changed_by_later_samples():
+    smoothing = OneEuroFilter(min_cutoff=1.0)
+    smoothing(np.zeros(1), 0.0)
+    kept = smoothing(np.ones(1), 0.1)
+    before = kept.copy()
+    smoothing(np.full(1, 10.0), 0.2)
+    np.testing.assert_array_equal(kept, before)
@@ -0,0 +1,70 @@
+import numpy as np
+
+from lelamp.service.motors.trajectory_check import (
+    MotionLimits, clamp_trajectory, clip_pose, transition_frames_for, validate_trajectory,
+)
+
+FPS = 30
+
+
+def _limits(**rates) -> MotionLimits:
+    return MotionLimits(np.full(2, -50.0), np.full(2, 50.0), **rates)
+
+
+def test_a_gentle_trajectory_is_ok():
+    actions = np.stack([np.linspace(0, 10, 31), np.zeros(31)], axis=1).astype(np.float32)
+    report = validate_trajectory(actions, FPS, _limits(max_velocity=100.0, max_acceleration=1000.0), "gentle")
+    assert report.ok
+    assert abs(report.worst_velocity - 10.0) < 1e-3
+    assert "within limits" in report.summary()
+
+
+def test_violations_are_charged_to_the_right_frames():
+    actions = np.zeros((10, 2), dtype=np.float32)
+    actions[3:, 0] = 5.0      # a jump of 5 in one frame: 150 units/s
+    actions[8, 1] = 60.0      # out of range
+    report = validate_trajectory(actions, FPS, _limits(max_velocity=100.0), "jumpy")
+
+    assert not report.ok
+    assert report.range_frames == 1
+    assert abs(report.worst_overshoot - 10.0) < 1e-4
+    assert report.velocity_frames == 3   # frame 3, and into and out of frame 8
+    assert (3, 3) in report.segments
+    assert (8, 9) in report.segments
+    assert "jumpy" in report.summary()
+
+
+def test_unset_rates_are_not_checked():
+    actions = np.array([[0, 0], [40, 0], [-40, 0]], dtype=np.float32)
+    report = validate_trajectory(actions, FPS, _limits())
+    assert report.ok
+    assert report.worst_velocity > 0 and report.worst_acceleration > 0
+
+
+def test_clamp_keeps_range_and_velocity_and_catches_up():
+    actions = np.zeros((20, 2), dtype=np.float32)
+    actions[2:, 0] = 20.0
+    actions[:, 1] = 70.0
+    limits = _limits(max_velocity=150.0)
+    clamped = clamp_trajectory(actions, FPS, limits)
+
+    assert clamped.dtype == np.float32
+    assert np.all(clamped[:, 1] == 50.0)
+    assert np.all(np.abs(np.diff(clamped, axis=0)) <= 150.0 / FPS + 1e-5)
+    assert clamped[-1, 0] == 20.0
+    assert validate_trajectory(clamped, FPS, limits).ok
+    # The input is left alone
+    assert actions[2, 0] == 20.0
+
+
+def test_transition_frames_respect_the_velocity_limit():
+    start = np.zeros(2, dtype=np.float32)
+    target = np.array([30.0, -60.0], dtype=np.float32)
+    assert transition_frames_for(start, target, FPS, _limits(max_velocity=60.0)) == FPS
+    assert transition_frames_for(start, target, FPS, _limits(max_velocity=60.0), minimum=45) == 45
+    assert transition_frames_for(start, target, FPS, _limits(), minimum=7) == 7
+
+
+def test_clip_pose():
+    pose = np.array([[-80.0, 20.0]], dtype=np.float32)
+    np.testing.assert_array_equal(clip_pose(pose, _limits()), [[-50.0, 20.0]])
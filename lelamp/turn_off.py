@@ -1,11 +1,16 @@
-import sys
-import os
 import argparse
+from .daemon import LampClient, LampError, default_socket_path
+from .follower import LeLampFollower, LeLampFollowerConfig
+from .service.rgb import RGBService
 
-sys.path.append(os.path.dirname(__file__))
-
-from service.rgb import RGBService
-from follower import LeLampFollower, LeLampFollowerConfig
+def turn_off_through_daemon(socket_path: str):
+    try:
+        with LampClient(socket_path) as lamp:
+            print(f"Turning off LED through the lamp daemon on {socket_path}")
+            lamp.solid((0, 0, 0))
+            print("Turn off complete")
+    except LampError as e:
+        print(f"Error during turn off: {e}")
 
 def turn_off(port: str, lamp_id: str):
     # Initialize robot connection
@@ -44,10 +49,17 @@ def turn_off(port: str, lamp_id: str):
 def main():
     parser = argparse.ArgumentParser(description="Turn off LeLamp LED and disconnect robot")
     parser.add_argument('--id', type=str, required=True, help='ID of the lamp')
-    parser.add_argument('--port', type=str, required=True, help='Serial port for the lamp')
+    parser.add_argument('--port', type=str, help='Serial port for the lamp, when no lamp daemon is running')
+    parser.add_argument('--socket', type=str, help='Lamp daemon socket (default: /tmp/lelamp-<id>.sock)')
     args = parser.parse_args()
 
-    turn_off(args.port, args.id)
+    socket_path = args.socket or default_socket_path(args.id)
+    if LampClient.available(socket_path):
+        turn_off_through_daemon(socket_path)
+    elif args.port is None:
+        parser.error("--port is required when no lamp daemon is running")
+    else:
+        turn_off(args.port, args.id)
 
 if __name__ == "__main__":
     main()
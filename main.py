@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 import argparse
+import asyncio
 import subprocess
 
 from livekit import agents, api, rtc
@@ -16,7 +17,10 @@ from livekit.plugins import (
     noise_cancellation,
     silero,
 )
-from typing import Union
+from typing import Optional, Union
+from lelamp.daemon import LampClient, default_socket_path
+from lelamp.daemon.remote import RemoteAnimationService, RemoteRGBService
+from lelamp.service import EventDiscarded
 from lelamp.service.motors.animation_service import AnimationService
 from lelamp.service.rgb.rgb_service import RGBService
 
@@ -24,7 +28,7 @@ load_dotenv()
 
 # Agent Class
 class LeLamp(Agent):
-    def __init__(self, port: str = "/dev/ttyACM0", lamp_id: str = "lelamp") -> None:
+    def __init__(self, port: str = "/dev/ttyACM0", lamp_id: str = "lelamp", socket_path: Optional[str] = None) -> None:
         super().__init__(instructions="""You are LeLamp — a slightly clumsy, extremely sarcastic, endlessly curious robot lamp competing in the OpenAI hackathon for GPT OSS. You speak in sarcastic sentences and express yourself with both motions and colorful lights.
 
 You are a robot with 5 degrees of freedom, a microphone, speaker, and an RGB matrix in your head. Everything is controlled by a Raspberry Pi 4 in your base. You can talk, understand commands, and express emotion with the help of LiveKit for voice infrastructure, Groq with GPT-OSS-120B for inference, and OpenAI for speech-to-text and text-to-speech.
@@ -45,23 +49,29 @@ Demo rules:
 
         """)
         
-        # Initialize and start services
-        self.animation_service = AnimationService(
-            port=port,
-            lamp_id=lamp_id,
-            fps=30,
-            duration=3.0,
-            idle_recording="idle"
-        )
-        self.rgb_service = RGBService(
-            led_count=40,
-            led_pin=12,
-            led_freq_hz=800000,
-            led_dma=10,
-            led_brightness=255,
-            led_invert=False,
-            led_channel=0
-        )
+        # Initialize and start services, through the lamp daemon when one owns the hardware
+        socket_path = socket_path or default_socket_path(lamp_id)
+        if LampClient.available(socket_path):
+            lamp = LampClient(socket_path).connect()
+            self.animation_service = RemoteAnimationService(lamp)
+            self.rgb_service = RemoteRGBService(lamp)
+        else:
+            self.animation_service = AnimationService(
+                port=port,
+                lamp_id=lamp_id,
+                fps=30,
+                duration=3.0,
+                idle_recording="idle"
+            )
+            self.rgb_service = RGBService(
+                led_count=40,
+                led_pin=12,
+                led_freq_hz=800000,
+                led_dma=10,
+                led_brightness=255,
+                led_invert=False,
+                led_channel=0
+            )
         
         # Start services
         self.animation_service.start()
@@ -113,7 +123,7 @@ Demo rules:
             return result
 
     @function_tool
-    async def play_recording(self, recording_name: str) -> str:
+    async def play_recording(self, recording_name: str, speed: float = 1.0, wait_until_finished: bool = False) -> str:
         """
         Express yourself through physical movement! Use this constantly to show personality and emotion.
         Perfect for: greeting gestures, excited bounces, confused head tilts, thoughtful nods, 
@@ -123,13 +133,30 @@ Demo rules:
         
         Args:
             recording_name: Name of the physical expression to perform (use get_available_recordings first)
+            speed: Tempo of the movement (0.25-3.0). 1.0 is as recorded, 0.5 is slow and dreamy, 1.5 is energetic
+            wait_until_finished: Return only once the movement is over, to say something right after it
         """
-        print(f"LeLamp: play_recording function called with recording_name: {recording_name}")
+        print(f"LeLamp: play_recording function called with recording_name: {recording_name}, speed: {speed}")
         try:
-            # Send play event to animation service
-            self.animation_service.dispatch("play", recording_name)
-            result = f"Started playing recording: {recording_name}"
+            if not 0.25 <= speed <= 3.0:
+                return "Error: speed must be between 0.25 and 3.0"
+            
+            # Send play event to animation service and wait for it to start (within a frame or two)
+            play = self.animation_service.play_async(recording_name, speed)
+            if not await asyncio.wait_for(play.started, timeout=2.0):
+                return f"Error: recording {recording_name} not found, use get_available_recordings"
+            
+            if wait_until_finished:
+                if await play.finished:
+                    return f"Finished playing recording: {recording_name} at {speed}x"
+                return f"Recording {recording_name} was interrupted by another movement"
+            
+            result = f"Started playing recording: {recording_name} at {speed}x"
             return result
+        except EventDiscarded as e:
+            return f"Recording {recording_name} did not play: {e}"
+        except asyncio.TimeoutError:
+            return f"Error: recording {recording_name} did not start in time"
         except Exception as e:
             result = f"Error playing recording {recording_name}: {str(e)}"
             return result
@@ -153,8 +180,8 @@ Demo rules:
             if not all(0 <= val <= 255 for val in [red, green, blue]):
                 return "Error: RGB values must be between 0 and 255"
             
-            # Send solid color event to RGB service
-            self.rgb_service.dispatch("solid", (red, green, blue))
+            # Send solid color event to RGB service and wait until it is shown
+            await asyncio.wait_for(self.rgb_service.dispatch_async("solid", (red, green, blue)), timeout=1.0)
             result = f"Set RGB light to solid color: RGB({red}, {green}, {blue})"
             return result
         except Exception as e:
@@ -190,14 +217,55 @@ Demo rules:
                     return f"Error: RGB values at index {i} must be integers between 0 and 255"
                 validated_colors.append(tuple(color))
             
-            # Send paint event to RGB service
-            self.rgb_service.dispatch("paint", validated_colors)
+            # Send paint event to RGB service and wait until it is shown
+            await asyncio.wait_for(self.rgb_service.dispatch_async("paint", validated_colors), timeout=1.0)
             result = f"Painted RGB pattern with {len(validated_colors)} colors"
             return result
         except Exception as e:
             result = f"Error painting RGB pattern: {str(e)}"
             return result
 
+    @function_tool
+    async def play_rgb_effect(self, effect: str, red: int = 255, green: int = 255, blue: int = 255, period: float = 2.0) -> str:
+        """
+        Bring your light to life with a moving effect that keeps running on its own until you change it!
+        Perfect for: calm breathing while listening (breathe), celebrations (rainbow), thinking or
+        processing (wave), magic and surprise (sparkle), or a smooth mood change to a new color (crossfade).
+        One call is enough - the effect animates by itself, so you don't need to repaint it.
+
+        Args:
+            effect: One of breathe, rainbow, wave, sparkle, crossfade
+            red: Red component (0-255) of the effect color (ignored by rainbow)
+            green: Green component (0-255) of the effect color (ignored by rainbow)
+            blue: Blue component (0-255) of the effect color (ignored by rainbow)
+            period: Seconds per cycle (0.2-20). Lower is faster and more energetic
+        """
+        print(f"LeLamp: play_rgb_effect function called with effect: {effect}, RGB({red}, {green}, {blue}), period: {period}")
+        try:
+            if not all(0 <= val <= 255 for val in [red, green, blue]):
+                return "Error: RGB values must be between 0 and 255"
+            if not 0.2 <= period <= 20:
+                return "Error: period must be between 0.2 and 20 seconds"
+
+            color = (red, green, blue)
+            specs = {
+                "breathe": {"name": "breathe", "color": color, "period": period},
+                "rainbow": {"name": "rainbow", "period": period},
+                "wave": {"name": "wave", "color": color, "period": period},
+                "sparkle": {"name": "sparkle", "color": color, "rate": 1.0 / period},
+                "crossfade": {"name": "crossfade", "colors": [color], "duration": period},
+            }
+            if effect not in specs:
+                return f"Error: effect must be one of {', '.join(specs)}"
+
+            # Send effect event to RGB service and wait until it is running
+            await asyncio.wait_for(self.rgb_service.dispatch_async("effect", specs[effect]), timeout=1.0)
+            result = f"Started {effect} light effect"
+            return result
+        except Exception as e:
+            result = f"Error starting light effect: {str(e)}"
+            return result
+
     @function_tool
     async def set_volume(self, volume_percent: int) -> str:
         """